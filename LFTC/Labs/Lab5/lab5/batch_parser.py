@@ -0,0 +1,127 @@
+import argparse
+import gc
+import multiprocessing
+import os
+import time
+from dataclasses import dataclass
+from typing import Iterable, Iterator, List, Optional
+
+from minilang_lexer import MinilangLexer
+from minilang_parser import MinilangParser, parse_entries
+
+# Parser shared with the workers. With the fork start method it is set once in the parent and
+# inherited copy-on-write; otherwise each worker receives it through the pool initializer.
+_SHARED_PARSER: Optional[MinilangParser] = None
+
+
+@dataclass
+class BatchResult:
+    """Outcome of validating one program"""
+    path: str
+    ok: bool
+    error: Optional[str] = None
+
+
+def _init_worker(parser: MinilangParser):
+    global _SHARED_PARSER
+    _SHARED_PARSER = parser
+
+
+def validate_program(parser: MinilangParser, path: str) -> BatchResult:
+    """Lex and validate a single program against an already built parser, keeping no state on it"""
+    lexer = MinilangLexer(parser.token_codes)
+    try:
+        parse_entries(parser.parsing_table, parser.non_terminals, parser.start_symbol,
+                      lexer.lex_file(path), collect_derivation=False)
+        return BatchResult(path, True)
+    except Exception as e:
+        return BatchResult(path, False, str(e))
+
+
+def _validate_shared(path: str) -> BatchResult:
+    return validate_program(_SHARED_PARSER, path)
+
+
+def validate_programs(paths: Iterable[str], grammar_file: str = "minilang_grammar.txt",
+                      workers: Optional[int] = None, chunksize: int = 16,
+                      parser: Optional[MinilangParser] = None) -> Iterator[BatchResult]:
+    """Validate many programs with a pool of worker processes, yielding results in input order
+
+    The grammar is read and the parsing table built once, in the parent. workers defaults to the
+    CPU count; workers=1 validates in the current process.
+    """
+    global _SHARED_PARSER
+
+    if parser is None:
+        parser = MinilangParser()
+        parser.read_grammar(grammar_file)
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if workers == 1:
+        for path in paths:
+            yield validate_program(parser, path)
+        return
+
+    frozen = False
+    if 'fork' in multiprocessing.get_all_start_methods():
+        _SHARED_PARSER = parser
+        # Keep the collector from touching (and so copying) the inherited objects in the workers.
+        # gc.unfreeze() thaws everything, so leave the collector alone if the caller froze objects.
+        if gc.get_freeze_count() == 0:
+            gc.freeze()
+            frozen = True
+        context = multiprocessing.get_context('fork')
+        pool = context.Pool(workers)
+    else:
+        pool = multiprocessing.Pool(workers, initializer=_init_worker, initargs=(parser,))
+
+    try:
+        yield from pool.imap(_validate_shared, paths, chunksize)
+    finally:
+        pool.terminate()
+        pool.join()
+        _SHARED_PARSER = None
+        if frozen:
+            gc.unfreeze()
+
+
+def collect_paths(inputs: List[str]) -> Iterator[str]:
+    """Expand directories into the files they contain"""
+    for item in inputs:
+        if os.path.isdir(item):
+            for root, _, files in os.walk(item):
+                for name in sorted(files):
+                    yield os.path.join(root, name)
+        else:
+            yield item
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Validate many Minilang programs in parallel')
+    arg_parser.add_argument('inputs', nargs='+', help='Program files or directories of programs')
+    arg_parser.add_argument('-g', '--grammar', default='minilang_grammar.txt',
+                            help='Grammar file (default: minilang_grammar.txt)')
+    arg_parser.add_argument('-j', '--workers', type=int, default=None,
+                            help='Number of worker processes (default: CPU count)')
+    arg_parser.add_argument('-c', '--chunksize', type=int, default=16,
+                            help='Programs handed to a worker at a time (default: 16)')
+    args = arg_parser.parse_args()
+
+    start = time.perf_counter()
+    passed = failed = 0
+    for result in validate_programs(collect_paths(args.inputs), args.grammar, args.workers, args.chunksize):
+        if result.ok:
+            passed += 1
+        else:
+            failed += 1
+            first_line = result.error.strip().splitlines()[0]
+            print(f"FAIL {result.path}: {first_line}")
+    elapsed = time.perf_counter() - start
+
+    print(f"\n{passed} passed, {failed} failed in {elapsed:.2f}s")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    exit(main())
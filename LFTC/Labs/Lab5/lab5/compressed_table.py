@@ -0,0 +1,166 @@
+import sys
+from array import array
+from collections import Counter
+from collections.abc import Mapping
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+class CompressedParsingTable(Mapping):
+    """LL(1) parsing table stored as a comb vector (row displacement)
+
+    Each non-terminal row is shifted by base[row] into one shared vector so rows interleave
+    without collisions; check[i] records which row owns slot i and value[i] the production id.
+    The object is a read-only mapping from (non_terminal, terminal) to the production, so it can
+    replace the dict returned by build_parsing_table, e.g.
+
+        parser.parsing_table = CompressedParsingTable(parser.parsing_table)
+
+    With use_default_rows=True the most frequent production of each row is stored once as the
+    row default and answers every terminal without an explicit entry. That shrinks the table
+    further but, like default reductions in LR parsers, errors are then detected a few steps
+    later (never after consuming a wrong token), and membership tests no longer report gaps.
+    """
+
+    def __init__(self, parsing_table: Dict[Tuple[str, str], List[str]], use_default_rows: bool = False):
+        non_terminals = sorted({nt for (nt, _) in parsing_table})
+        terminals = sorted({t for (_, t) in parsing_table})
+        self.non_terminal_ids = {nt: i for i, nt in enumerate(non_terminals)}
+        self.terminal_ids = {t: i for i, t in enumerate(terminals)}
+        self.terminals = terminals
+        self.non_terminals = non_terminals
+
+        # Share production objects, so identity comparisons keep working
+        self.productions: List[List[str]] = []
+        production_ids: Dict[int, int] = {}
+        rows: List[Dict[int, int]] = [{} for _ in non_terminals]
+        for (nt, t), production in parsing_table.items():
+            if id(production) not in production_ids:
+                production_ids[id(production)] = len(self.productions)
+                self.productions.append(production)
+            rows[self.non_terminal_ids[nt]][self.terminal_ids[t]] = production_ids[id(production)]
+
+        self.default = array('i', [-1] * len(rows))
+        if use_default_rows:
+            for row_id, row in enumerate(rows):
+                if len(row) > 1:
+                    production_id, count = Counter(row.values()).most_common(1)[0]
+                    if count > 1:
+                        self.default[row_id] = production_id
+                        rows[row_id] = {t: p for t, p in row.items() if p != production_id}
+
+        self.base = array('i', [0] * len(rows))
+        self.check = array('i')
+        self.value = array('i')
+        self._pack(rows)
+        self._size = len(parsing_table)
+        if use_default_rows:
+            # A default answers every terminal of its row
+            self._size = sum(len(row) if self.default[r] < 0 else len(terminals) for r, row in enumerate(rows))
+
+    def _pack(self, rows: List[Dict[int, int]]):
+        """First-fit placement of the rows, densest first"""
+        occupied = bytearray()
+        first_free = 0
+        for row_id in sorted(range(len(rows)), key=lambda r: -len(rows[r])):
+            columns = sorted(rows[row_id])
+            if not columns:
+                continue
+            # Only bases that put the first column on a free slot can fit
+            slot = first_free
+            while True:
+                base = slot - columns[0]
+                if all(base + c >= len(occupied) or not occupied[base + c] for c in columns[1:]):
+                    break
+                slot = occupied.find(0, slot + 1)
+                if slot < 0:
+                    slot = len(occupied)
+            needed = base + columns[-1] + 1
+            if needed > len(occupied):
+                grow = needed - len(occupied)
+                occupied.extend(bytes(grow))
+                self.check.extend([-1] * grow)
+                self.value.extend([-1] * grow)
+            for c in columns:
+                occupied[base + c] = 1
+                self.check[base + c] = row_id
+                self.value[base + c] = rows[row_id][c]
+            self.base[row_id] = base
+            first_free = occupied.find(0, first_free)
+            if first_free < 0:
+                first_free = len(occupied)
+
+    def lookup(self, non_terminal: str, terminal: str) -> Optional[List[str]]:
+        row = self.non_terminal_ids.get(non_terminal)
+        if row is None:
+            return None
+        column = self.terminal_ids.get(terminal)
+        if column is not None:
+            slot = self.base[row] + column
+            if 0 <= slot < len(self.check) and self.check[slot] == row:
+                return self.productions[self.value[slot]]
+        default = self.default[row]
+        return None if default < 0 else self.productions[default]
+
+    def get(self, key, default=None):
+        production = self.lookup(*key)
+        return default if production is None else production
+
+    def __getitem__(self, key: Tuple[str, str]) -> List[str]:
+        production = self.lookup(*key)
+        if production is None:
+            raise KeyError(key)
+        return production
+
+    def __contains__(self, key) -> bool:
+        return self.lookup(*key) is not None
+
+    def __iter__(self) -> Iterator[Tuple[str, str]]:
+        for nt in self.non_terminals:
+            for t in self.terminals:
+                if self.lookup(nt, t) is not None:
+                    yield nt, t
+
+    def __len__(self) -> int:
+        return self._size
+
+
+def deep_size(obj, seen: Optional[set] = None) -> int:
+    """Approximate memory used by an object and everything it references, counting shared objects once"""
+    if seen is None:
+        seen = set()
+    total = 0
+    stack = [obj]
+    while stack:
+        current = stack.pop()
+        if id(current) in seen:
+            continue
+        seen.add(id(current))
+        total += sys.getsizeof(current)
+        if isinstance(current, dict):
+            stack.extend(current.keys())
+            stack.extend(current.values())
+        elif isinstance(current, (list, tuple, set, frozenset)):
+            stack.extend(current)
+        elif hasattr(current, '__dict__'):
+            stack.append(vars(current))
+    return total
+
+
+def memory_report(parsing_table: Dict[Tuple[str, str], List[str]],
+                  compressed: CompressedParsingTable) -> Dict[str, float]:
+    """Compare the memory of the dict table with its compressed form
+
+    Production lists are owned by the grammar in both cases, so they are left out.
+    """
+    productions = {id(p) for p in parsing_table.values()}
+    dict_size = deep_size(parsing_table, seen=set(productions))
+    compressed_size = deep_size(compressed, seen=set(productions))
+    return {
+        'entries': len(parsing_table),
+        'non_terminals': len(compressed.non_terminal_ids),
+        'terminals': len(compressed.terminal_ids),
+        'comb_vector_slots': len(compressed.check),
+        'dict_bytes': dict_size,
+        'compressed_bytes': compressed_size,
+        'ratio': dict_size / compressed_size if compressed_size else 0.0,
+    }
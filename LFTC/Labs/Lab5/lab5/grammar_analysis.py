@@ -0,0 +1,148 @@
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, List, Set, Tuple
+
+
+@dataclass
+class GrammarAnalysis:
+    """Nullable, productive and reachable non-terminals of a grammar"""
+    nullable: Set[str]
+    productive: Set[str]
+    reachable: Set[str]
+
+
+@dataclass
+class PruneReport:
+    """What prune_grammar removed from a grammar"""
+    unproductive: List[str] = field(default_factory=list)
+    unreachable: List[str] = field(default_factory=list)
+    removed_productions: List[Tuple[str, List[str]]] = field(default_factory=list)
+    removed_terminals: List[str] = field(default_factory=list)
+
+    def is_empty(self) -> bool:
+        return not self.removed_productions and not self.removed_terminals
+
+    def __str__(self):
+        if self.is_empty():
+            return "Grammar has no useless symbols"
+        lines = []
+        if self.unproductive:
+            lines.append(f"Non-productive non-terminals: {', '.join(self.unproductive)}")
+        if self.unreachable:
+            lines.append(f"Unreachable non-terminals: {', '.join(self.unreachable)}")
+        if self.removed_terminals:
+            lines.append(f"Unused terminals: {', '.join(self.removed_terminals)}")
+        for non_terminal, production in self.removed_productions:
+            lines.append(f"Removed {non_terminal} -> {' '.join(production)}")
+        return "\n".join(lines)
+
+
+def _body(production: List[str]) -> List[str]:
+    return [] if production == ['epsilon'] else production
+
+
+def _closure(productions: Dict[str, List[List[str]]], counts_symbol) -> Set[str]:
+    """Worklist fixpoint: a non-terminal is marked once one of its productions has every counted symbol marked
+
+    counts_symbol(symbol) returns True if the symbol has to be marked, False if it is satisfied
+    already, or None if it can never be (which rules the production out). Each occurrence of a
+    non-terminal is decremented at most once, so the pass is linear in the size of the grammar.
+    """
+    pending = []
+    occurrences: Dict[str, List[int]] = defaultdict(list)
+    owners = []
+    marked = set()
+    worklist = []
+
+    for non_terminal, rules in productions.items():
+        for production in rules:
+            index = len(owners)
+            owners.append(non_terminal)
+            needed = [counts_symbol(symbol) for symbol in _body(production)]
+            if None in needed:
+                count = -1  # Never satisfiable
+            else:
+                count = 0
+                for symbol, counted in zip(_body(production), needed):
+                    if counted:
+                        occurrences[symbol].append(index)
+                        count += 1
+            pending.append(count)
+            if count == 0 and non_terminal not in marked:
+                marked.add(non_terminal)
+                worklist.append(non_terminal)
+
+    while worklist:
+        symbol = worklist.pop()
+        for index in occurrences[symbol]:
+            pending[index] -= 1
+            if pending[index] == 0 and owners[index] not in marked:
+                marked.add(owners[index])
+                worklist.append(owners[index])
+    return marked
+
+
+def analyze_grammar(productions: Dict[str, List[List[str]]], start_symbol: str) -> GrammarAnalysis:
+    """Compute nullable, productive and reachable non-terminals with worklists
+
+    Non-terminals are the symbols with productions; every other symbol except 'epsilon' is a terminal.
+    """
+    non_terminals = {nt for nt, rules in productions.items() if rules}
+    nullable = _closure(productions, lambda s: True if s in non_terminals else None)
+    productive = _closure(productions, lambda s: s in non_terminals)
+
+    reachable = set()
+    if start_symbol in productive:
+        reachable.add(start_symbol)
+        worklist = [start_symbol]
+        while worklist:
+            non_terminal = worklist.pop()
+            for production in productions[non_terminal]:
+                body = _body(production)
+                # Productions using a non-productive symbol are removed, so they reach nothing
+                if any(s in non_terminals and s not in productive for s in body):
+                    continue
+                for symbol in body:
+                    if symbol in non_terminals and symbol not in reachable:
+                        reachable.add(symbol)
+                        worklist.append(symbol)
+
+    return GrammarAnalysis(nullable, productive, reachable)
+
+
+def prune_grammar(grammar) -> PruneReport:
+    """Remove non-productive and unreachable non-terminals, and the productions using them, in place
+
+    Works on a Grammar or a MinilangParser before its parsing table is built. terminals and
+    non_terminals are recomputed from the remaining productions.
+    """
+    productions = grammar.productions
+    analysis = analyze_grammar(productions, grammar.start_symbol)
+    if grammar.start_symbol not in analysis.productive:
+        raise Exception(f"Grammar generates no sentences: start symbol '{grammar.start_symbol}' is not productive")
+
+    non_terminals = {nt for nt, rules in productions.items() if rules}
+    report = PruneReport(
+        unproductive=sorted(non_terminals - analysis.productive),
+        unreachable=sorted(analysis.productive - analysis.reachable),
+    )
+
+    kept = {}
+    for non_terminal, rules in productions.items():
+        for production in rules:
+            useful = non_terminal in analysis.reachable and \
+                all(s not in non_terminals or s in analysis.reachable for s in _body(production))
+            if useful:
+                kept.setdefault(non_terminal, []).append(production)
+            else:
+                report.removed_productions.append((non_terminal, production))
+
+    terminals = {s for rules in kept.values() for production in rules for s in _body(production)
+                 if s not in kept}
+    report.removed_terminals = sorted(grammar.terminals - terminals - non_terminals)
+
+    productions.clear()
+    productions.update(kept)
+    grammar.non_terminals = set(kept)
+    grammar.terminals = terminals
+    return report
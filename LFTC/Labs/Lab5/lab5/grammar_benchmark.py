@@ -0,0 +1,220 @@
+import argparse
+import json
+import random
+import time
+from typing import Dict, List, Tuple
+
+from ll1_parser import Grammar
+from minilang_parser import FIPEntry, MinilangParser
+
+Rule = Tuple[str, List[str]]
+
+
+def generate_grammar(non_terminal_count: int, nullable_density: float = 0.3, chain_depth: int = 8,
+                     alternatives: int = 3, max_children: int = 3, recursion: float = 0.3,
+                     open_density: float = 0.3, seed: int = 0) -> List[Rule]:
+    """Random LL(1) grammar with non_terminal_count non-terminals A0, A1, ...
+
+    Alternative k of Ai is 'ai_k X.. ci_k' with its own opening and closing terminals, so
+    FIRST(Ai) holds only Ai's opening terminals, and the children of one alternative are
+    distinct, so no non-terminal is followed by itself: the grammar is LL(1) by construction.
+    Children come from the next level of a chain_depth-level DAG; in alternatives after the
+    first a recursion fraction of them instead point back to any level up to Ai's own, which
+    makes long sentences likely (A0 always has one) while the first alternative always terminates.
+    A nullable_density fraction of the non-terminals also get an epsilon alternative.
+    An open_density fraction of the alternatives drop their closing terminal and end in a
+    non-nullable child X instead, so FOLLOW(Ai) flows into FOLLOW(X). Only non-nullable
+    children end a body: FOLLOW of a nullable non-terminal still holds only terminals of its
+    own alternative, and non-nullable ones cannot conflict, so the grammar stays LL(1).
+    """
+    rng = random.Random(seed)
+    nullable = [i > 0 and rng.random() < nullable_density for i in range(non_terminal_count)]
+    levels = max(1, min(chain_depth, non_terminal_count))
+    level_of = [i * levels // non_terminal_count for i in range(non_terminal_count)]
+    by_level: List[List[int]] = [[] for _ in range(levels)]
+    for i, level in enumerate(level_of):
+        by_level[level].append(i)
+
+    bodies: List[List[List[int]]] = [[[] for _ in range(rng.randint(1, alternatives))]
+                                     for _ in range(non_terminal_count)]
+    for level in range(1, levels):
+        parents = by_level[level - 1]
+        for child in by_level[level]:
+            # Guarantee reachability, then add random extra children below
+            parent = rng.choice(parents)
+            rng.choice(bodies[parent]).append(child)
+    # A recursive alternative of the start symbol makes sentences of any length possible
+    if len(bodies[0]) < 2:
+        bodies[0].append([])
+    bodies[0][-1].append(0)
+    for i in range(non_terminal_count):
+        candidates = by_level[level_of[i] + 1] if level_of[i] + 1 < levels else []
+        for k, body in enumerate(bodies[i]):
+            for _ in range(rng.randint(0, max(0, max_children - len(body)))):
+                if k > 0 and rng.random() < recursion:
+                    body.append(rng.randint(0, by_level[level_of[i]][-1]))
+                elif candidates:
+                    body.append(rng.choice(candidates))
+            children = list(dict.fromkeys(body))
+            rng.shuffle(children)
+            body[:] = children
+
+    rules = []
+    for i in range(non_terminal_count):
+        for k, body in enumerate(bodies[i]):
+            closing = [f"c{i}_{k}"]
+            tails = [c for c in body if not nullable[c]]
+            if tails and rng.random() < open_density:
+                tail = rng.choice(tails)
+                body = [c for c in body if c != tail] + [tail]
+                closing = []
+            rules.append((f"A{i}", [f"a{i}_{k}"] + [f"A{c}" for c in body] + closing))
+        if nullable[i]:
+            rules.append((f"A{i}", ['epsilon']))
+    return rules
+
+
+def generate_sentence(rules: List[Rule], token_count: int, seed: int = 0) -> List[str]:
+    """Random sentence of the grammar, switching to the shortest alternatives once token_count is reached"""
+    rng = random.Random(seed)
+    alternatives: Dict[str, List[List[str]]] = {}
+    for non_terminal, production in rules:
+        alternatives.setdefault(non_terminal, []).append(production)
+
+    # Minimum derivation lengths, relaxed until stable (unknown non-terminals count as infinite)
+    min_length: Dict[str, float] = {nt: float('inf') for nt in alternatives}
+
+    def cost(production: List[str]) -> float:
+        return 0 if production == ['epsilon'] else sum(min_length.get(s, 1) for s in production)
+
+    changed = True
+    while changed:
+        changed = False
+        for non_terminal in sorted(alternatives, key=lambda nt: -int(nt[1:])):
+            best = min(cost(production) for production in alternatives[non_terminal])
+            if best < min_length[non_terminal]:
+                min_length[non_terminal] = best
+                changed = True
+
+    start_symbol = rules[0][0]
+    # Under budget the start symbol keeps taking its recursive alternatives, so the sentence
+    # only stops short of token_count if the grammar has none
+    recursive_start = [p for p in alternatives[start_symbol] if start_symbol in p]
+    sentence = []
+    stack = [start_symbol]
+    # Shortest completion of what is on the stack, so the switch happens early enough
+    pending = min_length[start_symbol]
+    while stack:
+        symbol = stack.pop()
+        if symbol not in alternatives:
+            sentence.append(symbol)
+            pending -= 1
+            continue
+        options = alternatives[symbol]
+        pending -= min_length[symbol]
+        if len(sentence) + pending >= token_count:
+            production = min(options, key=cost)
+        elif symbol == start_symbol and recursive_start:
+            production = rng.choice(recursive_start)
+        else:
+            # Prefer alternatives with more non-terminals while there is budget left
+            weights = [sum(s in alternatives for s in p) for p in options]
+            production = rng.choices(options, weights)[0] if any(weights) else rng.choice(options)
+        pending += cost(production)
+        if production != ['epsilon']:
+            stack.extend(reversed(production))
+    return sentence
+
+
+def _best_time(function, repeats: int) -> Tuple[float, object]:
+    best, result = float('inf'), None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, (time.perf_counter() - start) * 1000)
+    return best, result
+
+
+def time_grammar_engine(engine_class, rules: List[Rule], sentence: List[str], repeats: int = 3) -> Dict[str, float]:
+    """Time FIRST, FOLLOW, table construction and parsing (best of repeats, in ms) for Grammar or MinilangParser"""
+    engine = engine_class()
+    for non_terminal, production in rules:
+        engine.add_production(non_terminal, production)
+    engine.start_symbol = rules[0][0]
+
+    first_ms, first_sets = _best_time(engine.compute_first_sets, repeats)
+    follow_ms, _ = _best_time(lambda: engine.compute_follow_sets(first_sets), repeats)
+    table_ms, parsing_table = _best_time(engine.build_parsing_table, repeats)
+
+    if isinstance(engine, MinilangParser):
+        engine.parsing_table = parsing_table
+        entries = [FIPEntry(token, 2, -1) for token in sentence]
+        parse_ms, derivation = _best_time(lambda: engine.parse_fip(entries, verbose=False), repeats)
+    else:
+        text = " ".join(sentence)
+        parse_ms, derivation = _best_time(lambda: engine.parse(text, parsing_table), repeats)
+
+    return {
+        'first_sets_ms': first_ms,
+        'follow_sets_ms': follow_ms,
+        'parsing_table_ms': table_ms,
+        'parse_ms': parse_ms,
+        'table_entries': len(parsing_table),
+        'derivation_steps': len(derivation),
+    }
+
+
+def run_benchmark(sizes: List[int], nullable_density: float = 0.3, chain_depth: int = 8,
+                  token_count: int = 10000, repeats: int = 3, seed: int = 0,
+                  open_density: float = 0.3) -> List[Dict]:
+    results = []
+    for size in sizes:
+        rules = generate_grammar(size, nullable_density, chain_depth, open_density=open_density, seed=seed)
+        sentence = generate_sentence(rules, token_count, seed=seed)
+        for engine_class in (Grammar, MinilangParser):
+            timings = time_grammar_engine(engine_class, rules, sentence, repeats)
+            results.append({
+                'engine': engine_class.__name__,
+                'non_terminals': size,
+                'productions': len(rules),
+                'nullable_density': nullable_density,
+                'open_density': open_density,
+                'chain_depth': chain_depth,
+                'sentence_tokens': len(sentence),
+                'seed': seed,
+                **timings,
+            })
+            print(f"{engine_class.__name__:15} N={size:<6} FIRST {timings['first_sets_ms']:9.1f} ms  "
+                  f"FOLLOW {timings['follow_sets_ms']:9.1f} ms  table {timings['parsing_table_ms']:9.1f} ms  "
+                  f"parse {timings['parse_ms']:8.1f} ms")
+    return results
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Benchmark the LL(1) engines on random grammars')
+    arg_parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000, 10000],
+                            help='Numbers of non-terminals (default: 10 100 1000 10000)')
+    arg_parser.add_argument('--nullable', type=float, default=0.3,
+                            help='Fraction of non-terminals with an epsilon alternative (default: 0.3)')
+    arg_parser.add_argument('--open', type=float, default=0.3,
+                            help='Fraction of alternatives ending in a non-terminal (default: 0.3)')
+    arg_parser.add_argument('--depth', type=int, default=8,
+                            help='Length of the longest non-terminal chain (default: 8)')
+    arg_parser.add_argument('--tokens', type=int, default=10000,
+                            help='Approximate length of the parsed sentence (default: 10000)')
+    arg_parser.add_argument('-r', '--repeats', type=int, default=3,
+                            help='Timed repetitions, the best is kept (default: 3)')
+    arg_parser.add_argument('--seed', type=int, default=0, help='Random seed (default: 0)')
+    arg_parser.add_argument('-o', '--output', default='grammar_benchmark.json',
+                            help='JSON results file (default: grammar_benchmark.json)')
+    args = arg_parser.parse_args()
+
+    results = run_benchmark(args.sizes, args.nullable, args.depth, args.tokens, args.repeats, args.seed,
+                            args.open)
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,243 @@
+from typing import List, Optional, Sequence
+
+from minilang_parser import FIPEntry, MinilangParser, lookahead_terminal, parse_entries
+from parallel_parser import split_program
+from parse_tree import ParseNode, build_tree
+
+
+class _Fenwick:
+    """Prefix sums over statement slot lengths with O(log n) update and search"""
+
+    def __init__(self, values: Sequence[int]):
+        self.size = len(values)
+        self.tree = [0] * (self.size + 1)
+        for i, value in enumerate(values, 1):
+            self.tree[i] += value
+            parent = i + (i & -i)
+            if parent <= self.size:
+                self.tree[parent] += self.tree[i]
+
+    def add(self, index: int, delta: int):
+        i = index + 1
+        while i <= self.size:
+            self.tree[i] += delta
+            i += i & -i
+
+    def prefix(self, index: int) -> int:
+        """Sum of the first index values"""
+        total = 0
+        while index > 0:
+            total += self.tree[index]
+            index -= index & -index
+        return total
+
+    def find(self, position: int) -> int:
+        """Index of the slot containing position, i.e. the largest i with prefix(i) <= position"""
+        index = 0
+        step = 1 << self.size.bit_length()
+        while step:
+            candidate = index + step
+            if candidate <= self.size and self.tree[candidate] <= position:
+                index = candidate
+                position -= self.tree[candidate]
+            step >>= 1
+        return index
+
+
+class IncrementalParser:
+    """Keeps the parse of a Minilang program and re-parses only what an edit damages
+
+    The tree is kept as the program header (Program and the declarations) plus one subtree per
+    top-level statement; each node records its entry range relative to its parent, and its stack
+    state is recoverable with ParseNode.stack_below. Statement slots (a statement and the ';' after
+    it) are indexed by a Fenwick tree, so locating an edit costs O(log n) and later statements are
+    never renumbered.
+    """
+
+    def __init__(self, parser: MinilangParser, fip_entries: Sequence[FIPEntry]):
+        self.parser = parser
+        self.entries: List[FIPEntry] = list(fip_entries)
+        self._full_parse()
+
+    def _parse(self, start_symbol: str, entries: Sequence[FIPEntry], end_token: str) -> ParseNode:
+        parser = self.parser
+        derivation = parse_entries(parser.parsing_table, parser.non_terminals, start_symbol, entries,
+                                   end_token=end_token)
+        node = build_tree(derivation, entries, start_symbol, parser.non_terminals)
+        if node.length != len(entries):
+            # The slot lengths are derived from the subtrees, so they must cover every entry
+            raise Exception(f"Syntax error at position {node.length}: Unexpected token "
+                            f"'{entries[node.length].token}' after '{start_symbol}'")
+        return node
+
+    def _full_parse(self):
+        parser = self.parser
+        entries = self.entries
+        split = split_program(parser, entries)
+        if split is None:
+            # Only invalid programs fail the pre-scan; a full parse gives the proper error message
+            parse_entries(parser.parsing_table, parser.non_terminals, parser.start_symbol, entries,
+                          collect_derivation=False)
+            raise Exception("Program could not be split into top-level statements")
+
+        declarations_start, instructions_start, segments = split
+        statements = [self._parse('Instruction', entries[start:end], end_token) for start, end, end_token in segments]
+
+        first_instruction = lookahead_terminal(entries[instructions_start])
+        table = parser.parsing_table
+        header = [table[(parser.start_symbol, lookahead_terminal(entries[0]))]]
+        header.extend(parse_entries(table, parser.non_terminals, 'DeclarationsOpt',
+                                    entries[declarations_start:instructions_start], end_token=first_instruction))
+        if ('InstructionsOpt', first_instruction) not in table:
+            raise Exception(f"Syntax error at position {instructions_start}: "
+                            f"No production for non-terminal 'InstructionsOpt' with token '{first_instruction}'")
+
+        self.header = header
+        self.instructions_start = instructions_start
+        self.statements: List[ParseNode] = statements
+        self.slots = _Fenwick(self._slot_lengths(statements))
+
+    @staticmethod
+    def _slot_lengths(statements: List[ParseNode]) -> List[int]:
+        # Every statement but the last is followed by its ';'
+        return [statement.length + 1 for statement in statements[:-1]] + \
+            [statement.length for statement in statements[-1:]]
+
+    def statement_start(self, index: int) -> int:
+        return self.instructions_start + self.slots.prefix(index)
+
+    def derivation(self) -> List[List[str]]:
+        """Leftmost derivation of the whole program, equal to a from-scratch parse"""
+        table = self.parser.parsing_table
+        derivation = list(self.header)
+        derivation.append(table[('InstructionsOpt', lookahead_terminal(self.entries[self.instructions_start]))])
+        last = len(self.statements) - 1
+        for i, statement in enumerate(self.statements):
+            first = lookahead_terminal(self.entries[self.statement_start(i)])
+            derivation.append(table[('InstructionList', first)])
+            derivation.extend(statement.derivation())
+            derivation.append(table[('InstructionListTail', ';' if i < last else '}')])
+        return derivation
+
+    def edit(self, start: int, end: int, new_entries: Sequence[FIPEntry]) -> Optional[ParseNode]:
+        """Replace entries[start:end] with new_entries and update the parse
+
+        Returns the re-parsed Instruction subtree, or None when a list of statements (or, for edits
+        outside the statement list, the whole program) had to be re-parsed. Raises on a syntax error,
+        in which case the previous entries and parse are kept.
+        """
+        new_entries = list(new_entries)
+        body_end = len(self.entries) - 1  # The closing '}' of the program
+        if not self.statements or start < self.instructions_start or end > body_end:
+            self._reparse_all(start, end, new_entries)
+            return None
+
+        first = self.slots.find(start - self.instructions_start)
+        statement_start = self.statement_start(first)
+        if end <= statement_start + self.statements[first].length:
+            node = self._reparse_inside(first, statement_start, start, end, new_entries)
+            if node is not None:
+                return node
+
+        last = self.slots.find(max(start, end - 1) - self.instructions_start)
+        try:
+            self._reparse_statements(first, last, start, end, new_entries)
+        except Exception:
+            if first != 0:
+                raise
+            # The edit may have removed every statement or turned the first ones into declarations
+            self._reparse_all(start, end, new_entries)
+        return None
+
+    def _reparse_all(self, start: int, end: int, new_entries: List[FIPEntry]):
+        previous = self.entries
+        self.entries = previous[:start] + new_entries + previous[end:]
+        try:
+            self._full_parse()
+        except Exception:
+            self.entries = previous
+            raise
+
+    def _reparse_inside(self, index: int, statement_start: int, start: int, end: int,
+                        new_entries: List[FIPEntry]) -> Optional[ParseNode]:
+        """Re-parse the smallest Instruction in statement index that covers the edit"""
+        # Descend to the deepest Instruction node covering [start, end)
+        candidates = []
+        node, node_start = self.statements[index], statement_start
+        while node is not None:
+            if node.symbol == 'Instruction':
+                candidates.append((node, node_start))
+            inner = None
+            for child in node.children:
+                child_start = node_start + child.offset
+                if child_start <= start and end <= child_start + child.length and child.children:
+                    inner, node_start = child, child_start
+                    break
+            node = inner
+
+        delta = len(new_entries) - (end - start)
+        for node, node_start in reversed(candidates):
+            node_end = node_start + node.length
+            tokens = self.entries[node_start:start] + new_entries + self.entries[end:node_end]
+            try:
+                replacement = self._parse('Instruction', tokens, lookahead_terminal(self.entries[node_end]))
+            except Exception:
+                continue  # Let an enclosing Instruction absorb the edit
+
+            self.entries[start:end] = new_entries
+            self._replace_subtree(index, node, replacement, delta)
+            return replacement
+        return None
+
+    def _replace_subtree(self, index: int, old: ParseNode, new: ParseNode, delta: int):
+        parent = old.parent
+        if parent is None:
+            self.statements[index] = new
+        else:
+            new.parent, new.index, new.offset = parent, old.index, old.offset
+            parent.children[old.index] = new
+            # Grow the ancestors and shift the siblings that follow the replaced subtree
+            child = new
+            while parent is not None:
+                parent.length += delta
+                for sibling in parent.children[child.index + 1:]:
+                    sibling.offset += delta
+                child, parent = parent, parent.parent
+        self.slots.add(index, delta)
+
+    def _reparse_statements(self, first: int, last: int, start: int, end: int, new_entries: List[FIPEntry]):
+        """Re-parse statement slots first..last as a statement list after applying the edit"""
+        region_start = self.statement_start(first)
+        region_end = self.statement_start(last) + self.slots.prefix(last + 1) - self.slots.prefix(last)
+        tokens = self.entries[region_start:start] + new_entries + self.entries[end:region_end]
+        is_last = last == len(self.statements) - 1
+
+        # Split the new region on ';' at brace depth 0
+        segments, depth, segment_start = [], 0, 0
+        for i, entry in enumerate(tokens):
+            if entry.token == '{':
+                depth += 1
+            elif entry.token == '}':
+                depth -= 1
+                if depth < 0:
+                    raise Exception(f"Syntax error at position {region_start + i}: Unmatched '}}'")
+            elif entry.token == ';' and depth == 0:
+                segments.append((segment_start, i, ';'))
+                segment_start = i + 1
+        if is_last:
+            segments.append((segment_start, len(tokens), '}'))
+        elif segment_start != len(tokens):
+            raise Exception(f"Syntax error at position {region_start + segment_start}: "
+                            f"Expected ';' before the next statement")
+
+        replacements = [self._parse('Instruction', tokens[s:e], end_token) for s, e, end_token in segments]
+
+        self.entries[start:end] = new_entries
+        self.statements[first:last + 1] = replacements
+        if len(replacements) == last - first + 1:
+            for i, statement in enumerate(replacements, first):
+                current = self.slots.prefix(i + 1) - self.slots.prefix(i)
+                wanted = statement.length + (1 if i < len(self.statements) - 1 else 0)
+                self.slots.add(i, wanted - current)
+        else:
+            self.slots = _Fenwick(self._slot_lengths(self.statements))
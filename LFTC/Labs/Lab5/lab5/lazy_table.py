@@ -0,0 +1,83 @@
+from collections.abc import Mapping
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+
+class LazyParsingTable(Mapping):
+    """LL(1) parsing table whose rows are built the first time the parser needs them
+
+    Only FIRST and FOLLOW are computed up front; a non-terminal's row is then derived from them
+    on its first lookup and memoized. Lookups behave like the dict from build_parsing_table, and
+    the grammar can be a MinilangParser or a Grammar. Conflicts are only detected when the row
+    containing them is built, so call validate() to force and check every row.
+    """
+
+    def __init__(self, grammar, first_sets: Optional[Dict[str, Set[str]]] = None,
+                 follow_sets: Optional[Dict[str, Set[str]]] = None):
+        self.grammar = grammar
+        self.first_sets = first_sets if first_sets is not None else grammar.compute_first_sets()
+        self.follow_sets = follow_sets if follow_sets is not None else grammar.compute_follow_sets(self.first_sets)
+        self.rows: Dict[str, Dict[str, List[str]]] = {}
+
+    def row(self, non_terminal: str) -> Dict[str, List[str]]:
+        """Entries of a non-terminal's row, keyed by terminal"""
+        row = self.rows.get(non_terminal)
+        if row is None:
+            row = self._build_row(non_terminal)
+            self.rows[non_terminal] = row
+        return row
+
+    def _build_row(self, non_terminal: str) -> Dict[str, List[str]]:
+        first_sets = self.first_sets
+        row = {}
+
+        def add(terminal: str, production: List[str]):
+            existing = row.get(terminal)
+            if existing is not None and existing != production:
+                raise Exception(f"Grammar is not LL(1): Conflict at {(non_terminal, terminal)} "
+                                f"between {existing} and {production}")
+            row[terminal] = production
+
+        for production in self.grammar.productions.get(non_terminal, []):
+            can_be_epsilon = True
+            if production != ['epsilon']:
+                for symbol in production:
+                    symbol_first = first_sets.get(symbol, {symbol})
+                    for terminal in symbol_first:
+                        if terminal != 'epsilon':
+                            add(terminal, production)
+                    if 'epsilon' not in symbol_first:
+                        can_be_epsilon = False
+                        break
+
+            # Nullable productions are chosen on FOLLOW
+            if can_be_epsilon:
+                for terminal in self.follow_sets.get(non_terminal, ()):
+                    add(terminal, production)
+        return row
+
+    def validate(self) -> int:
+        """Build every remaining row, raising on the first LL(1) conflict; returns the number of entries"""
+        return sum(len(self.row(non_terminal)) for non_terminal in self.grammar.non_terminals)
+
+    def get(self, key, default=None):
+        non_terminal, terminal = key
+        if non_terminal not in self.grammar.non_terminals:
+            return default
+        return self.row(non_terminal).get(terminal, default)
+
+    def __getitem__(self, key: Tuple[str, str]) -> List[str]:
+        production = self.get(key)
+        if production is None:
+            raise KeyError(key)
+        return production
+
+    def __contains__(self, key) -> bool:
+        return self.get(key) is not None
+
+    def __iter__(self) -> Iterator[Tuple[str, str]]:
+        for non_terminal in sorted(self.grammar.non_terminals):
+            for terminal in self.row(non_terminal):
+                yield non_terminal, terminal
+
+    def __len__(self) -> int:
+        return self.validate()
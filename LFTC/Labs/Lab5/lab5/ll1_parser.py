@@ -1,6 +1,8 @@
-from typing import Dict, Set, List, Tuple
+from typing import Dict, Set, List, Tuple, Optional, Mapping
 from collections import defaultdict
 
+from grammar_analysis import PruneReport, prune_grammar
+
 
 class Grammar:
     def __init__(self):
@@ -16,7 +18,8 @@ class Grammar:
             if not symbol.isupper() and symbol != 'epsilon':
                 self.terminals.add(symbol)
 
-    def read_from_file(self, filename: str):
+    def read_from_file(self, filename: str, prune: bool = False) -> Optional[PruneReport]:
+        """Read the grammar; with prune=True drop useless symbols and return what was removed"""
         try:
             with open(filename, 'r') as f:
                 lines = f.readlines()
@@ -39,6 +42,10 @@ class Grammar:
         except FileNotFoundError:
             raise Exception(f"Grammar file {filename} not found")
 
+        if prune:
+            return prune_grammar(self)
+        return None
+
     def compute_first_sets(self) -> Dict[str, Set[str]]:
         first = defaultdict(set)
 
@@ -162,8 +169,10 @@ class Grammar:
 
         return parsing_table
 
-    def parse(self, input_string: str) -> List[List[str]]:
-        parsing_table = self.build_parsing_table()
+    def parse(self, input_string: str, parsing_table: Optional[Mapping] = None) -> List[List[str]]:
+        # Any mapping with the dict's lookup semantics works, e.g. a CompressedParsingTable
+        if parsing_table is None:
+            parsing_table = self.build_parsing_table()
         stack = ['$', self.start_symbol]
         input_tokens = input_string.split() + ['$']
         position = 0
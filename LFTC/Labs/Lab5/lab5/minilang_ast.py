@@ -0,0 +1,208 @@
+import math
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Union
+
+from minilang_parser import FIPEntry, MinilangParser
+from parse_tree import ParseNode, build_tree
+
+
+@dataclass
+class Number:
+    value: Union[int, float]
+    line: int = 0
+
+
+@dataclass
+class Variable:
+    name: str
+    line: int = 0
+
+
+@dataclass
+class Constant:
+    """Named built-in constant such as M_PI"""
+    name: str
+    line: int = 0
+
+
+@dataclass
+class BinaryOp:
+    """Arithmetic (+ - * / and << from strength reduction) or comparison (< <= == != >= >)"""
+    op: str
+    left: 'Expression'
+    right: 'Expression'
+    line: int = 0
+
+
+Expression = Union[Number, Variable, Constant, BinaryOp]
+
+
+@dataclass
+class Assign:
+    name: str
+    value: Expression
+    line: int = 0
+
+
+@dataclass
+class Read:
+    name: str
+    line: int = 0
+
+
+@dataclass
+class Write:
+    value: Expression
+    line: int = 0
+
+
+@dataclass
+class If:
+    condition: BinaryOp
+    body: List['Statement']
+    line: int = 0
+
+
+@dataclass
+class While:
+    condition: BinaryOp
+    body: List['Statement']
+    line: int = 0
+
+
+Statement = Union[Assign, Read, Write, If, While]
+
+
+@dataclass
+class Declaration:
+    type_name: str  # 'int' or 'double'
+    names: List[str]
+    line: int = 0
+
+
+@dataclass
+class Program:
+    declarations: List[Declaration] = field(default_factory=list)
+    body: List[Statement] = field(default_factory=list)
+
+    def variables(self) -> List[tuple]:
+        """(name, type) of every declared variable, in declaration order"""
+        return [(name, declaration.type_name) for declaration in self.declarations for name in declaration.names]
+
+
+COMPARISON_OPS = frozenset({'<', '<=', '==', '!=', '>=', '>'})
+BUILTIN_CONSTANTS: Dict[str, float] = {'M_PI': math.pi}
+
+
+def expression_type(expression: Expression, types: Dict[str, str]) -> str:
+    """Static type of an expression: 'bool' for comparisons, else 'double' if any operand is"""
+    if isinstance(expression, BinaryOp) and expression.op in COMPARISON_OPS:
+        return 'bool'
+    stack = [expression]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, BinaryOp):
+            stack.extend((node.left, node.right))
+        elif isinstance(node, Number):
+            if isinstance(node.value, float):
+                return 'double'
+        elif isinstance(node, Constant) or types.get(node.name) == 'double':
+            return 'double'
+    return 'int'
+
+
+def _number(text: str) -> Union[int, float]:
+    return float(text) if '.' in text else int(text)
+
+
+def _lower_expression(node: ParseNode) -> Expression:
+    """Expression -> Term ExpressionTail, with the tail folded into left-associative BinaryOps"""
+    term, tail = node.children
+    result = _lower_term(term)
+    while tail.children:  # ExpressionTail -> op Term ExpressionTail | epsilon
+        op, term, tail = tail.children
+        result = BinaryOp(op.entry.token, result, _lower_term(term), op.entry.line)
+    return result
+
+
+def _lower_term(node: ParseNode) -> Expression:
+    factor, tail = node.children
+    result = _lower_factor(factor)
+    while tail.children:  # TermTail -> op Factor TermTail | epsilon
+        op, factor, tail = tail.children
+        result = BinaryOp(op.entry.token, result, _lower_factor(factor), op.entry.line)
+    return result
+
+
+def _lower_factor(node: ParseNode) -> Expression:
+    if len(node.children) == 3:  # ( Expression )
+        return _lower_expression(node.children[1])
+    child = node.children[0]
+    if child.symbol == 'id':
+        return Variable(child.entry.token, child.entry.line)
+    if child.symbol in BUILTIN_CONSTANTS:
+        return Constant(child.symbol, child.entry.line)
+    return Number(_number(child.entry.token), child.entry.line)
+
+
+def _lower_condition(node: ParseNode) -> BinaryOp:
+    left, rel_op, right = node.children
+    op = rel_op.children[0].entry
+    return BinaryOp(op.token, _lower_expression(left), _lower_expression(right), op.line)
+
+
+def _lower_statements(node: ParseNode) -> List[Statement]:
+    """InstructionsOpt -> InstructionList | epsilon, walking the list without recursion"""
+    statements = []
+    if not node.children:
+        return statements
+    instruction_list = node.children[0]
+    while True:
+        instruction, tail = instruction_list.children
+        statements.append(_lower_instruction(instruction))
+        if not tail.children:  # InstructionListTail -> ; InstructionList | epsilon
+            return statements
+        instruction_list = tail.children[1]
+
+
+def _lower_instruction(node: ParseNode) -> Statement:
+    kind = node.children[0]
+    if kind.symbol == 'ControlStmt':
+        keyword, block = kind.children
+        # IfBlock / WhileBlock -> ( Condition ) { InstructionsOpt }
+        condition = _lower_condition(block.children[1])
+        body = _lower_statements(block.children[4])
+        cls = If if keyword.symbol == 'if' else While
+        return cls(condition, body, keyword.entry.line)
+
+    statement = kind.children[0]
+    children = statement.children
+    if statement.symbol == 'Assignment':  # id = Expression
+        return Assign(children[0].entry.token, _lower_expression(children[2]), children[0].entry.line)
+    if statement.symbol == 'ReadStmt':  # cin >> id
+        return Read(children[2].entry.token, children[0].entry.line)
+    return Write(_lower_expression(children[2]), children[0].entry.line)  # cout << Expression
+
+
+def lower_program(tree: ParseNode) -> Program:
+    """Turn the parse tree of a Minilang program into its AST"""
+    program = Program()
+    declarations = tree.children[5]
+    while declarations.children:  # DeclarationsOpt / DeclarationsRest -> Declaration DeclarationsRest | epsilon
+        declaration, declarations = declarations.children
+        type_node, first, tail = declaration.children[:3]
+        names = [first.entry.token]
+        while tail.children:  # IdListTail -> , id IdListTail | epsilon
+            _, name, tail = tail.children
+            names.append(name.entry.token)
+        program.declarations.append(Declaration(type_node.children[0].symbol, names, first.entry.line))
+    program.body = _lower_statements(tree.children[6])
+    return program
+
+
+def build_ast(parser: MinilangParser, fip_entries: Iterable[FIPEntry]) -> Program:
+    """Parse FIP entries and lower the resulting parse tree to an AST"""
+    entries = list(fip_entries)
+    derivation = parser.parse_fip(entries, verbose=False)
+    tree = build_tree(derivation, entries, parser.start_symbol, parser.non_terminals)
+    return lower_program(tree)
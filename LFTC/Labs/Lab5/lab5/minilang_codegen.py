@@ -0,0 +1,636 @@
+import argparse
+import os
+import re
+import shutil
+import struct
+import subprocess
+import sys
+import tempfile
+import time
+from bisect import insort
+from dataclasses import dataclass
+from typing import Dict, List, Tuple, Union
+
+from minilang_ast import (Assign, BinaryOp, BUILTIN_CONSTANTS, COMPARISON_OPS, Constant, Expression, If,
+                          Program, Read, Statement, Variable, Write, build_ast)
+from minilang_lexer import MinilangLexer
+from minilang_parser import MinilangParser
+
+# Registers handed out to temporaries, caller-saved first. rax, rcx and rdx stay free as scratch
+# for idiv, shift counts and operands an instruction cannot take from memory; xmm0-xmm7 likewise.
+INT_REGISTERS = ('rsi', 'rdi', 'r8', 'r9', 'r10', 'r11', 'rbx', 'r12', 'r13', 'r14', 'r15')
+DOUBLE_REGISTERS = tuple(f"xmm{i}" for i in range(8, 16))
+CALLEE_SAVED = ('rbx', 'r12', 'r13', 'r14', 'r15')
+
+_INT_OPS = {'+': 'add', '-': 'sub', '*': 'imul', '<<': 'sal'}
+_DOUBLE_OPS = {'+': 'addsd', '-': 'subsd', '*': 'mulsd', '/': 'divsd'}
+# Jump condition codes: signed for ints, the unsigned ones ucomisd sets for doubles
+_INT_CONDITIONS = {'<': 'l', '<=': 'le', '==': 'e', '!=': 'ne', '>=': 'ge', '>': 'g'}
+_DOUBLE_CONDITIONS = {'<': 'b', '<=': 'be', '==': 'e', '!=': 'ne', '>=': 'ae', '>': 'a'}
+_NEGATED = {'<': '>=', '<=': '>', '==': '!=', '!=': '==', '>=': '<', '>': '<='}
+
+_INT32 = range(-2 ** 31, 2 ** 31)
+
+Instruction = Tuple  # (mnemonic, operand, ...) or ('label', name)
+
+
+@dataclass(frozen=True)
+class Temp:
+    """Expression temporary, given a register or a stack slot by the allocator"""
+    index: int
+    kind: str  # 'int' or 'double'
+
+
+@dataclass(frozen=True)
+class Memory:
+    """Variable or double constant in the data sections"""
+    label: str
+    kind: str
+
+
+Operand = Union[Temp, Memory, int]
+
+
+def _kind(operand: Operand) -> str:
+    return 'int' if isinstance(operand, int) else operand.kind
+
+
+def _is_register(place: str) -> bool:
+    return not place.startswith('qword') and not place.lstrip('-').isdigit()
+
+
+def _mentions(place: str, register: str) -> bool:
+    return re.search(rf"\b{register}\b", place) is not None
+
+
+class CodeGenerator:
+    """NASM x86-64 code for a Minilang program, linked against the C library like lab6's output
+
+    The AST is first lowered to three-address code whose operands are immediates, variables or
+    expression temporaries. Temporaries live from their definition to their last use inside one
+    statement, and linear-scan allocation assigns them registers, spilling the interval that ends
+    last to a stack slot when a register class runs out. Variables live in .bss, ints are 64-bit
+    (so they wrap where the Python executor's do not) and doubles use SSE2.
+    """
+
+    def __init__(self, program: Program):
+        self.program = program
+        self.types = dict(program.variables())
+        self.ir: List[tuple] = []
+        self.temp_count = 0
+        self.label_count = 0
+        self.constants: Dict[float, str] = {}
+        self.locations: Dict[Temp, Union[str, int]] = {}  # Register name or stack slot number
+        self.slot_count = 0
+        self.saved: List[str] = []
+        self.uses_division = False
+        self.code: List[Instruction] = []
+
+    def generate(self, peephole_pass: bool = True) -> str:
+        """Assembly text for the program"""
+        self.ir = []
+        self._lower_statements(self.program.body)
+        self.allocate()
+        self.code = self._emit()
+        if peephole_pass:
+            self.code, _ = peephole(self.code)
+        return self.render()
+
+    # Lowering to three-address code
+
+    def _temp(self, kind: str) -> Temp:
+        self.temp_count += 1
+        return Temp(self.temp_count - 1, kind)
+
+    def _label(self) -> str:
+        self.label_count += 1
+        return f".L{self.label_count - 1}"
+
+    def _constant(self, value: float) -> Memory:
+        label = self.constants.setdefault(float(value), f"const_{len(self.constants)}")
+        return Memory(label, 'double')
+
+    def _variable(self, name: str, line: int) -> Memory:
+        if name not in self.types:
+            raise Exception(f"Undeclared variable '{name}' at line {line}")
+        return Memory(f"v_{name}", self.types[name])
+
+    def _as_double(self, operand: Operand) -> Operand:
+        if _kind(operand) == 'double':
+            return operand
+        if isinstance(operand, int):
+            return self._constant(operand)
+        temp = self._temp('double')
+        self.ir.append(('convert', temp, operand))
+        return temp
+
+    def _as_int(self, operand: Operand) -> Operand:
+        if _kind(operand) == 'int':
+            return operand
+        temp = self._temp('int')
+        self.ir.append(('convert', temp, operand))
+        return temp
+
+    def _leaf(self, node: Expression) -> Operand:
+        if isinstance(node, Variable):
+            return self._variable(node.name, node.line)
+        if isinstance(node, Constant):
+            return self._constant(BUILTIN_CONSTANTS[node.name])
+        if isinstance(node.value, float):
+            return self._constant(node.value)
+        if node.value in _INT32:
+            return node.value
+        temp = self._temp('int')  # Only mov takes a 64-bit immediate
+        self.ir.append(('move', temp, node.value))
+        return temp
+
+    def _expression(self, expression: Expression) -> Operand:
+        """Lower an expression bottom-up without recursion, returning the operand holding its value"""
+        stack = [(expression, False)]
+        results: List[Operand] = []
+        while stack:
+            node, visited = stack.pop()
+            if not isinstance(node, BinaryOp):
+                results.append(self._leaf(node))
+            elif visited:
+                right = results.pop()
+                left = results.pop()
+                if node.op in COMPARISON_OPS:
+                    raise Exception(f"Comparison outside a condition at line {node.line}")
+                kind = 'double' if 'double' in (_kind(left), _kind(right)) else 'int'
+                if kind == 'double':
+                    left, right = self._as_double(left), self._as_double(right)
+                temp = self._temp(kind)
+                self.ir.append(('binary', node.op, temp, left, right))
+                results.append(temp)
+            else:
+                stack.extend(((node, True), (node.right, False), (node.left, False)))
+        return results[0]
+
+    def _branch(self, condition: Expression, label: str, when: bool):
+        """Jump to label if the condition is when"""
+        if isinstance(condition, BinaryOp) and condition.op in COMPARISON_OPS:
+            op, left, right = condition.op, self._expression(condition.left), self._expression(condition.right)
+        else:
+            op, left, right = '!=', self._expression(condition), 0
+        if 'double' in (_kind(left), _kind(right)):
+            left, right = self._as_double(left), self._as_double(right)
+        self.ir.append(('branch', op if when else _NEGATED[op], left, right, label))
+
+    def _lower_statements(self, statements: List[Statement]):
+        for statement in statements:
+            if isinstance(statement, Assign):
+                target = self._variable(statement.name, statement.line)
+                value = self._expression(statement.value)
+                value = self._as_double(value) if target.kind == 'double' else self._as_int(value)
+                self.ir.append(('move', target, value))
+            elif isinstance(statement, Read):
+                self.ir.append(('read', self._variable(statement.name, statement.line)))
+            elif isinstance(statement, Write):
+                self.ir.append(('write', self._expression(statement.value)))
+            elif isinstance(statement, If):
+                end = self._label()
+                self._branch(statement.condition, end, False)
+                self._lower_statements(statement.body)
+                self.ir.append(('label', end))
+            else:
+                # Test at the bottom, so each iteration takes a single conditional jump
+                body, test = self._label(), self._label()
+                self.ir.append(('jump', test))
+                self.ir.append(('label', body))
+                self._lower_statements(statement.body)
+                self.ir.append(('label', test))
+                self._branch(statement.condition, body, True)
+
+    # Linear-scan register allocation
+
+    def intervals(self) -> Dict[Temp, Tuple[int, int]]:
+        """Live interval (definition, last use) of every temporary, as indices into the IR"""
+        intervals = {}
+        for index, instruction in enumerate(self.ir):
+            for argument in instruction[1:]:
+                if isinstance(argument, Temp):
+                    intervals[argument] = (intervals[argument][0] if argument in intervals else index, index)
+        return intervals
+
+    def allocate(self):
+        """Assign every temporary a register or, when its class runs out, a stack slot"""
+        pools = {'int': INT_REGISTERS, 'double': DOUBLE_REGISTERS}
+        free = {kind: list(pool) for kind, pool in pools.items()}
+        free_slots: List[int] = []
+        active: List[Tuple[int, int, Temp]] = []  # (end, index, temp), by end
+        self.locations = {}
+        self.slot_count = 0
+
+        for temp, (start, end) in sorted(self.intervals().items(), key=lambda item: item[1][0]):
+            # Intervals ending at this instruction are operands of it, so their registers
+            # may already hold its result
+            while active and active[0][0] <= start:
+                _, _, expired = active.pop(0)
+                location = self.locations[expired]
+                if isinstance(location, int):
+                    free_slots.append(location)
+                else:
+                    free[expired.kind].append(location)
+                    free[expired.kind].sort(key=pools[expired.kind].index)
+
+            definition = self.ir[start]
+            hint = self.locations.get(definition[3]) if definition[0] == 'binary' else None
+            registers = free[temp.kind]
+            if hint in registers:
+                registers.remove(hint)
+                self.locations[temp] = hint
+            elif registers:
+                self.locations[temp] = registers.pop(0)
+            else:
+                candidates = [entry for entry in active if entry[2].kind == temp.kind]
+                victim = max(candidates, key=lambda entry: entry[0])
+                if victim[0] > end:
+                    # The victim lives longer: it moves to the stack for its whole lifetime, in a
+                    # new slot since the free ones were in use when it was defined
+                    self.locations[temp] = self.locations[victim[2]]
+                    self.locations[victim[2]] = self._slot([])
+                else:
+                    self.locations[temp] = self._slot(free_slots)
+            insort(active, (end, temp.index, temp))
+
+        used = set(self.locations.values())
+        self.saved = [register for register in CALLEE_SAVED if register in used]
+
+    def _slot(self, free_slots: List[int]) -> int:
+        if free_slots:
+            return free_slots.pop()
+        self.slot_count += 1
+        return self.slot_count - 1
+
+    def spilled(self) -> int:
+        """Number of temporaries that live in stack slots"""
+        return sum(isinstance(location, int) for location in self.locations.values())
+
+    # Instruction selection
+
+    def _place(self, operand: Operand) -> str:
+        if isinstance(operand, int):
+            return str(operand)
+        if isinstance(operand, Memory):
+            return f"qword [{operand.label}]"
+        location = self.locations[operand]
+        if isinstance(location, str):
+            return location
+        return f"qword [rbp - {8 * (len(self.saved) + 1 + location)}]"
+
+    def _emit(self) -> List[Instruction]:
+        code: List[Instruction] = []
+        for instruction in self.ir:
+            getattr(self, f"_emit_{instruction[0]}")(code, *instruction[1:])
+        return code
+
+    def _emit_binary(self, code: List[Instruction], op: str, dst: Temp, left: Operand, right: Operand):
+        target, a, b = self._place(dst), self._place(left), self._place(right)
+        if dst.kind == 'double':
+            self._emit_double_binary(code, op, target, a, b)
+            return
+        if op == '/':
+            self.uses_division = True
+            code.append(('mov', 'rax', a))
+            if isinstance(right, int):  # idiv takes no immediate
+                code.append(('mov', 'rcx', b))
+                b = 'rcx'
+            if b.startswith('qword'):
+                code.append(('cmp', b, '0'))
+            else:
+                code.append(('test', b, b))
+            code.append(('je', 'division_by_zero'))
+            code.append(('cqo',))
+            code.append(('idiv', b))
+            code.append(('mov', target, 'rax'))
+            return
+
+        if target == b and op in ('+', '*'):
+            a, b = b, a
+        work = target if _is_register(target) and target != b else 'rax'
+        code.append(('mov', work, a))
+        if op == '<<' and not isinstance(right, int):
+            code.append(('mov', 'rcx', b))
+            b = 'cl'
+        code.append((_INT_OPS[op], work, b))
+        if work != target:
+            code.append(('mov', target, work))
+
+    def _emit_double_binary(self, code: List[Instruction], op: str, target: str, a: str, b: str):
+        if op == '/':
+            self.uses_division = True
+            divisor = b
+            if not _is_register(divisor):
+                code.append(('movsd', 'xmm1', divisor))
+                divisor = 'xmm1'
+            code.append(('xorpd', 'xmm2', 'xmm2'))
+            code.append(('ucomisd', divisor, 'xmm2'))
+            code.append(('je', 'division_by_zero'))
+        if target == b and op in ('+', '*'):
+            a, b = b, a
+        work = target if _is_register(target) and target != b else 'xmm0'
+        code.append(('movsd', work, a))
+        code.append((_DOUBLE_OPS[op], work, b))
+        if work != target:
+            code.append(('movsd', target, work))
+
+    def _emit_convert(self, code: List[Instruction], dst: Temp, src: Operand):
+        target, source = self._place(dst), self._place(src)
+        if dst.kind == 'double':
+            work = target if _is_register(target) else 'xmm0'
+            code.append(('cvtsi2sd', work, source))
+            mov = 'movsd'
+        else:
+            work = target if _is_register(target) else 'rax'
+            code.append(('cvttsd2si', work, source))  # Truncates like a C conversion
+            mov = 'mov'
+        if work != target:
+            code.append((mov, target, work))
+
+    def _emit_move(self, code: List[Instruction], dst: Union[Temp, Memory], src: Operand):
+        target, source = self._place(dst), self._place(src)
+        mov, scratch = ('movsd', 'xmm0') if dst.kind == 'double' else ('mov', 'rax')
+        wide = isinstance(src, int) and src not in _INT32
+        if not _is_register(target) and (source.startswith('qword') or wide):
+            code.append((mov, scratch, source))
+            source = scratch
+        code.append((mov, target, source))
+
+    def _emit_read(self, code: List[Instruction], variable: Memory):
+        code.append(('lea', 'rsi', f"[{variable.label}]"))
+        code.append(('lea', 'rdi', f"[fmt_read_{variable.kind}]"))
+        code.append(('xor', 'eax', 'eax'))
+        code.append(('call', 'scanf'))
+
+    def _emit_write(self, code: List[Instruction], value: Operand):
+        if _kind(value) == 'double':
+            code.append(('movsd', 'xmm0', self._place(value)))
+            code.append(('lea', 'rdi', '[fmt_write_double]'))
+            code.append(('mov', 'eax', '1'))  # Vector registers used by the variadic call
+        else:
+            code.append(('mov', 'rsi', self._place(value)))
+            code.append(('lea', 'rdi', '[fmt_write_int]'))
+            code.append(('xor', 'eax', 'eax'))
+        code.append(('call', 'printf'))
+
+    def _emit_branch(self, code: List[Instruction], op: str, left: Operand, right: Operand, label: str):
+        a, b = self._place(left), self._place(right)
+        if _kind(left) == 'double':
+            if not _is_register(a):
+                code.append(('movsd', 'xmm0', a))
+                a = 'xmm0'
+            code.append(('ucomisd', a, b))
+            code.append((f"j{_DOUBLE_CONDITIONS[op]}", label))
+            return
+        if isinstance(left, int) or (a.startswith('qword') and b.startswith('qword')):
+            code.append(('mov', 'rax', a))
+            a = 'rax'
+        code.append(('cmp', a, b))
+        code.append((f"j{_INT_CONDITIONS[op]}", label))
+
+    @staticmethod
+    def _emit_jump(code: List[Instruction], label: str):
+        code.append(('jmp', label))
+
+    @staticmethod
+    def _emit_label(code: List[Instruction], label: str):
+        code.append(('label', label))
+
+    # Output
+
+    def render(self) -> str:
+        lines = ["section .data",
+                 '    fmt_read_int db "%lld", 0',
+                 '    fmt_read_double db "%lf", 0',
+                 '    fmt_write_int db "%lld", 10, 0',
+                 '    fmt_write_double db "%g", 10, 0']
+        if self.uses_division:
+            lines.append('    msg_division_by_zero db "Runtime error: division by zero", 10, 0')
+        for value, label in self.constants.items():
+            bits = struct.unpack('<Q', struct.pack('<d', value))[0]
+            lines.append(f"    {label} dq 0x{bits:016x}  ; {value!r}")
+        lines.append("section .bss")
+        lines.extend(f"    v_{name} resq 1" for name in self.types)
+        lines.extend(["section .text", "    global main", "    extern printf", "    extern scanf"])
+        if self.uses_division:
+            lines.append("    extern exit")
+
+        # Keep rsp 16-byte aligned at the calls: the return address and rbp make 16 bytes
+        frame = 8 * self.slot_count
+        if (8 * len(self.saved) + frame) % 16:
+            frame += 8
+        prologue = [('push', 'rbp'), ('mov', 'rbp', 'rsp')] + [('push', register) for register in self.saved]
+        if frame:
+            prologue.append(('sub', 'rsp', str(frame)))
+        epilogue = [('xor', 'eax', 'eax')]
+        if self.saved:
+            epilogue.append(('lea', 'rsp', f"[rbp - {8 * len(self.saved)}]"))
+            epilogue.extend(('pop', register) for register in reversed(self.saved))
+            epilogue.append(('pop', 'rbp'))
+        else:
+            epilogue.append(('leave',))
+        epilogue.append(('ret',))
+        code = [('label', 'main')] + prologue + self.code + epilogue
+        if self.uses_division:
+            code += [('label', 'division_by_zero'), ('lea', 'rdi', '[msg_division_by_zero]'), ('xor', 'eax', 'eax'),
+                     ('call', 'printf'), ('mov', 'edi', '1'), ('call', 'exit')]
+        lines.extend(format_instruction(instruction) for instruction in code)
+        return "\n".join(lines) + "\n"
+
+
+def format_instruction(instruction: Instruction) -> str:
+    if instruction[0] == 'label':
+        return f"{instruction[1]}:"
+    mnemonic, *operands = instruction
+    return f"    {mnemonic} {', '.join(operands)}" if operands else f"    {mnemonic}"
+
+
+def _is_move(instruction: Instruction) -> bool:
+    return instruction[0] in ('mov', 'movsd') and len(instruction) == 3
+
+
+def peephole(code: List[Instruction]) -> Tuple[List[Instruction], int]:
+    """Remove redundant moves, push/pop pairs and jumps over nothing; returns the code and how many
+    instructions went. Only adjacent instructions are matched, so labels bound every rewrite."""
+    original = len(code)
+    changed = True
+    while changed:
+        changed = False
+        result: List[Instruction] = []
+        for instruction in code:
+            previous = result[-1] if result else None
+            mnemonic = instruction[0]
+
+            if _is_move(instruction) and instruction[1] == instruction[2]:
+                pass  # mov a, a
+            elif mnemonic in ('add', 'sub', 'sal') and instruction[2] == '0' \
+                    or mnemonic == 'imul' and instruction[2] == '1':
+                pass  # Identity arithmetic; every branch has its own cmp, so the flags are not needed
+            elif previous is None:
+                result.append(instruction)
+                continue
+            elif mnemonic == 'pop' and previous[0] == 'push':
+                result.pop()
+                if previous[1] != instruction[1]:
+                    result.append(('mov', instruction[1], previous[1]))
+            elif _is_move(instruction) and _is_move(previous) and mnemonic == previous[0]:
+                target, source = instruction[1], instruction[2]
+                if (target, source) == (previous[2], previous[1]):
+                    pass  # mov a, b; mov b, a
+                elif target == previous[1] and _is_register(target) and not _mentions(source, target):
+                    result[-1] = instruction  # The first value is overwritten unread
+                elif source == previous[1] and source.startswith('qword') and _is_register(previous[2]) \
+                        and not target.startswith('qword'):
+                    result.append((mnemonic, target, previous[2]))  # Reload of a just stored value
+                else:
+                    result.append(instruction)
+                    continue
+            elif mnemonic == 'label' and previous == ('jmp', instruction[1]):
+                result[-1] = instruction
+            else:
+                result.append(instruction)
+                continue
+            changed = True
+        code = result
+    return code, original - len(code)
+
+
+def generate_assembly(program: Program, peephole_pass: bool = True) -> str:
+    return CodeGenerator(program).generate(peephole_pass)
+
+
+def count_instructions(assembly: str) -> int:
+    """Instructions in the text section of NASM output, ignoring labels and directives"""
+    count = 0
+    in_text = False
+    for line in assembly.splitlines():
+        line = line.split(';')[0].strip()
+        if line.startswith('section'):
+            in_text = line == 'section .text'
+        elif in_text and line and not line.endswith(':') and line.split()[0] not in ('global', 'extern'):
+            count += 1
+    return count
+
+
+# Building and running, with the same commands as lab6's Makefile
+
+def toolchain_available() -> bool:
+    return shutil.which('nasm') is not None and shutil.which('gcc') is not None
+
+
+def build_executable(assembly: str, executable: str):
+    """Assemble and link NASM text into an executable"""
+    if not toolchain_available():
+        raise Exception("nasm and gcc are needed to build the assembly output")
+    base = os.path.splitext(executable)[0]
+    with open(base + '.asm', 'w') as f:
+        f.write(assembly)
+    for command in (['nasm', '-f', 'elf64', base + '.asm', '-o', base + '.o'],
+                    ['gcc', '-no-pie', base + '.o', '-o', executable]):
+        completed = subprocess.run(command, capture_output=True, text=True)
+        if completed.returncode != 0:
+            raise Exception(f"{' '.join(command)} failed:\n{completed.stderr}")
+
+
+def run_executable(executable: str, input_text: str = "", repeats: int = 1) -> Tuple[str, float]:
+    """Output of the executable on input_text, and its best wall-clock time in ms"""
+    best, output = float('inf'), ""
+    for _ in range(repeats):
+        start = time.perf_counter()
+        completed = subprocess.run([executable], input=input_text, capture_output=True, text=True)
+        best = min(best, (time.perf_counter() - start) * 1000)
+        output = completed.stdout
+    return output, best
+
+
+def lab6_to_minilang(source: str) -> str:
+    """Translate a lab6 program (program/var/read/write/:=/end) into the equivalent Minilang program"""
+    statements = [s.strip() for s in re.sub(r"\bend\b", ";", source).split(';') if s.strip()]
+    declarations, body = [], []
+    for statement in statements:
+        keyword = statement.split()[0]
+        if keyword == 'program':
+            continue
+        if keyword == 'var':
+            declarations.append(f"    int {statement[3:].strip()};")
+        elif keyword == 'read':
+            body.append(f"    cin >> {statement[4:].strip()}")
+        elif keyword == 'write':
+            body.append(f"    cout << {statement[5:].strip()}")
+        elif ':=' in statement:
+            body.append("    " + statement.replace(':=', '='))
+        else:
+            raise Exception(f"Unsupported lab6 statement: '{statement}'")
+    return "int main() {\n" + "\n".join(declarations) + "\n" + ";\n".join(body) + "\n}\n"
+
+
+def compare_with_lab6(parser: MinilangParser, lab6_source: str, lab6_assembly: str, input_text: str,
+                      repeats: int = 5) -> Dict[str, object]:
+    """Compile a lab6 program with this backend and compare it with lab6's assembly for it
+
+    Instruction counts are always reported; outputs and run times only when the toolchain is installed.
+    """
+    program = build_ast(parser, MinilangLexer(parser.token_codes).lex(lab6_to_minilang(lab6_source).splitlines()))
+    assembly = generate_assembly(program)
+    report: Dict[str, object] = {
+        'lab6_instructions': count_instructions(lab6_assembly),
+        'instructions': count_instructions(assembly),
+    }
+    if toolchain_available():
+        with tempfile.TemporaryDirectory() as directory:
+            executables = {}
+            for name, text in (('lab6', lab6_assembly), ('python', assembly)):
+                executables[name] = os.path.join(directory, name)
+                build_executable(text, executables[name])
+            report['lab6_output'], report['lab6_ms'] = run_executable(executables['lab6'], input_text, repeats)
+            report['output'], report['ms'] = run_executable(executables['python'], input_text, repeats)
+    return report
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Compile a Minilang program to NASM x86-64 assembly')
+    arg_parser.add_argument('source', help='Path to the Minilang source file')
+    arg_parser.add_argument('-g', '--grammar', default='minilang_grammar.txt',
+                            help='Grammar file (default: minilang_grammar.txt)')
+    arg_parser.add_argument('-o', '--output', default=None, help='Assembly file (default: source with .asm)')
+    arg_parser.add_argument('--no-peephole', action='store_true', help='Skip the peephole pass')
+    arg_parser.add_argument('--lab6', default=None, metavar='ASM',
+                            help='Treat the source as a lab6 program and compare with lab6\'s assembly for it')
+    arg_parser.add_argument('-i', '--input', default=None, help='Input for the compared programs')
+    args = arg_parser.parse_args()
+
+    parser = MinilangParser()
+    parser.read_grammar(args.grammar)
+    try:
+        with open(args.source) as f:
+            source = f.read()
+        if args.lab6:
+            with open(args.lab6) as f:
+                lab6_assembly = f.read()
+            input_text = ""
+            if args.input:
+                with open(args.input) as f:
+                    input_text = f.read()
+            report = compare_with_lab6(parser, source, lab6_assembly, input_text)
+            for key, value in report.items():
+                print(f"{key:18} {value!r}")
+            return 0
+
+        program = build_ast(parser, MinilangLexer(parser.token_codes).lex(source.splitlines()))
+        generator = CodeGenerator(program)
+        assembly = generator.generate(not args.no_peephole)
+    except Exception as e:
+        print(e, file=sys.stderr)
+        return 1
+
+    output = args.output or os.path.splitext(args.source)[0] + '.asm'
+    with open(output, 'w') as f:
+        f.write(assembly)
+    print(f"{count_instructions(assembly)} instructions, {generator.spilled()} spilled temporaries, "
+          f"written to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,358 @@
+import argparse
+import operator
+import sys
+import time
+from typing import Callable, Dict, Iterator, List, Optional, TextIO, Union
+
+from minilang_ast import (Assign, BinaryOp, BUILTIN_CONSTANTS, COMPARISON_OPS, Constant, Expression, If, Number,
+                          Program, Read, Statement, Variable, Write, build_ast, expression_type)
+from minilang_lexer import MinilangLexer
+from minilang_parser import MinilangParser
+
+# Output pieces buffered before a write to the underlying stream
+OUTPUT_BUFFER_SIZE = 4096
+# Longer left-associative chains run in a loop instead of nested closures, keeping the call depth flat
+MAX_NESTED_CHAIN = 8
+
+Value = Union[int, float]
+
+
+def format_value(value: Value) -> str:
+    """Text printed by cout: ints as is, doubles with 6 significant digits like C++'s default"""
+    return str(value) if isinstance(value, int) else '%g' % value
+
+
+def _division_by_zero(line: int):
+    raise Exception(f"Runtime error at line {line}: division by zero")
+
+
+def int_divide(a: int, b: int, line: int = 0) -> int:
+    """C integer division, truncating toward zero"""
+    if b == 0:
+        _division_by_zero(line)
+    quotient = abs(a) // abs(b)
+    return quotient if (a < 0) == (b < 0) else -quotient
+
+
+class InputStream:
+    """Whitespace-separated tokens read lazily from a text stream, as cin does"""
+
+    def __init__(self, stream: TextIO):
+        self.tokens = self._tokens(stream)
+
+    @staticmethod
+    def _tokens(stream: TextIO) -> Iterator[str]:
+        for line in stream:
+            yield from line.split()
+
+    def read(self, type_name: str, line: int) -> Value:
+        token = next(self.tokens, None)
+        if token is None:
+            raise Exception(f"Runtime error at line {line}: unexpected end of input")
+        try:
+            if type_name == 'double':
+                return float(token)
+            return int(token) if token.lstrip('+-').isdigit() else int(float(token))
+        except ValueError:
+            raise Exception(f"Runtime error at line {line}: invalid {type_name} '{token}'")
+
+
+class OutputBuffer:
+    """Collects cout output and writes it to the stream in large pieces"""
+
+    def __init__(self, stream: TextIO, size: int = OUTPUT_BUFFER_SIZE):
+        self.stream = stream
+        self.size = size
+        self.pieces: List[str] = []
+
+    def write(self, value: Value):
+        self.pieces.append(format_value(value))
+        if len(self.pieces) >= self.size:
+            self.flush()
+
+    def flush(self):
+        if self.pieces:
+            self.stream.write("\n".join(self.pieces) + "\n")
+            self.pieces = []
+
+
+class _Streams:
+    """Holder the compiled closures read cin/cout from, rebound on every run"""
+    input: InputStream = None
+    output: OutputBuffer = None
+
+
+# Closure factories per operator and operand shape: 'e' an expression closure, 's' a slot index
+# read from the slot list, 'c' a constant. Specialising the leaves removes a call per operand.
+_SHAPES = {
+    ('e', 'e'): "l() {op} r()", ('e', 's'): "l() {op} s[r]", ('e', 'c'): "l() {op} r",
+    ('s', 'e'): "s[l] {op} r()", ('s', 's'): "s[l] {op} s[r]", ('s', 'c'): "s[l] {op} r",
+    ('c', 'e'): "l {op} r()", ('c', 's'): "l {op} s[r]",
+}
+_FACTORIES = {
+    (op, shape): eval(f"lambda l, r, s: lambda: {template.format(op=op)}")
+    for op in ('+', '-', '*', '<<', '<', '<=', '==', '!=', '>=', '>')
+    for shape, template in _SHAPES.items()
+}
+
+_OPERATIONS = {
+    '+': operator.add, '-': operator.sub, '*': operator.mul, '<<': operator.lshift,
+    '<': operator.lt, '<=': operator.le, '==': operator.eq,
+    '!=': operator.ne, '>=': operator.ge, '>': operator.gt,
+}
+
+
+class CompiledProgram:
+    """A Minilang program compiled to nested Python closures over a flat list of variable slots"""
+
+    def __init__(self, program: Program):
+        self.variables = program.variables()
+        self.slot_of: Dict[str, int] = {}
+        self.types: Dict[str, str] = {}
+        for name, type_name in self.variables:
+            if name in self.slot_of:
+                raise Exception(f"Variable '{name}' declared more than once")
+            self.slot_of[name] = len(self.slot_of)
+            self.types[name] = type_name
+        self.initial = [0.0 if type_name == 'double' else 0 for _, type_name in self.variables]
+        self.slots: List[Value] = list(self.initial)
+        self.streams = _Streams()
+        self.body = self._block(program.body)
+
+    def run(self, stdin: Optional[TextIO] = None, stdout: Optional[TextIO] = None) -> Dict[str, Value]:
+        """Execute the program; returns the final variable values"""
+        self.slots[:] = self.initial
+        self.streams.input = InputStream(stdin if stdin is not None else sys.stdin)
+        self.streams.output = OutputBuffer(stdout if stdout is not None else sys.stdout)
+        try:
+            self.body()
+        finally:
+            self.streams.output.flush()
+        return {name: self.slots[slot] for name, slot in self.slot_of.items()}
+
+    # Compilation
+
+    def _slot(self, name: str, line: int) -> int:
+        slot = self.slot_of.get(name)
+        if slot is None:
+            raise Exception(f"Undeclared variable '{name}' at line {line}")
+        return slot
+
+    def type_of(self, expression: Expression) -> str:
+        return expression_type(expression, self.types)
+
+    def _expression(self, expression: Expression) -> Callable[[], Value]:
+        if isinstance(expression, (Number, Constant)):
+            value = self._constant(expression)
+            return lambda: value
+        if isinstance(expression, Variable):
+            slot = self._slot(expression.name, expression.line)
+            slots = self.slots
+            return lambda: slots[slot]
+
+        # Flatten the left spine of a chain such as a + b - c + d
+        chain = []
+        node = expression
+        while isinstance(node, BinaryOp) and node.op not in COMPARISON_OPS:
+            chain.append(node)
+            node = node.left
+        if len(chain) > MAX_NESTED_CHAIN:
+            return self._chain(node, chain[::-1])
+        return self._binary(expression)
+
+    def _binary(self, expression: BinaryOp) -> Callable[[], Value]:
+        op, line = expression.op, expression.line
+        if op == '/':
+            left = self._expression(expression.left)
+            right = self._expression(expression.right)
+            if self.type_of(expression) == 'int':
+                return lambda: int_divide(left(), right(), line)
+
+            def divide():
+                divisor = right()
+                if divisor == 0:
+                    _division_by_zero(line)
+                return left() / divisor
+            return divide
+
+        left_shape, left = self._operand(expression.left)
+        right_shape, right = self._operand(expression.right)
+        if left_shape == 'c' and right_shape == 'c':
+            right_shape, right = 'e', self._expression(expression.right)
+        return _FACTORIES[(op, (left_shape, right_shape))](left, right, self.slots)
+
+    @staticmethod
+    def _constant(expression: Union[Number, Constant]) -> Value:
+        return expression.value if isinstance(expression, Number) else BUILTIN_CONSTANTS[expression.name]
+
+    def _operand(self, expression: Expression):
+        """(shape, value) of an operand for _FACTORIES"""
+        if isinstance(expression, (Number, Constant)):
+            return 'c', self._constant(expression)
+        if isinstance(expression, Variable):
+            return 's', self._slot(expression.name, expression.line)
+        return 'e', self._expression(expression)
+
+    def _chain(self, first: Expression, chain: List[BinaryOp]) -> Callable[[], Value]:
+        start = self._expression(first)
+        prefix_type = self.type_of(first)
+        steps = []
+        for node in chain:
+            right = self._expression(node.right)
+            if self.type_of(node.right) == 'double':
+                prefix_type = 'double'
+            if node.op != '/':
+                steps.append((_OPERATIONS[node.op], right))
+            elif prefix_type == 'int':
+                steps.append((lambda a, b, line=node.line: int_divide(a, b, line), right))
+            else:
+                steps.append((lambda a, b, line=node.line: a / b if b != 0 else _division_by_zero(line), right))
+
+        def run():
+            value = start()
+            for operation, operand in steps:
+                value = operation(value, operand())
+            return value
+        return run
+
+    def _statement(self, statement: Statement) -> Callable[[], None]:
+        slots, streams = self.slots, self.streams
+        if isinstance(statement, Assign):
+            slot = self._slot(statement.name, statement.line)
+            value = self._expression(statement.value)
+            if self.types[statement.name] == 'int' and self.type_of(statement.value) == 'double':
+                def assign():
+                    slots[slot] = int(value())  # Truncates like a C conversion
+            elif self.types[statement.name] == 'double' and self.type_of(statement.value) == 'int':
+                def assign():
+                    slots[slot] = float(value())
+            else:
+                def assign():
+                    slots[slot] = value()
+            return assign
+
+        if isinstance(statement, Read):
+            slot = self._slot(statement.name, statement.line)
+            type_name, line = self.types[statement.name], statement.line
+
+            def read():
+                slots[slot] = streams.input.read(type_name, line)
+            return read
+
+        if isinstance(statement, Write):
+            value = self._expression(statement.value)
+
+            def write():
+                streams.output.write(value())
+            return write
+
+        condition = self._expression(statement.condition)
+        body = self._block(statement.body)
+        if isinstance(statement, If):
+            def branch():
+                if condition():
+                    body()
+            return branch
+
+        def loop():
+            while condition():
+                body()
+        return loop
+
+    def _block(self, statements: List[Statement]) -> Callable[[], None]:
+        compiled = [self._statement(statement) for statement in statements]
+        if not compiled:
+            return lambda: None
+        if len(compiled) == 1:
+            return compiled[0]
+
+        def block():
+            for statement in compiled:
+                statement()
+        return block
+
+
+def interpret(program: Program, stdin: TextIO, stdout: TextIO) -> Dict[str, Value]:
+    """Reference tree-walking interpreter with the same semantics as CompiledProgram, for comparison"""
+    types = dict(program.variables())
+    env: Dict[str, Value] = {name: 0.0 if t == 'double' else 0 for name, t in types.items()}
+    cin, cout = InputStream(stdin), OutputBuffer(stdout)
+
+    def evaluate(node: Expression) -> Value:
+        if isinstance(node, Number):
+            return node.value
+        if isinstance(node, Constant):
+            return BUILTIN_CONSTANTS[node.name]
+        if isinstance(node, Variable):
+            if node.name not in env:
+                raise Exception(f"Undeclared variable '{node.name}' at line {node.line}")
+            return env[node.name]
+        left, right = evaluate(node.left), evaluate(node.right)
+        if node.op == '/':
+            if isinstance(left, int) and isinstance(right, int):
+                return int_divide(left, right, node.line)
+            return left / right if right != 0 else _division_by_zero(node.line)
+        return _OPERATIONS[node.op](left, right)
+
+    def execute(statements: List[Statement]):
+        for statement in statements:
+            if isinstance(statement, Assign):
+                value = evaluate(statement.value)
+                env[statement.name] = float(value) if types[statement.name] == 'double' else int(value)
+            elif isinstance(statement, Read):
+                env[statement.name] = cin.read(types[statement.name], statement.line)
+            elif isinstance(statement, Write):
+                cout.write(evaluate(statement.value))
+            elif isinstance(statement, If):
+                if evaluate(statement.condition):
+                    execute(statement.body)
+            else:
+                while evaluate(statement.condition):
+                    execute(statement.body)
+
+    try:
+        execute(program.body)
+    finally:
+        cout.flush()
+    return env
+
+
+def compile_source(parser: MinilangParser, lines) -> CompiledProgram:
+    """Lex, parse and compile Minilang source lines"""
+    return CompiledProgram(build_ast(parser, MinilangLexer(parser.token_codes).lex(lines)))
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Run a Minilang program')
+    arg_parser.add_argument('source', help='Path to the Minilang source file')
+    arg_parser.add_argument('-g', '--grammar', default='minilang_grammar.txt',
+                            help='Grammar file (default: minilang_grammar.txt)')
+    arg_parser.add_argument('-i', '--input', default=None, help='Read cin from this file (default: stdin)')
+    arg_parser.add_argument('--time', action='store_true', help='Print the compile and run times to stderr')
+    args = arg_parser.parse_args()
+
+    parser = MinilangParser()
+    parser.read_grammar(args.grammar)
+    try:
+        start = time.perf_counter()
+        with open(args.source) as f:
+            program = compile_source(parser, f)
+        compiled = time.perf_counter()
+        if args.input:
+            with open(args.input) as stdin:
+                program.run(stdin)
+        else:
+            program.run()
+        finished = time.perf_counter()
+    except Exception as e:
+        print(e, file=sys.stderr)
+        return 1
+
+    if args.time:
+        print(f"Compile: {(compiled - start) * 1000:.1f} ms, run: {(finished - compiled) * 1000:.1f} ms",
+              file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,64 @@
+import re
+from typing import Dict, Iterable, Iterator, Tuple
+
+from minilang_parser import FIPEntry
+
+
+class MinilangLexer:
+    """Lazy lexer producing FIP entries one at a time instead of writing fip_output.txt"""
+
+    # Two-character operators must be tried before their one-character prefixes
+    TOKEN_PATTERN = re.compile(
+        r"\s*(?:(<<|>>|<=|>=|==|!=)"
+        r"|([+\-*/=(){},;\[\]<>])"
+        r"|([A-Za-z_][A-Za-z0-9_]*)"
+        r"|(\d+(?:\.\d+)?)"
+        r"|(\S))"
+    )
+
+    def __init__(self, token_codes: Dict[str, int]):
+        self.token_codes = token_codes
+        self.symbol_table: Dict[str, int] = {}
+
+    def _symbol_position(self, symbol: str) -> int:
+        """Return the symbol table position of an identifier or constant, inserting it if new"""
+        if symbol not in self.symbol_table:
+            self.symbol_table[symbol] = len(self.symbol_table) + 1
+        return self.symbol_table[symbol]
+
+    def tokenize_line(self, line: str, line_number: int) -> Iterator[Tuple[str, int]]:
+        """Yield (token, column) pairs for a single source line"""
+        stripped = line.strip()
+        if not stripped or stripped.startswith('#'):
+            return
+
+        position = 0
+        while position < len(line):
+            match = self.TOKEN_PATTERN.match(line, position)
+            if match is None or match.lastindex is None:
+                return  # only trailing whitespace left
+            token = match.group(match.lastindex)
+            if match.lastindex == 5:
+                raise Exception(f"Lexical error at line {line_number}, column {match.start(5) + 1}: "
+                                f"Invalid token '{token}'")
+            yield token, match.start(match.lastindex) + 1
+            position = match.end()
+
+    def lex(self, lines: Iterable[str]) -> Iterator[FIPEntry]:
+        """Yield FIP entries for the given source lines as soon as each token is recognised"""
+        for line_number, line in enumerate(lines, 1):
+            for token, _ in self.tokenize_line(line, line_number):
+                if token in self.token_codes:
+                    yield FIPEntry(token, self.token_codes[token], -1, line_number)
+                elif token[0].isdigit():
+                    yield FIPEntry(token, 1, self._symbol_position(token), line_number)  # 1 for CONST
+                else:
+                    yield FIPEntry(token, 0, self._symbol_position(token), line_number)  # 0 for ID
+
+    def lex_file(self, filename: str) -> Iterator[FIPEntry]:
+        """Lazily lex a source file, reading it line by line"""
+        try:
+            with open(filename, 'r') as f:
+                yield from self.lex(f)
+        except FileNotFoundError:
+            raise Exception(f"Source file {filename} not found")
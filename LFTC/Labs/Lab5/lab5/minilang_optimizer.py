@@ -0,0 +1,261 @@
+import argparse
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+
+from minilang_ast import (Assign, BinaryOp, BUILTIN_CONSTANTS, COMPARISON_OPS, Constant, Expression, If, Number,
+                          Program, Read, Statement, Variable, While, Write, build_ast, expression_type)
+from minilang_executor import int_divide
+from minilang_lexer import MinilangLexer
+from minilang_parser import MinilangParser
+
+_FOLD = {
+    '+': lambda a, b: a + b,
+    '-': lambda a, b: a - b,
+    '*': lambda a, b: a * b,
+    '<<': lambda a, b: a << b,
+    '<': lambda a, b: a < b,
+    '<=': lambda a, b: a <= b,
+    '==': lambda a, b: a == b,
+    '!=': lambda a, b: a != b,
+    '>=': lambda a, b: a >= b,
+    '>': lambda a, b: a > b,
+}
+
+
+@dataclass
+class OptimizationReport:
+    """Static operation counts before and after optimize, and what each pass changed"""
+    before: Dict[str, int] = field(default_factory=dict)
+    after: Dict[str, int] = field(default_factory=dict)
+    folded: int = 0
+    strength_reduced: int = 0
+    propagated: int = 0
+    removed_statements: int = 0
+
+    def __str__(self):
+        lines = [f"{'Operation':12} {'Before':>8} {'After':>8}"]
+        for op in sorted(set(self.before) | set(self.after)):
+            lines.append(f"{op:12} {self.before.get(op, 0):8} {self.after.get(op, 0):8}")
+        lines.append(f"Folded expressions:     {self.folded}")
+        lines.append(f"Shifts for multiplies:  {self.strength_reduced}")
+        lines.append(f"Propagated uses:        {self.propagated}")
+        lines.append(f"Removed statements:     {self.removed_statements}")
+        return "\n".join(lines)
+
+
+def count_operations(program: Program) -> Dict[str, int]:
+    """Operators in the program text, plus statements by kind"""
+    counts = Counter()
+    expressions = []
+    statements = list(program.body)
+    while statements:
+        statement = statements.pop()
+        counts[type(statement).__name__.lower()] += 1
+        if isinstance(statement, (If, While)):
+            expressions.append(statement.condition)
+            statements.extend(statement.body)
+        elif isinstance(statement, Read):
+            continue
+        else:
+            expressions.append(statement.value)
+    while expressions:
+        node = expressions.pop()
+        if isinstance(node, BinaryOp):
+            counts[node.op] += 1
+            expressions.extend((node.left, node.right))
+    return dict(counts)
+
+
+def _power_of_two(node: Expression) -> Optional[int]:
+    if isinstance(node, Number) and isinstance(node.value, int) and node.value > 1 \
+            and node.value & (node.value - 1) == 0:
+        return node.value.bit_length() - 1
+    return None
+
+
+class Optimizer:
+    """Constant folding (with M_PI), copy and constant propagation within straight-line code,
+    removal of if/while statements whose condition is constant false, and shifts for
+    multiplications of ints by powers of two. The result is a new Program with the same behaviour.
+    """
+
+    def __init__(self, program: Program):
+        self.program = program
+        self.types = dict(program.variables())
+        self.report = OptimizationReport()
+
+    def optimize(self) -> Tuple[Program, OptimizationReport]:
+        self.report.before = count_operations(self.program)
+        body, _ = self._block(self.program.body, {})
+        optimized = Program(list(self.program.declarations), body)
+        self.report.after = count_operations(optimized)
+        return optimized, self.report
+
+    # Expressions
+
+    def _expression(self, expression: Expression, known: Dict[str, Expression]) -> Expression:
+        """Rewrite an expression bottom-up without recursion, since operator chains can be long"""
+        stack = [(expression, False)]
+        results = []
+        while stack:
+            node, visited = stack.pop()
+            if not isinstance(node, BinaryOp):
+                results.append(self._leaf(node, known))
+            elif visited:
+                right = results.pop()
+                left = results.pop()
+                results.append(self._operation(BinaryOp(node.op, left, right, node.line)))
+            else:
+                stack.extend(((node, True), (node.right, False), (node.left, False)))
+        return results[0]
+
+    def _leaf(self, node: Expression, known: Dict[str, Expression]) -> Expression:
+        if isinstance(node, Constant):
+            self.report.folded += 1
+            return Number(BUILTIN_CONSTANTS[node.name], node.line)
+        if isinstance(node, Variable) and node.name in known:
+            self.report.propagated += 1
+            replacement = known[node.name]
+            return Number(replacement.value, node.line) if isinstance(replacement, Number) \
+                else Variable(replacement.name, node.line)
+        return node
+
+    def _operation(self, node: BinaryOp) -> Expression:
+        left, right = node.left, node.right
+        if isinstance(left, Number) and isinstance(right, Number):
+            if node.op == '/':
+                if right.value == 0:
+                    return node  # Left for the runtime error
+                both_int = isinstance(left.value, int) and isinstance(right.value, int)
+                value = int_divide(left.value, right.value) if both_int else left.value / right.value
+            else:
+                value = _FOLD[node.op](left.value, right.value)
+            self.report.folded += 1
+            return Number(int(value) if node.op in COMPARISON_OPS else value, node.line)
+
+        if node.op == '*':
+            # x * 2^k or 2^k * x, for ints only: shifting a double is meaningless
+            for value, power in ((left, _power_of_two(right)), (right, _power_of_two(left))):
+                if power is not None and expression_type(value, self.types) == 'int':
+                    self.report.strength_reduced += 1
+                    return BinaryOp('<<', value, Number(power, node.line), node.line)
+        return node
+
+    @staticmethod
+    def _constant_condition(condition: Expression) -> Optional[bool]:
+        if isinstance(condition, Number):
+            return bool(condition.value)
+        return None
+
+    # Statements
+
+    @staticmethod
+    def _kill(known: Dict[str, Expression], name: str):
+        """Forget what is known about name, and every copy of it"""
+        known.pop(name, None)
+        for copy in [k for k, v in known.items() if isinstance(v, Variable) and v.name == name]:
+            del known[copy]
+
+    @staticmethod
+    def _assigned(statements: List[Statement]) -> Set[str]:
+        names = set()
+        stack = list(statements)
+        while stack:
+            statement = stack.pop()
+            if isinstance(statement, (Assign, Read)):
+                names.add(statement.name)
+            elif isinstance(statement, (If, While)):
+                stack.extend(statement.body)
+        return names
+
+    def _block(self, statements: List[Statement],
+               known: Dict[str, Expression]) -> Tuple[List[Statement], Dict[str, Expression]]:
+        """Optimize a statement list given what is known on entry; returns it and what is known on exit"""
+        known = dict(known)
+        result = []
+        for statement in statements:
+            if isinstance(statement, Assign):
+                value = self._expression(statement.value, known)
+                self._kill(known, statement.name)
+                target_type = self.types.get(statement.name)
+                if isinstance(value, Number):
+                    known[statement.name] = Number(float(value.value) if target_type == 'double'
+                                                   else int(value.value))
+                elif isinstance(value, Variable) and value.name != statement.name \
+                        and self.types.get(value.name) == target_type:
+                    known[statement.name] = value
+                result.append(Assign(statement.name, value, statement.line))
+
+            elif isinstance(statement, Read):
+                self._kill(known, statement.name)
+                result.append(statement)
+
+            elif isinstance(statement, Write):
+                result.append(Write(self._expression(statement.value, known), statement.line))
+
+            elif isinstance(statement, If):
+                condition = self._expression(statement.condition, known)
+                constant = self._constant_condition(condition)
+                if constant is False:
+                    self.report.removed_statements += 1 + self._size(statement.body)
+                    continue
+                body, body_known = self._block(statement.body, known)
+                if constant is True:
+                    # Always taken: the body becomes straight-line code of this block
+                    self.report.removed_statements += 1
+                    result.extend(body)
+                    known = body_known
+                    continue
+                for name in self._assigned(statement.body):
+                    self._kill(known, name)
+                result.append(If(condition, body, statement.line))
+
+            else:
+                # Facts about variables the loop changes do not hold at its condition or body
+                for name in self._assigned(statement.body):
+                    self._kill(known, name)
+                condition = self._expression(statement.condition, known)
+                if self._constant_condition(condition) is False:
+                    self.report.removed_statements += 1 + self._size(statement.body)
+                    continue
+                if isinstance(condition, Number):
+                    condition = statement.condition  # Keep an infinite loop a comparison
+                body, _ = self._block(statement.body, known)
+                result.append(While(condition, body, statement.line))
+        return result, known
+
+    @staticmethod
+    def _size(statements: List[Statement]) -> int:
+        size = 0
+        stack = list(statements)
+        while stack:
+            statement = stack.pop()
+            size += 1
+            if isinstance(statement, (If, While)):
+                stack.extend(statement.body)
+        return size
+
+
+def optimize(program: Program) -> Tuple[Program, OptimizationReport]:
+    """Optimize a program, returning the new program and the report"""
+    return Optimizer(program).optimize()
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Optimize a Minilang program and report the operation counts')
+    arg_parser.add_argument('source', help='Path to the Minilang source file')
+    arg_parser.add_argument('-g', '--grammar', default='minilang_grammar.txt',
+                            help='Grammar file (default: minilang_grammar.txt)')
+    args = arg_parser.parse_args()
+
+    parser = MinilangParser()
+    parser.read_grammar(args.grammar)
+    with open(args.source) as f:
+        program = build_ast(parser, MinilangLexer(parser.token_codes).lex(f))
+    _, report = optimize(program)
+    print(report)
+
+
+if __name__ == "__main__":
+    main()
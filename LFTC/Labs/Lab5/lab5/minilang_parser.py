@@ -1,6 +1,16 @@
-from typing import Dict, Set, List, Tuple, Optional
-from collections import defaultdict
+from typing import Deque, Dict, Iterable, Iterator, Set, List, Tuple, Optional
+from collections import defaultdict, deque
 from dataclasses import dataclass, field
+from itertools import islice
+
+from grammar_analysis import PruneReport, prune_grammar
+from lazy_table import LazyParsingTable
+from semantic_analysis import ScopedSymbolTable, SemanticAnalyzer
+
+# Tokens shown on each side of the failing position in syntax errors
+ERROR_CONTEXT_SIZE = 3
+# Tokens at which panic-mode recovery always stops skipping input
+SYNC_TOKENS = frozenset({';', '}'})
 
 
 @dataclass
@@ -9,14 +19,26 @@ class FIPEntry:
     token: str
     code: int
     symbol_table_pos: int
+    line: int = 0
+
+
+@dataclass
+class SyntaxDiagnostic:
+    """A syntax error found while parsing with error recovery"""
+    position: int
+    line: int
+    token: str
+    message: str
+    expected: List[str] = field(default_factory=list)
 
 
 @dataclass
 class ParserContext:
     """Tracks parsing context including scope and symbols"""
     current_scope: str = "global"
-    symbol_table: Dict[str, Dict] = field(default_factory=dict)
+    symbol_table: ScopedSymbolTable = field(default_factory=ScopedSymbolTable)
     errors: List[str] = field(default_factory=list)
+    warnings: List[str] = field(default_factory=list)
 
 
 class MinilangParser:
@@ -26,6 +48,8 @@ class MinilangParser:
         self.non_terminals: Set[str] = set()
         self.start_symbol: str = None
         self.parsing_table: Dict[Tuple[str, str], List[str]] = {}
+        self.follow_sets: Dict[str, Set[str]] = {}  # Filled on first use by error recovery
+        self.prune_report: Optional[PruneReport] = None
         self.context = ParserContext()
         self.stack = []  # Added to track parsing stack
 
@@ -41,23 +65,29 @@ class MinilangParser:
             ',': 32, ';': 33, ' ': 34
         }
 
-    def format_error_context(self, position: int, fip_entries: List[FIPEntry], context_size: int = 3) -> str:
-        """Format error context showing nearby tokens"""
+    def format_error_context(self, position: int, fip_entries: List[FIPEntry], context_size: int = 3,
+                             offset: int = 0) -> str:
+        """Format error context showing nearby tokens
+
+        fip_entries may be a window of the input whose first entry sits at index offset.
+        """
         context_lines = []
-        start = max(0, position - context_size)
-        end = min(len(fip_entries), position + context_size + 1)
+        local_position = position - offset
+        start = max(0, local_position - context_size)
+        end = min(len(fip_entries), local_position + context_size + 1)
 
         for i in range(start, end):
-            prefix = "-> " if i == position else "   "
+            prefix = "-> " if i == local_position else "   "
             entry = fip_entries[i]
-            context_lines.append(f"{prefix}{entry.token:15} (line position {i})")
+            context_lines.append(f"{prefix}{entry.token:15} (line position {offset + i})")
 
         return "\n".join(context_lines)
 
-    def handle_parsing_error(self, position: int, fip_entries: List[FIPEntry], message: str) -> str:
+    def handle_parsing_error(self, position: int, fip_entries: List[FIPEntry], message: str,
+                             offset: int = 0) -> str:
         """Create detailed error message with context"""
         error_msg = f"\nSyntax error at position {position}:\n"
-        error_msg += self.format_error_context(position, fip_entries)
+        error_msg += self.format_error_context(position, fip_entries, offset=offset)
         error_msg += f"\n{message}"
 
         # Add stack trace if available
@@ -66,8 +96,14 @@ class MinilangParser:
 
         return error_msg
 
-    def read_grammar(self, filename: str):
-        """Read grammar rules from file"""
+    def read_grammar(self, filename: str, lazy: bool = False, prune: bool = False):
+        """Read grammar rules from file
+
+        With prune=True non-productive and unreachable symbols are removed before the table is
+        built, and what was removed is kept in self.prune_report. With lazy=True only FIRST/FOLLOW
+        are computed here; table rows are built on first use (see LazyParsingTable) and the table
+        is not validated.
+        """
         try:
             with open(filename, 'r') as f:
                 for line in f:
@@ -87,8 +123,18 @@ class MinilangParser:
                     if self.start_symbol is None:
                         self.start_symbol = lhs
 
+            if prune:
+                self.prune_report = prune_grammar(self)
+
+            if lazy:
+                self.parsing_table = LazyParsingTable(self)
+                self.follow_sets = self.parsing_table.follow_sets
+                return
+
             # After reading grammar, build parsing table
             self.parsing_table = self.build_parsing_table()
+            # Recomputed from the new grammar on the next error recovery
+            self.follow_sets = {}
             # Validate the parsing table
             self.validate_parsing_table()
 
@@ -127,76 +173,162 @@ class MinilangParser:
         except Exception as e:
             raise Exception(f"Error reading FIP file: {str(e)}")
 
-    def parse_fip(self, fip_entries: List[FIPEntry]) -> List[List[str]]:
-        """Parse input from FIP entries with better error handling"""
+    def parse_fip(self, fip_entries: Iterable[FIPEntry], collect_derivation: bool = True,
+                  verbose: bool = True, semantic: bool = False) -> List[List[str]]:
+        """Parse input from FIP entries with better error handling
+
+        fip_entries may be any iterable, e.g. the generator returned by MinilangLexer.lex_file,
+        so lexing and parsing overlap and an error is raised as soon as it is reached.
+        With collect_derivation=False the input is only validated and an empty list is returned.
+        With semantic=True declarations and variable uses are also checked in the same pass (see
+        SemanticAnalyzer); the diagnostics are left in self.context.errors and self.context.warnings,
+        for the caller to report.
+        The parse itself is done by parse_entries; this keeps the stack on the instance and adds
+        the surrounding tokens to syntax errors.
+        """
         self.stack = ['$', self.start_symbol]  # Initialize stack
-        position = 0
-        derivation = []
-
-        print("\nParsing Table Contents:")
-        for (nt, terminal), production in self.parsing_table.items():
-            print(f"{nt}, {terminal} -> {' '.join(production)}")
+        self.context = ParserContext()
+        analyzer = SemanticAnalyzer(self.context) if semantic else None
+        # Only the most recent entries are kept, for error context
+        window = deque(maxlen=ERROR_CONTEXT_SIZE + 1)
+
+        def buffered() -> Iterator[FIPEntry]:
+            for entry in fip_entries:
+                window.append(entry)
+                yield entry
+
+        entries = buffered()
+
+        if verbose:
+            if isinstance(self.parsing_table, LazyParsingTable):
+                # Listing it would build every row
+                print(f"\nParsing table rows are built on demand ({len(self.parsing_table.rows)} built so far)")
+            else:
+                print("\nParsing Table Contents:")
+                for (nt, terminal), production in self.parsing_table.items():
+                    print(f"{nt}, {terminal} -> {' '.join(production)}")
 
         try:
-            while self.stack and position < len(fip_entries):
-                top = self.stack[-1]
-                current_entry = fip_entries[position]
-                current_token = current_entry.token
-
-                print(f"\nStack: {self.stack}")
-                print(f"Current token: {current_token} at position {position}")
+            return parse_entries(self.parsing_table, self.non_terminals, self.start_symbol, entries,
+                                 collect_derivation=collect_derivation, stack=self.stack, analyzer=analyzer,
+                                 verbose=verbose)
+        except ParseError as e:
+            raise Exception(self._stream_error(e.position, e.entry, window, entries, e.message))
+
+    def _stream_error(self, position: int, current_entry: Optional[FIPEntry], window: Deque[FIPEntry],
+                      entries: Iterator[FIPEntry], message: str) -> str:
+        """Build an error message from the buffered window plus a few tokens read ahead"""
+        context = list(window)
+        # The window ends at the current entry, or at the last consumed one once input ran out
+        offset = position + (current_entry is not None) - len(context)
+        context.extend(islice(entries, ERROR_CONTEXT_SIZE))
+        return self.handle_parsing_error(position, context, message, offset=offset)
+
+    def parse_with_recovery(self, fip_entries: Iterable[FIPEntry], max_errors: int = 50,
+                            sync_tokens: Set[str] = SYNC_TOKENS,
+                            semantic: bool = False) -> Tuple[List[List[str]], List[SyntaxDiagnostic]]:
+        """Parse in panic mode, collecting syntax errors instead of stopping at the first one
+
+        When non-terminal A cannot be expanded, input is skipped until a token A can start with,
+        a token in FOLLOW(A) or one of sync_tokens; A is then expanded or popped. A missing terminal
+        is assumed to be present. Errors that follow another error before any token is matched are
+        not reported, and parsing stops once max_errors diagnostics have been collected.
+        With semantic=True declarations and variable uses are checked as in parse_fip; skipped
+        tokens are not seen by the checks, and assumed punctuation is treated as matched.
+        """
+        if not self.follow_sets:
+            self.follow_sets = self.compute_follow_sets(self.compute_first_sets())
 
-                # Special handling for identifiers and numbers
-                if top == 'id' and current_entry.code == 0:
+        self.context = ParserContext()
+        analyzer = SemanticAnalyzer(self.context) if semantic else None
+        self.stack = ['$', self.start_symbol]
+        entries = iter(fip_entries)
+        entry = next(entries, None)
+        position = 0
+        derivation = []
+        diagnostics = []
+        recovering = False  # No token matched since the last reported error
+        last_error_position = -1
+
+        def report(message: str, expected: List[str]):
+            nonlocal recovering, last_error_position
+            if not recovering:
+                diagnostics.append(SyntaxDiagnostic(position, entry.line if entry else -1,
+                                                    entry.token if entry else '$', message, expected))
+            recovering = True
+            last_error_position = position
+
+        while self.stack and len(diagnostics) < max_errors:
+            top = self.stack[-1]
+            token = '$' if entry is None else lookahead_terminal(entry)
+
+            if entry is not None and (top == entry.token or (top == 'id' and entry.code == 0)
+                                      or (top == 'number' and entry.code == 1)):
+                if analyzer is not None:
+                    analyzer.match(top, entry)
+                self.stack.pop()
+                position += 1
+                entry = next(entries, None)
+                recovering = False
+                continue
+
+            if top == '$':
+                if entry is None:
                     self.stack.pop()
-                    position += 1
-                    continue
-                elif top == 'number' and current_entry.code == 1:
+                else:
+                    report("Unexpected token after end of program", ['$'])
+                break
+
+            if top in self.non_terminals:
+                production = self.parsing_table.get((top, token))
+                if production is not None:
+                    if analyzer is not None:
+                        analyzer.expand(top)
                     self.stack.pop()
-                    position += 1
+                    if production != ['epsilon']:
+                        self.stack.extend(reversed(production))
+                    derivation.append(production)
                     continue
 
-                # Handle terminals
-                if top == current_token:
-                    self.stack.pop()
-                    position += 1
-                elif top in self.non_terminals:
-                    # Handle non-terminals
-                    lookup_token = current_token
-                    if current_entry.code == 0:
-                        lookup_token = 'id'
-                    elif current_entry.code == 1 or current_token.replace('.', '', 1).isdigit():
-                        lookup_token = 'number'
+                expected = self.expected_terminals(top)
+                stalled = position == last_error_position
+                report(f"No production for non-terminal '{top}' with token '{token}'", expected)
 
-                    if (top, lookup_token) not in self.parsing_table:
-                        error_msg = f"No production for non-terminal '{top}' with token '{lookup_token}'"
-                        raise Exception(self.handle_parsing_error(position, fip_entries, error_msg))
+                if stalled and entry is not None:
+                    # Popping alone made no progress at this position, drop the offending token
+                    position += 1
+                    entry = next(entries, None)
+                    continue
 
-                    production = self.parsing_table[(top, lookup_token)]
-                    print(f"Using production: {top} -> {' '.join(production)}")
+                synchronizing = self.follow_sets[top] | sync_tokens
+                while entry is not None and (top, token) not in self.parsing_table and token not in synchronizing:
+                    position += 1
+                    entry = next(entries, None)
+                    token = '$' if entry is None else lookahead_terminal(entry)
+                last_error_position = position
 
+                if (top, token) not in self.parsing_table:
                     self.stack.pop()
-                    if production != ['epsilon']:
-                        for symbol in reversed(production):
-                            self.stack.append(symbol)
-                    derivation.append(production)
+            else:
+                stalled = position == last_error_position
+                report(f"Expected '{top}', got '{token}'", [top])
+                if stalled and entry is not None:
+                    position += 1
+                    entry = next(entries, None)
                 else:
-                    error_msg = f"Expected '{top}', got '{current_token}'"
-                    raise Exception(self.handle_parsing_error(position, fip_entries, error_msg))
+                    if analyzer is not None and top not in ('id', 'number'):
+                        # Keep scopes balanced when a brace is missing
+                        analyzer.match(top, FIPEntry(top, self.token_codes.get(top, -1), -1,
+                                                     entry.line if entry else -1))
+                    self.stack.pop()
 
-            # Check for completion
-            if self.stack != ['$'] or position < len(fip_entries):
-                remaining = [e.token for e in fip_entries[position:]]
-                raise Exception(f"Incomplete parse. Stack: {self.stack}, Remaining tokens: {remaining}")
+        return derivation, diagnostics
 
-            return derivation
-
-        except Exception as e:
-            # Add more context to the error
-            error_msg = str(e)
-            if "Syntax error" not in error_msg:
-                error_msg = self.handle_parsing_error(position, fip_entries, error_msg)
-            raise Exception(error_msg)
+    def expected_terminals(self, non_terminal: str) -> List[str]:
+        """Terminals that non_terminal has a production for; of a lazy table only that row is built"""
+        if isinstance(self.parsing_table, LazyParsingTable):
+            return sorted(self.parsing_table.row(non_terminal))
+        return sorted(terminal for (nt, terminal) in self.parsing_table if nt == non_terminal)
 
     def compute_first_sets(self) -> Dict[str, Set[str]]:
         """Compute FIRST sets for all symbols"""
@@ -349,6 +481,97 @@ class MinilangParser:
         return issues
 
 
+def lookahead_terminal(entry: FIPEntry) -> str:
+    """Map a FIP entry to the grammar terminal used for parsing table lookups"""
+    if entry.code == 0:
+        return 'id'
+    if entry.code == 1 or entry.token.replace('.', '', 1).isdigit():
+        return 'number'
+    return entry.token
+
+
+class ParseError(Exception):
+    """A syntax error found by parse_entries, at input position position (entry is None at end of input)"""
+
+    def __init__(self, position: int, entry: Optional[FIPEntry], message: str):
+        super().__init__(f"Syntax error at position {position}: {message}")
+        self.position = position
+        self.entry = entry
+        self.message = message
+
+    def __reduce__(self):
+        # Worker processes send errors back pickled, which by default only keeps the formatted message
+        return ParseError, (self.position, self.entry, self.message)
+
+
+def parse_entries(parsing_table: Dict[Tuple[str, str], List[str]], non_terminals: Set[str], start_symbol: str,
+                  fip_entries: Iterable[FIPEntry], collect_derivation: bool = True,
+                  end_token: str = '$', stack: Optional[List[str]] = None,
+                  analyzer: Optional[SemanticAnalyzer] = None, verbose: bool = False) -> List[List[str]]:
+    """Re-entrant LL(1) parse of fip_entries starting from start_symbol
+
+    Unlike MinilangParser.parse_fip all parsing state is local to the call, so one shared
+    (read-only) parsing table can serve many concurrent parses. Once the input is exhausted
+    end_token is used as the lookahead; it is '$' for whole programs and the token that
+    follows the fragment when parsing a fragment from an inner non-terminal. A stack list
+    passed in is used (and left as it was at an error) instead of a fresh one; analyzer, if
+    given, is told about every expansion and match. Syntax errors raise ParseError.
+    """
+    if stack is None:
+        stack = []
+    stack[:] = [end_token, start_symbol]
+    entries = iter(fip_entries)
+    entry = next(entries, None)
+    position = 0
+    derivation = []
+
+    while stack:
+        top = stack[-1]
+        token = end_token if entry is None else entry.token
+
+        if verbose:
+            print(f"\nStack: {stack}")
+            print(f"Current token: {token} at position {position}")
+
+        if len(stack) == 1:
+            # Only the end marker is left; it matches the end of the input, never a real entry
+            if entry is not None:
+                raise ParseError(position, entry, f"Unexpected token '{entry.token}' after end of input")
+            stack.pop()
+            continue
+        elif entry is not None and ((top == 'id' and entry.code == 0) or (top == 'number' and entry.code == 1)):
+            if analyzer is not None:
+                analyzer.match(top, entry)
+            stack.pop()
+        elif entry is not None and top == token:
+            if analyzer is not None:
+                analyzer.match(top, entry)
+            stack.pop()
+        elif top in non_terminals:
+            lookup_token = end_token if entry is None else lookahead_terminal(entry)
+            production = parsing_table.get((top, lookup_token))
+            if production is None:
+                raise ParseError(position, entry, f"No production for non-terminal '{top}' with token '{lookup_token}'")
+            if verbose:
+                print(f"Using production: {top} -> {' '.join(production)}")
+            if analyzer is not None:
+                analyzer.expand(top)
+            stack.pop()
+            if production != ['epsilon']:
+                stack.extend(reversed(production))
+            if collect_derivation:
+                derivation.append(production)
+            continue
+        else:
+            raise ParseError(position, entry, f"Expected '{top}', got '{token}'")
+
+        # A terminal was matched against a real entry
+        position += 1
+        entry = next(entries, None)
+
+    return derivation
+
+
 def main():
     # Create parser instance
     parser = MinilangParser()
@@ -372,7 +595,7 @@ def main():
 
         # Parse
         print("\nParsing program...")
-        derivation = parser.parse_fip(fip_entries)
+        derivation = parser.parse_fip(fip_entries, semantic=True)
 
         print("\nParsing successful!")
         print("\nDerivation steps:")
@@ -381,7 +604,14 @@ def main():
 
     except Exception as e:
         print(f"Error: {str(e)}")
+        return 1
+
+    for error in parser.context.errors:
+        print(f"Error: {error}")
+    for warning in parser.context.warnings:
+        print(f"Warning: {warning}")
+    return 1 if parser.context.errors else 0
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    exit(main())
\ No newline at end of file
@@ -0,0 +1,96 @@
+import argparse
+from typing import List, Optional, Tuple
+
+from minilang_lexer import MinilangLexer
+from minilang_parser import MinilangParser, ParserContext, SyntaxDiagnostic
+
+
+def parse_source(filename: str, parser: Optional[MinilangParser] = None,
+                 grammar_file: str = "minilang_grammar.txt", collect_derivation: bool = True,
+                 verbose: bool = False, semantic: bool = False) -> List[List[str]]:
+    """Lex and parse a Minilang source file in one pass, without writing or reading fip_output.txt
+
+    The lexer is a generator feeding parse_fip directly, so a syntax error near the top of the
+    file is raised before the rest of the file is read. With semantic=True declarations and
+    variable uses are checked too, and the diagnostics are left in parser.context.
+    """
+    if parser is None:
+        parser = MinilangParser()
+        parser.read_grammar(grammar_file)
+
+    lexer = MinilangLexer(parser.token_codes)
+    return parser.parse_fip(lexer.lex_file(filename), collect_derivation=collect_derivation, verbose=verbose,
+                            semantic=semantic)
+
+
+def lint_source(filename: str, parser: Optional[MinilangParser] = None,
+                grammar_file: str = "minilang_grammar.txt",
+                max_errors: int = 50) -> Tuple[List[SyntaxDiagnostic], ParserContext]:
+    """Report every syntax error in a Minilang source file in a single pass, up to max_errors
+
+    Declarations and variable uses are checked in the same pass; their errors and warnings are
+    in the returned context.
+    """
+    if parser is None:
+        parser = MinilangParser()
+        parser.read_grammar(grammar_file)
+
+    lexer = MinilangLexer(parser.token_codes)
+    _, diagnostics = parser.parse_with_recovery(lexer.lex_file(filename), max_errors=max_errors, semantic=True)
+    return diagnostics, parser.context
+
+
+def report_semantics(source: str, context: ParserContext):
+    """Print the semantic errors and warnings of a parse; their messages name the line"""
+    for error in context.errors:
+        print(f"{source}: error: {error}")
+    for warning in context.warnings:
+        print(f"{source}: warning: {warning}")
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Lex and parse a Minilang program in a single pass')
+    arg_parser.add_argument('source', help='Path to the Minilang source file')
+    arg_parser.add_argument('-g', '--grammar', default='minilang_grammar.txt',
+                            help='Grammar file (default: minilang_grammar.txt)')
+    arg_parser.add_argument('--validate-only', action='store_true',
+                            help='Only check the program, do not collect the derivation')
+    arg_parser.add_argument('--all-errors', action='store_true',
+                            help='Recover from syntax errors and report all of them')
+    arg_parser.add_argument('--max-errors', type=int, default=50,
+                            help='Stop after this many errors with --all-errors (default: 50)')
+    args = arg_parser.parse_args()
+
+    if args.all_errors:
+        try:
+            diagnostics, context = lint_source(args.source, grammar_file=args.grammar, max_errors=args.max_errors)
+        except Exception as e:
+            print(f"Error: {str(e)}")
+            return 1
+        for diagnostic in diagnostics:
+            print(f"{args.source}:{diagnostic.line}: {diagnostic.message} "
+                  f"(expected one of: {', '.join(diagnostic.expected)})")
+        report_semantics(args.source, context)
+        print(f"{len(diagnostics)} syntax error(s), {len(context.errors)} semantic error(s), "
+              f"{len(context.warnings)} warning(s) found")
+        return 1 if diagnostics or context.errors else 0
+
+    parser = MinilangParser()
+    try:
+        parser.read_grammar(args.grammar)
+        derivation = parse_source(args.source, parser, collect_derivation=not args.validate_only, semantic=True)
+        print("Parsing successful!")
+        if not args.validate_only:
+            print("\nDerivation steps:")
+            for i, step in enumerate(derivation, 1):
+                print(f"{i:3d}. {' '.join(step)}")
+    except Exception as e:
+        print(f"Error: {str(e)}")
+        return 1
+
+    report_semantics(args.source, parser.context)
+    return 1 if parser.context.errors else 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,220 @@
+import argparse
+import gc
+import multiprocessing
+import os
+import time
+from array import array
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from minilang_lexer import MinilangLexer
+from minilang_parser import FIPEntry, MinilangParser, lookahead_terminal, parse_entries
+
+# Below this many tokens the pool start-up costs more than it saves
+MIN_PARALLEL_TOKENS = 20000
+
+# State shared with the workers, inherited copy-on-write with fork or sent once through the initializer
+_SHARED_PARSER: Optional[MinilangParser] = None
+_SHARED_ENTRIES: Sequence[FIPEntry] = ()
+_PRODUCTION_IDS: Dict[int, int] = {}
+
+# A statement to parse: (first entry, end of the entry range, token that follows it)
+Segment = Tuple[int, int, str]
+
+
+def _production_list(parser: MinilangParser) -> List[List[str]]:
+    """Every production object the parsing table can hand out, in a fixed order"""
+    seen = {}
+    for production in parser.parsing_table.values():
+        seen.setdefault(id(production), production)
+    return list(seen.values())
+
+
+def _init_worker(parser: MinilangParser, fip_entries: Sequence[FIPEntry]):
+    global _SHARED_PARSER, _SHARED_ENTRIES, _PRODUCTION_IDS
+    _SHARED_PARSER = parser
+    _SHARED_ENTRIES = fip_entries
+    _PRODUCTION_IDS = {id(production): i for i, production in enumerate(_production_list(parser))}
+
+
+def _parse_segments(segments: List[Segment]) -> array:
+    """Parse a batch of statements from Instruction, returning the production ids of their derivations"""
+    parser = _SHARED_PARSER
+    ids = array('I')
+    for start, end, end_token in segments:
+        derivation = parse_entries(parser.parsing_table, parser.non_terminals, 'Instruction',
+                                   _SHARED_ENTRIES[start:end], end_token=end_token)
+        ids.extend(_PRODUCTION_IDS[id(production)] for production in derivation)
+        ids.append(len(_PRODUCTION_IDS))  # Marks the end of a statement
+    return ids
+
+
+def split_program(parser: MinilangParser,
+                  fip_entries: Sequence[FIPEntry]) -> Optional[Tuple[int, int, List[Segment]]]:
+    """Pre-scan the FIP for top-level statement boundaries by tracking brace depth
+
+    Returns (start of the declarations, start of the instructions, instruction segments),
+    or None if the program does not have the shape needed for a segmented parse.
+    """
+    table = parser.parsing_table
+    if len(fip_entries) < 2 or fip_entries[-1].token != '}':
+        return None
+
+    # Everything in Program before DeclarationsOpt has to match token for token
+    program = table.get((parser.start_symbol, lookahead_terminal(fip_entries[0])))
+    if program is None or 'DeclarationsOpt' not in program:
+        return None
+    declarations_start = program.index('DeclarationsOpt')
+    for i, symbol in enumerate(program[:declarations_start]):
+        if lookahead_terminal(fip_entries[i]) != symbol:
+            return None
+
+    depth = 1
+    statement_start = declarations_start
+    instructions_start = None
+    segments = []
+    for i in range(declarations_start, len(fip_entries) - 1):
+        token = fip_entries[i].token
+        if token == '{':
+            depth += 1
+        elif token == '}':
+            depth -= 1
+            if depth == 0:
+                return None  # The program body closes before the last token
+        elif token == ';' and depth == 1:
+            if instructions_start is None and \
+                    ('Declaration', lookahead_terminal(fip_entries[statement_start])) in table:
+                statement_start = i + 1  # Declarations end with their own ';'
+                continue
+            if instructions_start is None:
+                instructions_start = statement_start
+            segments.append((statement_start, i, ';'))
+            statement_start = i + 1
+
+    last = len(fip_entries) - 1
+    if depth != 1 or (segments and statement_start == last):
+        return None  # Unbalanced braces, or a ';' with no statement after it
+    if instructions_start is None:
+        instructions_start = statement_start
+    if statement_start < last:
+        segments.append((statement_start, last, '}'))
+    return declarations_start, instructions_start, segments
+
+
+def _stitch(parser: MinilangParser, fip_entries: Sequence[FIPEntry], declarations_start: int,
+            instructions_start: int, segments: List[Segment],
+            statement_derivations: List[List[List[str]]]) -> List[List[str]]:
+    """Rebuild the leftmost derivation of the whole program around the parsed statements"""
+    table = parser.parsing_table
+
+    def expand(non_terminal: str, lookahead: str) -> List[str]:
+        production = table.get((non_terminal, lookahead))
+        if production is None:
+            raise Exception(f"No production for non-terminal '{non_terminal}' with token '{lookahead}'")
+        return production
+
+    first_instruction = lookahead_terminal(fip_entries[instructions_start])
+    derivation = [expand(parser.start_symbol, lookahead_terminal(fip_entries[0]))]
+    derivation.extend(parse_entries(table, parser.non_terminals, 'DeclarationsOpt',
+                                    fip_entries[declarations_start:instructions_start],
+                                    end_token=first_instruction))
+    derivation.append(expand('InstructionsOpt', first_instruction))
+
+    for (start, _, end_token), statement in zip(segments, statement_derivations):
+        derivation.append(expand('InstructionList', lookahead_terminal(fip_entries[start])))
+        derivation.extend(statement)
+        derivation.append(expand('InstructionListTail', end_token))
+    return derivation
+
+
+def parse_parallel(parser: MinilangParser, fip_entries: Sequence[FIPEntry], workers: Optional[int] = None,
+                   min_tokens: int = MIN_PARALLEL_TOKENS) -> List[List[str]]:
+    """Parse a program by parsing its top-level statements independently in worker processes
+
+    The result is the same derivation parse_entries gives for the whole program. Small inputs,
+    and inputs the pre-scan cannot split, are parsed sequentially; if any statement fails, the
+    whole program is re-parsed sequentially so the reported error is the first one.
+    """
+    global _SHARED_ENTRIES
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    split = split_program(parser, fip_entries) if len(fip_entries) >= min_tokens else None
+    if split is None:
+        return parse_entries(parser.parsing_table, parser.non_terminals, parser.start_symbol, fip_entries)
+    declarations_start, instructions_start, segments = split
+
+    # Batches of consecutive statements with roughly the same number of tokens each
+    batch_count = max(1, min(len(segments), workers * 4))
+    batch_tokens = max(1, (len(fip_entries) + batch_count - 1) // batch_count)
+    batches, batch, size = [], [], 0
+    for segment in segments:
+        batch.append(segment)
+        size += segment[1] - segment[0]
+        if size >= batch_tokens:
+            batches.append(batch)
+            batch, size = [], 0
+    if batch:
+        batches.append(batch)
+
+    productions = _production_list(parser)
+    try:
+        if workers == 1:
+            _init_worker(parser, fip_entries)
+            results = [_parse_segments(b) for b in batches]
+        elif 'fork' in multiprocessing.get_all_start_methods():
+            _init_worker(parser, fip_entries)
+            gc.freeze()
+            with multiprocessing.get_context('fork').Pool(workers) as pool:
+                results = pool.map(_parse_segments, batches, chunksize=1)
+        else:
+            with multiprocessing.Pool(workers, initializer=_init_worker, initargs=(parser, fip_entries)) as pool:
+                results = pool.map(_parse_segments, batches, chunksize=1)
+
+        statement_derivations = []
+        for ids in results:
+            statement = []
+            for production_id in ids:
+                if production_id == len(productions):
+                    statement_derivations.append(statement)
+                    statement = []
+                else:
+                    statement.append(productions[production_id])
+
+        return _stitch(parser, fip_entries, declarations_start, instructions_start, segments,
+                       statement_derivations)
+    except Exception:
+        return parse_entries(parser.parsing_table, parser.non_terminals, parser.start_symbol, fip_entries)
+    finally:
+        gc.unfreeze()
+        _SHARED_ENTRIES = ()
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Parse a large Minilang program statement by statement in parallel')
+    arg_parser.add_argument('source', help='Path to the Minilang source file')
+    arg_parser.add_argument('-g', '--grammar', default='minilang_grammar.txt',
+                            help='Grammar file (default: minilang_grammar.txt)')
+    arg_parser.add_argument('-j', '--workers', type=int, default=None,
+                            help='Number of worker processes (default: CPU count)')
+    args = arg_parser.parse_args()
+
+    parser = MinilangParser()
+    parser.read_grammar(args.grammar)
+    fip_entries = list(MinilangLexer(parser.token_codes).lex_file(args.source))
+
+    start = time.perf_counter()
+    sequential = parse_entries(parser.parsing_table, parser.non_terminals, parser.start_symbol, fip_entries)
+    sequential_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    parallel = parse_parallel(parser, fip_entries, args.workers)
+    parallel_time = time.perf_counter() - start
+
+    print(f"Tokens:      {len(fip_entries)}")
+    print(f"Sequential:  {sequential_time * 1000:.1f} ms")
+    print(f"Parallel:    {parallel_time * 1000:.1f} ms")
+    print(f"Identical derivation: {parallel == sequential}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+from typing import Iterable, Iterator, List, Optional, Set
+
+from minilang_parser import FIPEntry
+
+
+class ParseNode:
+    """Node of a parse tree annotated with the range of FIP entries it covers
+
+    offset is relative to the first entry covered by the parent (the root uses its own base),
+    so a subtree can be moved or replaced without renumbering the nodes around it.
+    """
+    __slots__ = ('symbol', 'production', 'children', 'parent', 'index', 'offset', 'length', 'entry')
+
+    def __init__(self, symbol: str, parent: Optional['ParseNode'] = None, index: int = 0):
+        self.symbol = symbol
+        self.production: Optional[List[str]] = None  # Set for non-terminals
+        self.children: List['ParseNode'] = []
+        self.parent = parent
+        self.index = index  # Position among the parent's children
+        self.offset = 0
+        self.length = 0
+        self.entry: Optional[FIPEntry] = None  # Set for terminals
+
+    def is_terminal(self) -> bool:
+        return self.production is None
+
+    def preorder(self) -> Iterator['ParseNode']:
+        """Walk the subtree without recursion, since statement lists make trees very deep"""
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed(node.children))
+
+    def derivation(self) -> List[List[str]]:
+        """Leftmost derivation of the subtree, as returned by the parsers"""
+        return [node.production for node in self.preorder() if node.production is not None]
+
+    def entries(self) -> List[FIPEntry]:
+        return [node.entry for node in self.preorder() if node.entry is not None]
+
+    def absolute_start(self, root_start: int = 0) -> int:
+        """Index of the first entry covered, for a tree whose root starts at root_start"""
+        start = root_start
+        node = self
+        while node is not None:
+            start += node.offset
+            node = node.parent
+        return start
+
+    def stack_below(self) -> List[str]:
+        """Parser stack under this node when it was expanded, top last (within its tree)"""
+        parts = []
+        node = self
+        while node.parent is not None:
+            parts.append(node.parent.production[:node.index:-1])  # Remaining siblings, nearest on top
+            node = node.parent
+        stack = []
+        for part in reversed(parts):
+            stack.extend(part)
+        return stack
+
+    def __repr__(self):
+        return f"ParseNode({self.symbol!r}, offset={self.offset}, length={self.length})"
+
+
+def build_tree(derivation: Iterable[List[str]], fip_entries: Iterable[FIPEntry], start_symbol: str,
+               non_terminals: Set[str]) -> ParseNode:
+    """Rebuild the parse tree from a leftmost derivation and the entries it was parsed from"""
+    productions = iter(derivation)
+    entries = iter(fip_entries)
+    root = ParseNode(start_symbol)
+    stack = [root]
+    order = []
+    position = 0
+
+    while stack:
+        node = stack.pop()
+        node.offset = position  # Absolute for now
+        order.append(node)
+        if node.symbol in non_terminals:
+            node.production = next(productions)
+            if node.production != ['epsilon']:
+                node.children = [ParseNode(symbol, node, i) for i, symbol in enumerate(node.production)]
+                stack.extend(reversed(node.children))
+        else:
+            node.entry = next(entries)
+            node.length = 1
+            position += 1
+
+    # Children come after their parent in preorder, so walking backwards finishes them first
+    for node in reversed(order):
+        if node.children:
+            node.length = sum(child.length for child in node.children)
+            for child in node.children:
+                child.offset -= node.offset
+    root.offset = 0
+    return root
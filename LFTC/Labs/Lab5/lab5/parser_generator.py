@@ -0,0 +1,258 @@
+import argparse
+import hashlib
+import importlib.util
+import os
+import time
+from types import ModuleType
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from minilang_lexer import MinilangLexer
+from minilang_parser import FIPEntry, MinilangParser, lookahead_terminal, parse_entries
+
+# Bump when the emitted code changes so stale cached modules are not reused
+GENERATOR_VERSION = 1
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.parser_cache')
+
+# Terminal id reserved for the end of input
+END = 0
+
+
+def grammar_key(grammar) -> str:
+    """Hash identifying a grammar, used to name its cached generated parser"""
+    digest = hashlib.sha256()
+    digest.update(f"{GENERATOR_VERSION}\n{grammar.start_symbol}\n".encode())
+    for non_terminal, productions in grammar.productions.items():
+        for production in productions:
+            digest.update(f"{non_terminal} -> {' '.join(production)}\n".encode())
+    return digest.hexdigest()[:16]
+
+
+def _grammar_symbols(grammar, parsing_table: Dict[Tuple[str, str], List[str]]) -> Tuple[List[str], List[str]]:
+    """Return (terminals, non-terminals) in a stable order, '$' being terminal 0"""
+    terminals = {terminal for (_, terminal) in parsing_table}
+    for productions in grammar.productions.values():
+        for production in productions:
+            terminals.update(s for s in production if s not in grammar.non_terminals and s != 'epsilon')
+    terminals.discard('$')
+    return ['$'] + sorted(terminals), sorted(grammar.non_terminals)
+
+
+def _branch_test(terminal_ids: List[int]) -> str:
+    if len(terminal_ids) <= 3:
+        return " or ".join(f"t == {t}" for t in terminal_ids)
+    return f"t in {{{', '.join(str(t) for t in terminal_ids)}}}"
+
+
+def generate_parser_source(grammar, parsing_table: Optional[Dict[Tuple[str, str], List[str]]] = None,
+                           source_name: str = "grammar") -> str:
+    """Emit a standalone recursive-descent parser module for an LL(1) grammar
+
+    There is one function per non-terminal, branching on small-int terminal ids with the
+    alternatives taken from the parsing table (i.e. from the FIRST/FOLLOW sets it was built from).
+    Productions in tail position are returned instead of called, and the caller runs them in a
+    loop, so right-recursive lists such as InstructionList do not grow the Python stack.
+    """
+    if parsing_table is None:
+        parsing_table = grammar.build_parsing_table()
+
+    terminals, non_terminals = _grammar_symbols(grammar, parsing_table)
+    terminal_ids = {terminal: i for i, terminal in enumerate(terminals)}
+    non_terminal_ids = {nt: i for i, nt in enumerate(non_terminals)}
+
+    productions: List[Tuple[str, List[str]]] = []
+    production_ids: Dict[Tuple[str, Tuple[str, ...]], int] = {}
+    for non_terminal, rules in grammar.productions.items():
+        for production in rules:
+            key = (non_terminal, tuple(production))
+            if key not in production_ids:
+                production_ids[key] = len(productions)
+                productions.append((non_terminal, production))
+
+    # Group each table row by the production it selects
+    rows: Dict[str, Dict[int, List[int]]] = {nt: {} for nt in non_terminals}
+    for (non_terminal, terminal), production in sorted(parsing_table.items()):
+        key = (non_terminal, tuple(production))
+        if key not in production_ids:
+            production_ids[key] = len(productions)
+            productions.append((non_terminal, production))
+        rows[non_terminal].setdefault(production_ids[key], []).append(terminal_ids[terminal])
+
+    lines = [
+        f"# Generated by parser_generator.py (version {GENERATOR_VERSION}) from {source_name}. Do not edit.",
+        "",
+        f"TERMINALS = {terminals!r}",
+        f"NON_TERMINALS = {non_terminals!r}",
+        f"PRODUCTIONS = {productions!r}",
+        f"START = {grammar.start_symbol!r}",
+        "",
+        "",
+        "def _name(t):",
+        "    return TERMINALS[t] if 0 <= t < len(TERMINALS) else 'unknown'",
+        "",
+        "",
+        "def _no_production(non_terminal, t, pos):",
+        "    raise Exception(f\"Syntax error at position {pos}: \"",
+        "                    f\"No production for non-terminal '{NON_TERMINALS[non_terminal]}' with token '{_name(t)}'\")",
+        "",
+        "",
+        "def _expected(terminal, t, pos):",
+        "    raise Exception(f\"Syntax error at position {pos}: Expected '{TERMINALS[terminal]}', got '{_name(t)}'\")",
+        "",
+        "",
+        "def parse(toks):",
+        "    \"\"\"Parse a list of terminal ids ending with 0 ('$'); return the ids of the productions used\"\"\"",
+        "    pos = 0",
+        "    out = []",
+        "    emit = out.append",
+    ]
+
+    for non_terminal in non_terminals:
+        nt_id = non_terminal_ids[non_terminal]
+        body = [f"    def nt{nt_id}():  # {non_terminal}", "        nonlocal pos", "        t = toks[pos]"]
+        keyword = "if"
+        for production_id, branch_terminals in rows[non_terminal].items():
+            production = productions[production_id][1]
+            body.append(f"        {keyword} {_branch_test(branch_terminals)}:")
+            body.append(f"            emit({production_id})")
+            symbols = [] if production == ['epsilon'] else production
+            for i, symbol in enumerate(symbols):
+                if symbol in non_terminal_ids:
+                    if i == len(symbols) - 1:
+                        body.append(f"            return nt{non_terminal_ids[symbol]}")
+                    else:
+                        body.append(f"            f = nt{non_terminal_ids[symbol]}()")
+                        body.append("            while f is not None:")
+                        body.append("                f = f()")
+                else:
+                    terminal_id = terminal_ids[symbol]
+                    # The branch test already matched a leading terminal
+                    if not (i == 0 and branch_terminals == [terminal_id]):
+                        body.append(f"            if toks[pos] != {terminal_id}:")
+                        body.append(f"                _expected({terminal_id}, toks[pos], pos)")
+                    body.append("            pos += 1")
+            keyword = "elif"
+        if keyword == "if":
+            body.append(f"        _no_production({nt_id}, t, pos)")
+        else:
+            body.append("        else:")
+            body.append(f"            _no_production({nt_id}, t, pos)")
+        lines.append("")
+        lines.extend(body)
+
+    lines.extend([
+        "",
+        f"    f = nt{non_terminal_ids[grammar.start_symbol]}()",
+        "    while f is not None:",
+        "        f = f()",
+        f"    if toks[pos] != {END}:",
+        "        raise Exception(f\"Syntax error at position {pos}: Unexpected token '{_name(toks[pos])}' \"",
+        "                        f\"after end of input\")",
+        "    return out",
+        "",
+    ])
+    return "\n".join(lines)
+
+
+class GeneratedParser:
+    """Wrapper translating tokens to terminal ids and production ids back to a derivation"""
+
+    def __init__(self, module: ModuleType):
+        self.module = module
+        self.terminal_ids = {terminal: i for i, terminal in enumerate(module.TERMINALS)}
+        self.unknown_id = len(module.TERMINALS)
+        self.productions = [production for _, production in module.PRODUCTIONS]
+
+    def encode(self, terminals: Iterable[str]) -> List[int]:
+        get = self.terminal_ids.get
+        unknown = self.unknown_id
+        toks = [get(terminal, unknown) for terminal in terminals]
+        toks.append(END)
+        return toks
+
+    def parse_ids(self, toks: List[int]) -> List[int]:
+        return self.module.parse(toks)
+
+    def parse_tokens(self, tokens: Iterable[str]) -> List[List[str]]:
+        """Parse a sequence of terminal names, e.g. 'id + id * id'.split()"""
+        productions = self.productions
+        return [productions[i] for i in self.module.parse(self.encode(tokens))]
+
+    def parse_fip(self, fip_entries: Iterable[FIPEntry]) -> List[List[str]]:
+        """Parse FIP entries, giving the same derivation as MinilangParser.parse_fip"""
+        return self.parse_tokens(lookahead_terminal(entry) for entry in fip_entries)
+
+
+def load_generated_parser(grammar, cache_dir: str = DEFAULT_CACHE_DIR,
+                          source_name: str = "grammar") -> GeneratedParser:
+    """Return the generated parser for a grammar, generating and caching it on disk when needed
+
+    A cache hit skips FIRST/FOLLOW and table construction entirely.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    module_name = f"ll1_{grammar_key(grammar)}"
+    path = os.path.join(cache_dir, f"{module_name}.py")
+
+    if not os.path.exists(path):
+        parsing_table = getattr(grammar, 'parsing_table', None) or grammar.build_parsing_table()
+        source = generate_parser_source(grammar, parsing_table, source_name)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w') as f:
+            f.write(source)
+        os.replace(temp_path, path)
+
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return GeneratedParser(module)
+
+
+def benchmark(parser: MinilangParser, generated: GeneratedParser, fip_entries: List[FIPEntry],
+              repeats: int = 20) -> Dict[str, float]:
+    """Time the table-driven parse against the generated parser on the same input (best of repeats, in ms)"""
+    expected = parse_entries(parser.parsing_table, parser.non_terminals, parser.start_symbol, fip_entries)
+    if generated.parse_fip(fip_entries) != expected:
+        raise Exception("Generated parser produced a different derivation")
+
+    table_times = []
+    generated_times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        parse_entries(parser.parsing_table, parser.non_terminals, parser.start_symbol, fip_entries)
+        table_times.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        generated.parse_fip(fip_entries)
+        generated_times.append((time.perf_counter() - start) * 1000)
+
+    return {
+        'tokens': len(fip_entries),
+        'table_driven_ms': min(table_times),
+        'generated_ms': min(generated_times),
+        'speedup': min(table_times) / min(generated_times),
+    }
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Generate a recursive-descent parser and benchmark it')
+    arg_parser.add_argument('source', help='Minilang program to benchmark on')
+    arg_parser.add_argument('-g', '--grammar', default='minilang_grammar.txt',
+                            help='Grammar file (default: minilang_grammar.txt)')
+    arg_parser.add_argument('-r', '--repeats', type=int, default=20,
+                            help='Timed repetitions (default: 20)')
+    args = arg_parser.parse_args()
+
+    parser = MinilangParser()
+    parser.read_grammar(args.grammar)
+    generated = load_generated_parser(parser, source_name=args.grammar)
+
+    fip_entries = list(MinilangLexer(parser.token_codes).lex_file(args.source))
+    results = benchmark(parser, generated, fip_entries, args.repeats)
+
+    print(f"Tokens:         {results['tokens']}")
+    print(f"Table-driven:   {results['table_driven_ms']:.3f} ms")
+    print(f"Generated:      {results['generated_ms']:.3f} ms")
+    print(f"Speedup:        {results['speedup']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
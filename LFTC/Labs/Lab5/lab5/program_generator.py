@@ -0,0 +1,200 @@
+import argparse
+import random
+from bisect import bisect
+from itertools import accumulate
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from minilang_parser import FIPEntry, MinilangParser
+
+# Tokens a statement may grow to before its remaining choices take the shortest alternatives
+DEFAULT_SEGMENT_TOKENS = 60
+
+# Keep expressions shallow and blocks mostly non-empty in generated Minilang programs
+DEFAULT_WEIGHTS = {
+    ('Factor', ('(', 'Expression', ')')): 0.2,
+    ('ExpressionTail', ('epsilon',)): 2,
+    ('TermTail', ('epsilon',)): 2,
+    ('InstructionsOpt', ('epsilon',)): 0.2,
+}
+
+# Tokens after which the source layout starts a new line; '}' starts its own line instead
+_LINE_BREAK_AFTER = frozenset({';', '{'})
+
+
+class ProgramGenerator:
+    """Seeded random generator of programs derived from the grammar held by a MinilangParser
+
+    Expansion is iterative and streams its output, so memory stays bounded for any size. Minimum
+    derivation lengths are precomputed, and once the requested token count (or the size of the
+    current statement, segment_tokens) would be exceeded every remaining non-terminal takes its
+    shortest alternative, so generation always terminates close to the requested size. The
+    right spine of the derivation (a non-terminal with only terminals below it on the stack,
+    e.g. the top-level InstructionListTail) keeps taking growing alternatives until then, while
+    other choices are random, weighted by weights[(non_terminal, tuple(production))], which
+    defaults to DEFAULT_WEIGHTS (productions not listed weigh 1).
+    """
+
+    def __init__(self, parser: MinilangParser, seed: int = 0,
+                 weights: Optional[Dict[Tuple[str, Tuple[str, ...]], float]] = None,
+                 segment_tokens: int = DEFAULT_SEGMENT_TOKENS, identifier_count: int = 26):
+        self.parser = parser
+        self.seed = seed
+        self.segment_tokens = segment_tokens
+        self.identifiers = [f"v{i}" for i in range(identifier_count)]
+        self.alternatives: Dict[str, List[List[str]]] = {
+            nt: rules for nt, rules in parser.productions.items() if rules
+        }
+        if weights is None:
+            weights = DEFAULT_WEIGHTS
+        self.min_length = self._min_lengths()
+        self.shortest = {nt: min(rules, key=self.cost) for nt, rules in self.alternatives.items()}
+
+        # Per non-terminal: alternatives, their cumulative weights and growth (non-terminal counts)
+        self._choices = {}
+        for nt, rules in self.alternatives.items():
+            growth = [self._non_terminal_count(p) for p in rules]
+            self._choices[nt] = (
+                rules,
+                list(accumulate(weights.get((nt, tuple(p)), 1) for p in rules)),
+                list(accumulate(growth)) if any(growth) else list(accumulate(1 for _ in rules)),
+            )
+        self._expansions = {id(p): (self.cost(p), self._non_terminal_count(p), p[::-1])
+                            for rules in self.alternatives.values() for p in rules}
+
+    def _non_terminal_count(self, production: List[str]) -> int:
+        return sum(symbol in self.alternatives for symbol in production)
+
+    def _min_lengths(self) -> Dict[str, float]:
+        min_length = {nt: float('inf') for nt in self.alternatives}
+        self.min_length = min_length
+        changed = True
+        while changed:
+            changed = False
+            for non_terminal, rules in self.alternatives.items():
+                best = min(self.cost(production) for production in rules)
+                if best < min_length[non_terminal]:
+                    min_length[non_terminal] = best
+                    changed = True
+        if min_length[self.parser.start_symbol] == float('inf'):
+            raise Exception(f"Start symbol '{self.parser.start_symbol}' derives no finite program")
+        return min_length
+
+    def cost(self, production: List[str]) -> float:
+        """Fewest tokens a production can derive"""
+        if production == ['epsilon']:
+            return 0
+        return sum(self.min_length.get(symbol, 1) for symbol in production)
+
+    def terminals(self, token_count: int) -> Iterator[str]:
+        """Yield the terminals of a random program of about token_count tokens"""
+        random_value = random.Random(self.seed).random
+        choices, expansions, min_length, shortest = self._choices, self._expansions, self.min_length, self.shortest
+
+        emitted = 0
+        segment_start = 0
+        stack = [self.parser.start_symbol]
+        non_terminals_on_stack = 1
+        pending = min_length[self.parser.start_symbol]  # Shortest completion of the stack
+        while stack:
+            symbol = stack.pop()
+            choice = choices.get(symbol)
+            if choice is None:
+                emitted += 1
+                pending -= 1
+                yield symbol
+                continue
+
+            non_terminals_on_stack -= 1
+            pending -= min_length[symbol]
+            rules, weights, growth = choice
+            if emitted + pending >= token_count:
+                production = shortest[symbol]
+            elif non_terminals_on_stack == 0:
+                # On the right spine: grow, and start a new statement-sized segment
+                production = rules[bisect(growth, random_value() * growth[-1])]
+                segment_start = emitted
+            elif emitted - segment_start >= self.segment_tokens:
+                production = shortest[symbol]
+            else:
+                production = rules[bisect(weights, random_value() * weights[-1])]
+
+            if production != ['epsilon']:
+                cost, non_terminal_count, reversed_production = expansions[id(production)]
+                pending += cost
+                stack.extend(reversed_production)
+                non_terminals_on_stack += non_terminal_count
+
+    def _lines(self, token_count: int) -> Iterator[List[Tuple[str, str]]]:
+        """Group the spelled-out tokens into source lines of (text, terminal) pairs"""
+        rng = random.Random(self.seed + 1)
+        line = []
+        for terminal in self.terminals(token_count):
+            if terminal == 'id':
+                text = rng.choice(self.identifiers)
+            elif terminal == 'number':
+                text = str(rng.randint(0, 999)) if rng.random() < 0.9 else f"{rng.randint(0, 99)}.{rng.randint(0, 99)}"
+            else:
+                text = terminal
+            if text == '}' and line:
+                yield line
+                line = []
+            line.append((text, terminal))
+            if text in _LINE_BREAK_AFTER:
+                yield line
+                line = []
+        if line:
+            yield line
+
+    def source_lines(self, token_count: int) -> Iterator[str]:
+        """Yield the program as source lines, indented by brace depth"""
+        depth = 0
+        for line in self._lines(token_count):
+            if line[0][0] == '}':
+                depth -= 1
+            yield "    " * depth + " ".join(text for text, _ in line) + "\n"
+            if line[-1][0] == '{':
+                depth += 1
+
+    def fip_entries(self, token_count: int) -> Iterator[FIPEntry]:
+        """Yield the FIP entries MinilangLexer produces for source_lines(token_count)"""
+        token_codes = self.parser.token_codes
+        symbol_table: Dict[str, int] = {}
+        for line_number, line in enumerate(self._lines(token_count), 1):
+            for text, terminal in line:
+                if text in token_codes:
+                    yield FIPEntry(text, token_codes[text], -1, line_number)
+                else:
+                    position = symbol_table.setdefault(text, len(symbol_table) + 1)
+                    yield FIPEntry(text, 1 if terminal == 'number' else 0, position, line_number)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Generate a random valid Minilang program')
+    arg_parser.add_argument('tokens', type=int, help='Approximate number of tokens')
+    arg_parser.add_argument('-g', '--grammar', default='minilang_grammar.txt',
+                            help='Grammar file (default: minilang_grammar.txt)')
+    arg_parser.add_argument('-s', '--seed', type=int, default=0, help='Random seed (default: 0)')
+    arg_parser.add_argument('--format', choices=['source', 'fip'], default='source',
+                            help='Write source text or FIP entries (default: source)')
+    arg_parser.add_argument('-o', '--output', default='generated_program.txt',
+                            help='Output file (default: generated_program.txt)')
+    args = arg_parser.parse_args()
+
+    parser = MinilangParser()
+    parser.read_grammar(args.grammar)
+    generator = ProgramGenerator(parser, seed=args.seed)
+
+    with open(args.output, 'w') as f:
+        if args.format == 'source':
+            f.writelines(generator.source_lines(args.tokens))
+        else:
+            f.write(f"{'Token':15} | {'Code':5} | {'ST Pos':6}\n")
+            f.write("-" * 32 + "\n")
+            for entry in generator.fip_entries(args.tokens):
+                position = "-" if entry.symbol_table_pos < 0 else entry.symbol_table_pos
+                f.write(f"{entry.token:15} | {entry.code:5} | {position:6}\n")
+    print(f"Program written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+
+@dataclass
+class Binding:
+    """A declared variable"""
+    name: str
+    type_name: str
+    line: int
+    scope: str
+    depth: int
+    uses: int = 0
+
+
+class ScopedSymbolTable:
+    """Symbol table for nested scopes: one dict from name to its stack of bindings, innermost last
+
+    Each open scope keeps an undo log of the names it declared, so entering a scope is O(1),
+    leaving it costs one pop per declaration made in it, and lookups are a single dict access.
+    """
+
+    def __init__(self):
+        self.bindings: Dict[str, List[Binding]] = {}
+        self.scopes: List[Tuple[str, List[str]]] = [("global", [])]
+        self.declared: List[Binding] = []  # Every binding ever made, in declaration order
+
+    @property
+    def current_scope(self) -> str:
+        return self.scopes[-1][0]
+
+    @property
+    def depth(self) -> int:
+        return len(self.scopes) - 1
+
+    def enter(self, scope: str):
+        self.scopes.append((scope, []))
+
+    def exit(self) -> List[Binding]:
+        """Close the innermost scope, returning the bindings it held"""
+        if len(self.scopes) == 1:
+            raise Exception("Cannot exit the global scope")
+        _, undo_log = self.scopes.pop()
+        removed = []
+        for name in reversed(undo_log):
+            stack = self.bindings[name]
+            removed.append(stack.pop())
+            if not stack:
+                del self.bindings[name]
+        return removed
+
+    def declare(self, name: str, type_name: str, line: int = 0) -> Optional[Binding]:
+        """Bind name in the current scope; returns the existing binding instead if it is already declared there"""
+        stack = self.bindings.setdefault(name, [])
+        if stack and stack[-1].depth == self.depth:
+            return stack[-1]
+        binding = Binding(name, type_name, line, self.current_scope, self.depth)
+        stack.append(binding)
+        self.scopes[-1][1].append(name)
+        self.declared.append(binding)
+        return None
+
+    def lookup(self, name: str) -> Optional[Binding]:
+        stack = self.bindings.get(name)
+        return stack[-1] if stack else None
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.bindings
+
+
+# Non-terminals whose expansion opens a block, and the scope name their '{' gets
+_BLOCKS = {'Program': 'main', 'IfBlock': 'if', 'WhileBlock': 'while'}
+
+
+class SemanticAnalyzer:
+    """Declaration and type checks for Minilang, driven by MinilangParser.parse_fip as it parses
+
+    The parser reports each production it expands and each terminal it matches. Ids matched
+    inside a Declaration are declared, every other id is resolved, and the operand types of an
+    assignment's value are tracked until its statement ends, so nothing is walked twice.
+    Errors (undeclared and redeclared variables) and warnings (narrowing assignments, unused
+    variables) go to the context's errors and warnings lists.
+    """
+
+    def __init__(self, context):
+        self.context = context
+        self.table = context.symbol_table
+        self.declaring = False
+        self.declared_type: Optional[str] = None
+        self.block = 'main'
+        self.target_pending = False
+        self.target: Optional[Binding] = None  # Variable the current assignment stores to
+        self.value_type = 'int'
+        self.target_line = 0
+
+    def expand(self, non_terminal: str):
+        if non_terminal == 'Declaration':
+            self.declaring = True
+        elif non_terminal == 'Assignment':
+            self.target_pending = True
+        elif non_terminal in _BLOCKS:
+            self.block = _BLOCKS[non_terminal]
+
+    def match(self, terminal: str, entry):
+        if terminal == 'id':
+            self._identifier(entry)
+        elif terminal == 'number' or terminal == 'M_PI':
+            if self.target is not None and (terminal == 'M_PI' or '.' in entry.token):
+                self.value_type = 'double'
+        elif terminal == ';':
+            self.declaring = False
+            self._end_assignment()
+        elif terminal == '{':
+            self.table.enter(self.block if self.block == 'main' else f"{self.block}@{entry.line}")
+            self.context.current_scope = self.table.current_scope
+        elif terminal == '}':
+            self._end_assignment()
+            self._exit_scope()
+        elif self.declaring and terminal in ('int', 'double'):
+            self.declared_type = terminal
+
+    def _identifier(self, entry):
+        name = entry.token
+        if self.declaring:
+            previous = self.table.declare(name, self.declared_type, entry.line)
+            if previous is not None:
+                self.context.errors.append(f"Variable '{name}' redeclared at line {entry.line} "
+                                           f"(previous declaration at line {previous.line})")
+            return
+
+        binding = self.table.lookup(name)
+        if binding is None:
+            self.context.errors.append(f"Undeclared variable '{name}' at line {entry.line}")
+        else:
+            binding.uses += 1
+        if self.target_pending:
+            self.target_pending = False
+            self.target = binding
+            self.target_line = entry.line
+            self.value_type = 'int'
+        elif self.target is not None and binding is not None and binding.type_name == 'double':
+            self.value_type = 'double'
+
+    def _end_assignment(self):
+        target = self.target
+        if target is not None and target.type_name == 'int' and self.value_type == 'double':
+            self.context.warnings.append(f"Narrowing conversion from double to int in assignment to "
+                                         f"'{target.name}' at line {self.target_line}")
+        self.target = None
+
+    def _exit_scope(self):
+        for binding in reversed(self.table.exit()):
+            # The assignment target counts as a use, so only never-mentioned variables are reported
+            if binding.uses == 0:
+                self.context.warnings.append(f"Variable '{binding.name}' declared at line {binding.line} "
+                                             f"is never used")
+        self.context.current_scope = self.table.current_scope
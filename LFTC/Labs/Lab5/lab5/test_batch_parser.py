@@ -0,0 +1,62 @@
+import gc
+import os
+import tempfile
+
+import batch_parser
+from batch_parser import validate_programs
+from minilang_lexer import MinilangLexer
+from minilang_parser import MinilangParser, parse_entries
+from test_minilang_pipeline import GCD_PROGRAM
+
+
+BAD_PROGRAM = """
+int main() {
+    int a;
+    cin >> a
+    cout << a
+}
+"""
+
+
+def test_parse_entries_matches_parse_fip():
+    parser = MinilangParser()
+    parser.read_grammar("minilang_grammar.txt")
+
+    expected = parser.parse_fip(MinilangLexer(parser.token_codes).lex(GCD_PROGRAM.splitlines()), verbose=False)
+    derivation = parse_entries(parser.parsing_table, parser.non_terminals, parser.start_symbol,
+                               MinilangLexer(parser.token_codes).lex(GCD_PROGRAM.splitlines()))
+    assert derivation == expected
+
+
+def test_validate_programs():
+    with tempfile.TemporaryDirectory() as directory:
+        paths = []
+        for i in range(20):
+            path = os.path.join(directory, f"program_{i}.txt")
+            with open(path, 'w') as f:
+                f.write(BAD_PROGRAM if i % 5 == 0 else GCD_PROGRAM)
+            paths.append(path)
+
+        for workers in (1, 2):
+            results = list(validate_programs(paths, workers=workers, chunksize=3))
+            print(f"workers={workers}: {sum(r.ok for r in results)}/{len(results)} passed")
+
+            assert [r.path for r in results] == paths
+            assert [r.ok for r in results] == [i % 5 != 0 for i in range(20)]
+            assert all("Expected" in r.error or "No production" in r.error for r in results if not r.ok)
+            assert batch_parser._SHARED_PARSER is None
+            assert gc.get_freeze_count() == 0
+
+        # Objects the caller froze stay frozen
+        gc.freeze()
+        try:
+            frozen = gc.get_freeze_count()
+            assert all(r.ok for r in validate_programs(paths[1:5], workers=2))
+            assert gc.get_freeze_count() == frozen
+        finally:
+            gc.unfreeze()
+
+
+if __name__ == "__main__":
+    test_parse_entries_matches_parse_fip()
+    test_validate_programs()
@@ -0,0 +1,57 @@
+from compressed_table import CompressedParsingTable, memory_report
+from ll1_parser import Grammar
+from minilang_lexer import MinilangLexer
+from minilang_parser import MinilangParser
+from test_minilang_pipeline import GCD_PROGRAM
+
+
+def test_same_lookups_as_dict():
+    parser = MinilangParser()
+    parser.read_grammar("minilang_grammar.txt")
+    compressed = CompressedParsingTable(parser.parsing_table)
+
+    assert len(compressed) == len(parser.parsing_table)
+    assert dict(compressed.items()) == parser.parsing_table
+    for non_terminal in parser.non_terminals:
+        for terminal in parser.terminals | {'$', 'unknown'}:
+            key = (non_terminal, terminal)
+            assert (key in compressed) == (key in parser.parsing_table)
+            assert compressed.get(key) is parser.parsing_table.get(key)
+    assert ('Unknown', 'id') not in compressed
+
+    report = memory_report(parser.parsing_table, compressed)
+    print(f"Memory: {report}")
+    assert report['compressed_bytes'] < report['dict_bytes']
+
+
+def test_default_rows():
+    parser = MinilangParser()
+    parser.read_grammar("minilang_grammar.txt")
+    compressed = CompressedParsingTable(parser.parsing_table, use_default_rows=True)
+
+    # Every explicit entry is still answered with the same production
+    for key, production in parser.parsing_table.items():
+        assert compressed[key] is production
+    assert len(compressed) == len(list(compressed))
+
+
+def test_parsers_accept_compressed_table():
+    parser = MinilangParser()
+    parser.read_grammar("minilang_grammar.txt")
+    lexer = MinilangLexer(parser.token_codes)
+    expected = parser.parse_fip(lexer.lex(GCD_PROGRAM.splitlines()), verbose=False)
+
+    for use_default_rows in (False, True):
+        parser.parsing_table = CompressedParsingTable(parser.build_parsing_table(), use_default_rows)
+        assert parser.parse_fip(lexer.lex(GCD_PROGRAM.splitlines()), verbose=False) == expected
+
+    grammar = Grammar()
+    grammar.read_from_file("grammar.txt")
+    table = CompressedParsingTable(grammar.build_parsing_table())
+    assert grammar.parse("id + id * id", table) == grammar.parse("id + id * id")
+
+
+if __name__ == "__main__":
+    test_same_lookups_as_dict()
+    test_default_rows()
+    test_parsers_accept_compressed_table()
@@ -0,0 +1,63 @@
+from grammar_analysis import analyze_grammar, prune_grammar
+from ll1_parser import Grammar
+from minilang_parser import MinilangParser
+
+
+def make_grammar(rules):
+    grammar = Grammar()
+    for non_terminal, production in rules:
+        grammar.add_production(non_terminal, production.split())
+    grammar.start_symbol = rules[0][0]
+    return grammar
+
+
+def test_analysis():
+    grammar = make_grammar([
+        ('S', 'A B'), ('S', 'C'),
+        ('A', 'a'), ('A', 'epsilon'),
+        ('B', 'b B'), ('B', 'epsilon'),
+        ('C', 'c C'),       # Never terminates
+        ('D', 'd'),         # Never used
+    ])
+    analysis = analyze_grammar(grammar.productions, grammar.start_symbol)
+    assert analysis.nullable == {'S', 'A', 'B'}
+    assert analysis.productive == {'S', 'A', 'B', 'D'}
+    assert analysis.reachable == {'S', 'A', 'B'}
+
+
+def test_prune():
+    grammar = make_grammar([
+        ('S', 'A B'), ('S', 'C'),
+        ('A', 'a'), ('A', 'epsilon'),
+        ('B', 'b B'), ('B', 'epsilon'),
+        ('C', 'c C'),
+        ('D', 'd'),
+    ])
+    report = prune_grammar(grammar)
+    print(report)
+    assert report.unproductive == ['C']
+    assert report.unreachable == ['D']
+    assert report.removed_terminals == ['c', 'd']
+    assert len(report.removed_productions) == 3
+    assert grammar.non_terminals == {'S', 'A', 'B'}
+    assert grammar.terminals == {'a', 'b'}
+    assert grammar.parse("a b b", grammar.build_parsing_table()) == grammar.parse("a b b")
+
+
+def test_minilang_grammar_is_clean():
+    parser = MinilangParser()
+    parser.read_grammar("minilang_grammar.txt", prune=True)
+    assert parser.prune_report.is_empty()
+    # Non-terminals used before their definition are no longer counted as terminals
+    assert not parser.terminals & parser.non_terminals
+
+    unpruned = MinilangParser()
+    unpruned.read_grammar("minilang_grammar.txt")
+    assert parser.parsing_table == unpruned.parsing_table
+    assert len(parser.validate_parsing_table()) < len(unpruned.validate_parsing_table())
+
+
+if __name__ == "__main__":
+    test_analysis()
+    test_prune()
+    test_minilang_grammar_is_clean()
@@ -0,0 +1,51 @@
+import json
+
+from grammar_benchmark import generate_grammar, generate_sentence, run_benchmark
+from ll1_parser import Grammar
+
+
+def test_generated_grammar_is_ll1():
+    for seed in range(5):
+        rules = generate_grammar(200, nullable_density=0.5, chain_depth=6, open_density=0.5, seed=seed)
+        grammar = Grammar()
+        for non_terminal, production in rules:
+            grammar.add_production(non_terminal, production)
+        grammar.start_symbol = 'A0'
+
+        table = grammar.build_parsing_table()  # Raises on a conflict
+        sentence = generate_sentence(rules, 2000, seed=seed)
+        assert len(sentence) >= 2000
+        assert grammar.parse(" ".join(sentence), table)
+        assert generate_sentence(rules, 2000, seed=seed) == sentence
+
+
+def test_open_bodies_propagate_follow():
+    rules = generate_grammar(200, nullable_density=0.5, chain_depth=6, open_density=0.5, seed=0)
+    grammar = Grammar()
+    for non_terminal, production in rules:
+        grammar.add_production(non_terminal, production)
+    grammar.start_symbol = 'A0'
+    follow = grammar.compute_follow_sets(grammar.compute_first_sets())
+
+    open_rules = [(nt, production) for nt, production in rules if production[-1].startswith('A')]
+    assert len(open_rules) > 20
+    for non_terminal, production in open_rules:
+        assert follow[non_terminal] <= follow[production[-1]]
+    # The inherited sets are not trivial: closing terminals of enclosing alternatives flow down
+    assert any(t.startswith('c') for non_terminal, _ in open_rules for t in follow[non_terminal])
+    assert all(production[-1].startswith('c') for _, production in
+               generate_grammar(50, open_density=0, seed=0) if production != ['epsilon'])
+
+
+def test_run_benchmark():
+    results = run_benchmark([10, 50], token_count=500, repeats=1)
+    assert {r['engine'] for r in results} == {'Grammar', 'MinilangParser'}
+    for result in results:
+        assert result['parse_ms'] >= 0 and result['derivation_steps'] > 0
+    assert len(json.loads(json.dumps(results))) == 4
+
+
+if __name__ == "__main__":
+    test_generated_grammar_is_ll1()
+    test_open_bodies_propagate_follow()
+    test_run_benchmark()
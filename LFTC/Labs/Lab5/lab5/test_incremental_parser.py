@@ -0,0 +1,135 @@
+import random
+
+from incremental_parser import IncrementalParser
+from minilang_lexer import MinilangLexer
+from minilang_parser import MinilangParser, parse_entries
+from test_minilang_pipeline import GCD_PROGRAM, make_parser
+
+
+def lex(parser: MinilangParser, text: str):
+    return list(MinilangLexer(parser.token_codes).lex(text.splitlines()))
+
+
+def full_parse(parser: MinilangParser, entries):
+    return parse_entries(parser.parsing_table, parser.non_terminals, parser.start_symbol, entries)
+
+
+def find(entries, tokens, occurrence=0):
+    """Index of the given token sequence in the FIP"""
+    for i in range(len(entries)):
+        if [e.token for e in entries[i:i + len(tokens)]] == tokens:
+            if occurrence == 0:
+                return i
+            occurrence -= 1
+    raise ValueError(tokens)
+
+
+def test_edits_match_full_parse():
+    parser = make_parser()
+    incremental = IncrementalParser(parser, lex(parser, GCD_PROGRAM))
+    assert incremental.derivation() == full_parse(parser, incremental.entries)
+
+    edits = [
+        # Change an operand inside the while body: only that nested Instruction is re-parsed
+        (['temp', '=', 'b'], ['temp', '=', 'b', '+', '1'], True),
+        # Turn one statement into two
+        (['cin', '>>', 'b'], ['cin', '>>', 'b', ';', 'cout', '<<', 'b'], False),
+        # Remove a whole statement together with its separator
+        (['cin', '>>', 'a', ';'], [], False),
+        # Replace the last statement
+        (['cout', '<<', 'a'], ['if', '(', 'a', '<', 'b', ')', '{', 'a', '=', 'b', '}'], True),
+    ]
+    for old, new, in_place in edits:
+        start = find(incremental.entries, old)
+        node = incremental.edit(start, start + len(old), lex(parser, " ".join(new)))
+        assert (node is not None) == in_place
+        assert incremental.derivation() == full_parse(parser, incremental.entries)
+
+
+def test_invalid_edit_keeps_previous_parse():
+    parser = make_parser()
+    incremental = IncrementalParser(parser, lex(parser, GCD_PROGRAM))
+    before = list(incremental.entries)
+    derivation = incremental.derivation()
+
+    start = find(incremental.entries, ['a', '=', 'temp'])
+    try:
+        incremental.edit(start, start + 3, lex(parser, "a = = temp"))
+        assert False, "Expected a syntax error"
+    except Exception as e:
+        print(f"Rejected edit: {e}")
+    assert incremental.entries == before
+    assert incremental.derivation() == derivation
+
+
+def test_stray_terminator_rejected():
+    parser = make_parser()
+    program = "int main() { int a, b; cin >> a; a = a + 1; cout << a }"
+    # A trailing ';' inside a statement (re-parsed in place) and an unmatched '}' (re-split statement list)
+    for old, new in ((['1'], "1 ;"), (['a', '=', 'a'], "} a = a"), (['cout'], "cout << a } ; cout")):
+        incremental = IncrementalParser(parser, lex(parser, program))
+        before = list(incremental.entries)
+        start = find(incremental.entries, old)
+        edited = before[:start] + lex(parser, new) + before[start + len(old):]
+        try:
+            full_parse(parser, edited)
+            assert False, f"Expected '{new}' to be invalid"
+        except Exception:
+            pass
+        try:
+            incremental.edit(start, start + len(old), lex(parser, new))
+            assert False, f"Expected the edit to '{new}' to be rejected"
+        except Exception as e:
+            print(f"Rejected edit: {e}")
+        assert incremental.entries == before
+        assert incremental.derivation() == full_parse(parser, before)
+
+
+def test_random_token_edits_agree_with_full_parse():
+    parser = make_parser()
+    rng = random.Random(3)
+    pieces = ["a", "1", "+", ";", "}", "{", "(", ")", "a = 1", "cin >> a", "while (a < b) { a = a - 1 }"]
+    statements = ["a = a + 1", "cin >> b", "while (a < b) { a = a * 2; cout << a }", "cout << a - b"]
+    program = "int main() {\n int a, b;\n" + ";\n".join(rng.choice(statements) for _ in range(30)) + "\n}"
+    incremental = IncrementalParser(parser, lex(parser, program))
+
+    for _ in range(300):
+        start = rng.randrange(incremental.instructions_start, len(incremental.entries) - 1)
+        end = min(len(incremental.entries) - 1, start + rng.randrange(3))
+        new = lex(parser, rng.choice(pieces))
+        edited = incremental.entries[:start] + new + incremental.entries[end:]
+        try:
+            full_parse(parser, edited)
+            valid = True
+        except Exception:
+            valid = False
+        try:
+            incremental.edit(start, end, new)
+            accepted = True
+        except Exception:
+            accepted = False
+        assert accepted == valid
+        assert incremental.derivation() == full_parse(parser, incremental.entries)
+
+
+def test_random_statement_edits():
+    parser = make_parser()
+    statements = ["a = a + 1", "cin >> b", "while (a < b) { a = a * 2; cout << a }", "cout << a - b"]
+    rng = random.Random(7)
+    program = "int main() {\n int a, b;\n" + ";\n".join(rng.choice(statements) for _ in range(200)) + "\n}"
+    incremental = IncrementalParser(parser, lex(parser, program))
+
+    for _ in range(100):
+        index = rng.randrange(len(incremental.statements))
+        start = incremental.statement_start(index)
+        end = start + incremental.statements[index].length
+        incremental.edit(start, end, lex(parser, rng.choice(statements)))
+    assert incremental.derivation() == full_parse(parser, incremental.entries)
+
+
+if __name__ == "__main__":
+    test_edits_match_full_parse()
+    test_invalid_edit_keeps_previous_parse()
+    test_stray_terminator_rejected()
+    test_random_token_edits_agree_with_full_parse()
+    test_random_statement_edits()
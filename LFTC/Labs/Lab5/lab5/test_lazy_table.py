@@ -0,0 +1,82 @@
+from lazy_table import LazyParsingTable
+from ll1_parser import Grammar
+from minilang_lexer import MinilangLexer
+from minilang_parser import MinilangParser
+from test_minilang_pipeline import GCD_PROGRAM
+
+
+def test_rows_built_on_demand():
+    parser = MinilangParser()
+    parser.read_grammar("minilang_grammar.txt", lazy=True)
+    table = parser.parsing_table
+    assert isinstance(table, LazyParsingTable)
+    assert not table.rows
+
+    # Reading one variable touches only the declaration and read rows
+    lexer = MinilangLexer(parser.token_codes)
+    parser.parse_fip(lexer.lex(["int main() { int a; cin >> a }"]), verbose=False)
+    assert set(table.rows) == {'Program', 'DeclarationsOpt', 'Declaration', 'Type', 'IdListTail', 'DeclarationsRest',
+                               'InstructionsOpt', 'InstructionList', 'Instruction', 'SimpleInstruction',
+                               'ReadStmt', 'InstructionListTail'}
+    assert 'Expression' not in table.rows and 'WhileBlock' not in table.rows
+
+    derivation = parser.parse_fip(lexer.lex(GCD_PROGRAM.splitlines()), verbose=False)
+    print(f"Rows built for the GCD program: {len(table.rows)}/{len(parser.non_terminals)}")
+    assert 'Expression' in table.rows and 'IfBlock' not in table.rows
+
+    eager = MinilangParser()
+    eager.read_grammar("minilang_grammar.txt")
+    assert derivation == eager.parse_fip(lexer.lex(GCD_PROGRAM.splitlines()), verbose=False)
+
+    assert table.validate() == len(eager.parsing_table)
+    assert 'IfBlock' in table.rows and set(table.rows) == parser.non_terminals
+    assert dict(table.items()) == eager.parsing_table
+
+
+def test_errors_and_verbose_parse_stay_lazy():
+    parser = MinilangParser()
+    parser.read_grammar("minilang_grammar.txt", lazy=True)
+    table = parser.parsing_table
+    lexer = MinilangLexer(parser.token_codes)
+
+    parser.parse_fip(lexer.lex(["int main() { int a; cin >> a }"]), verbose=True)
+    _, diagnostics = parser.parse_with_recovery(lexer.lex(["int main() { int a; cin >> ; }"]))
+    assert diagnostics and diagnostics[0].expected == ['id']
+    assert 'Expression' not in table.rows and 'WhileBlock' not in table.rows
+
+    eager = MinilangParser()
+    eager.read_grammar("minilang_grammar.txt")
+    _, expected = eager.parse_with_recovery(lexer.lex(["int main() { int a; cin >> ; }"]))
+    assert diagnostics == expected
+
+
+def test_conflict_found_by_validate():
+    grammar = Grammar()
+    grammar.add_production('S', ['A'])
+    grammar.add_production('S', ['B'])
+    grammar.add_production('A', ['x'])
+    grammar.add_production('B', ['x'])
+    grammar.start_symbol = 'S'
+
+    table = LazyParsingTable(grammar)
+    assert ('A', 'x') in table
+    try:
+        table.validate()
+        assert False, "Expected an LL(1) conflict"
+    except Exception as e:
+        print(f"Validation error: {e}")
+        assert "not LL(1)" in str(e)
+
+
+def test_grammar_parse_with_lazy_table():
+    grammar = Grammar()
+    grammar.read_from_file("grammar.txt")
+    table = LazyParsingTable(grammar)
+    assert grammar.parse("id + id * id", table) == grammar.parse("id + id * id")
+
+
+if __name__ == "__main__":
+    test_rows_built_on_demand()
+    test_errors_and_verbose_parse_stay_lazy()
+    test_conflict_found_by_validate()
+    test_grammar_parse_with_lazy_table()
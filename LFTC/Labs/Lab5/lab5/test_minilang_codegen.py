@@ -0,0 +1,117 @@
+import io
+import os
+import tempfile
+
+from minilang_ast import build_ast
+from minilang_codegen import (CodeGenerator, build_executable, count_instructions, generate_assembly,
+                              lab6_to_minilang, peephole, run_executable, toolchain_available)
+from minilang_executor import interpret
+from minilang_lexer import MinilangLexer
+from minilang_parser import MinilangParser
+from test_minilang_executor import ARITHMETIC_PROGRAM, SUM_PROGRAM
+from test_minilang_pipeline import GCD_PROGRAM, make_parser
+
+# Left operands that are products keep one temporary per level live, more than there are registers
+SPILL_PROGRAM = ("int main() { int a, b; double d; cin >> a; cin >> b; cin >> d; cout << (a * b)"
+                 + "".join(f" + ((a * {i}) - (b" for i in range(20)) + "))" * 20 + "; cout << (d * d)"
+                 + "".join(f" + ((d * {i}) - (d" for i in range(15)) + "))" * 15 + " }")
+
+
+def parse(parser: MinilangParser, source: str):
+    return build_ast(parser, MinilangLexer(parser.token_codes).lex(source.splitlines()))
+
+
+def test_temporaries_in_registers():
+    parser = make_parser()
+    generator = CodeGenerator(parse(parser, GCD_PROGRAM))
+    assembly = generator.generate()
+    print(assembly)
+
+    assert generator.spilled() == 0
+    assert "push rax" not in assembly and "rbp -" not in assembly
+    assert "idiv qword [v_b]" in assembly
+    assert assembly.count("call scanf") == 2 and assembly.count("call printf") == 2  # cout and the error
+    # The loop tests its condition once per iteration, at the bottom
+    assert "    cmp qword [v_b], 0\n    jne .L0" in assembly
+
+
+def test_register_pressure_spills():
+    parser = make_parser()
+    generator = CodeGenerator(parse(parser, SPILL_PROGRAM))
+    assembly = generator.generate()
+    print(f"{generator.spilled()} spilled temporaries")
+
+    assert generator.spilled() > 0
+    assert "rbp -" in assembly
+    # Callee-saved registers in use are restored
+    assert "push rbx" in assembly and "pop rbx" in assembly
+
+
+def test_peephole():
+    code = [
+        ('mov', 'rsi', 'rsi'),
+        ('push', 'rax'),
+        ('pop', 'rbx'),
+        ('mov', 'qword [v_x]', 'rsi'),
+        ('mov', 'rdi', 'qword [v_x]'),
+        ('mov', 'rax', '1'),
+        ('mov', 'rax', 'qword [v_y]'),
+        ('add', 'rax', '0'),
+        ('jmp', '.L0'),
+        ('label', '.L0'),
+    ]
+    optimized, removed = peephole(code)
+    print(optimized)
+    assert optimized == [
+        ('mov', 'rbx', 'rax'),
+        ('mov', 'qword [v_x]', 'rsi'),
+        ('mov', 'rdi', 'rsi'),
+        ('mov', 'rax', 'qword [v_y]'),
+        ('label', '.L0'),
+    ]
+    assert removed == 5
+
+    # A move whose source reads the overwritten register stays
+    code = [('mov', 'rax', 'qword [v_x]'), ('mov', 'rax', 'qword [rax]')]
+    assert peephole(code) == (code, 0)
+
+
+def test_lab6_translation():
+    parser = make_parser()
+    with open(os.path.join("..", "..", "lab6", "input_program2")) as f:
+        source = lab6_to_minilang(f.read())
+    print(source)
+    output = io.StringIO()
+    interpret(parse(parser, source), io.StringIO("3 4 5"), output)
+    assert output.getvalue() == "49\n"
+
+    with open(os.path.join("..", "..", "lab6", "input_program2.asm")) as f:
+        lab6_assembly = f.read()
+    assert count_instructions(generate_assembly(parse(parser, source))) < count_instructions(lab6_assembly)
+
+
+def test_executables_match_interpreter():
+    if not toolchain_available():
+        print("nasm or gcc not installed, skipping")
+        return
+    parser = make_parser()
+    cases = [(GCD_PROGRAM, "48 18"), (SUM_PROGRAM, "4 1 2 3 5"), (ARITHMETIC_PROGRAM, ""),
+             (SPILL_PROGRAM, "3 -5 1.25")]
+    with tempfile.TemporaryDirectory() as directory:
+        for index, (source, input_text) in enumerate(cases):
+            program = parse(parser, source)
+            executable = os.path.join(directory, f"program{index}")
+            build_executable(generate_assembly(program), executable)
+            expected = io.StringIO()
+            interpret(program, io.StringIO(input_text), expected)
+            output, ms = run_executable(executable, input_text)
+            print(f"program{index}: {ms:.1f} ms")
+            assert output == expected.getvalue()
+
+
+if __name__ == "__main__":
+    test_temporaries_in_registers()
+    test_register_pressure_spills()
+    test_peephole()
+    test_lab6_translation()
+    test_executables_match_interpreter()
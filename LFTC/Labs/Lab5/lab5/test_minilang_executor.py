@@ -0,0 +1,109 @@
+import io
+
+from minilang_ast import build_ast
+from minilang_executor import compile_source, interpret
+from minilang_lexer import MinilangLexer
+from minilang_parser import MinilangParser
+from test_minilang_pipeline import GCD_PROGRAM, make_parser
+
+
+SUM_PROGRAM = """
+int main() {
+    int n, sum, i, num;
+    double average;
+    sum = 0;
+    cin >> n;
+    i = 0;
+    while (i < n) {
+        cin >> num;
+        sum = sum + num;
+        i = i + 1
+    };
+    average = sum / n;
+    cout << sum;
+    cout << average;
+    average = sum / 2.0;
+    cout << average
+}
+"""
+
+ARITHMETIC_PROGRAM = """
+int main() {
+    int a, b;
+    double x;
+    a = 0 - 7;
+    b = a / 2;
+    cout << b;
+    x = 2 * 3.14 * 10;
+    cout << x;
+    a = x;
+    cout << a;
+    b = 1 + 2 + 3 + 4 + 5 + 6 + 7 + 8 + 9 + 10 + 11 + 12 - 100 / 3 / 2;
+    cout << b
+}
+"""
+
+
+def run(parser: MinilangParser, source: str, input_text: str = "") -> str:
+    output = io.StringIO()
+    compile_source(parser, source.splitlines()).run(io.StringIO(input_text), output)
+
+    # The reference interpreter has to agree
+    reference = io.StringIO()
+    interpret(build_ast(parser, MinilangLexer(parser.token_codes).lex(source.splitlines())),
+              io.StringIO(input_text), reference)
+    assert output.getvalue() == reference.getvalue()
+    return output.getvalue()
+
+
+def test_gcd():
+    parser = make_parser()
+    assert run(parser, GCD_PROGRAM, "48 18") == "6\n"
+    assert run(parser, GCD_PROGRAM, "17\n5\n") == "1\n"
+
+
+def test_sum_and_types():
+    parser = make_parser()
+    output = run(parser, SUM_PROGRAM, "4\n1 2 3 5")
+    print(output)
+    # int / int truncates before the assignment to the double
+    assert output == "11\n2\n5.5\n"
+
+
+def test_arithmetic_semantics():
+    parser = make_parser()
+    # Division truncates toward zero, int = double truncates, long chains are evaluated left to right
+    assert run(parser, ARITHMETIC_PROGRAM) == "-3\n62.8\n62\n62\n"
+
+
+def test_compiled_program_is_reusable():
+    parser = make_parser()
+    program = compile_source(parser, GCD_PROGRAM.splitlines())
+    for a, b, expected in [(12, 8, 4), (100, 75, 25), (7, 3, 1)]:
+        output = io.StringIO()
+        variables = program.run(io.StringIO(f"{a} {b}"), output)
+        assert output.getvalue() == f"{expected}\n"
+        assert variables['a'] == expected
+
+
+def test_errors():
+    parser = make_parser()
+    for source, input_text, message in [
+        ("int main() { int a; b = 1 }", "", "Undeclared variable 'b'"),
+        ("int main() { int a; cin >> a; a = 1 / a }", "0", "division by zero"),
+        ("int main() { int a; cin >> a }", "", "unexpected end of input"),
+    ]:
+        try:
+            compile_source(parser, [source]).run(io.StringIO(input_text), io.StringIO())
+            assert False, f"Expected an error for {source}"
+        except Exception as e:
+            print(e)
+            assert message in str(e)
+
+
+if __name__ == "__main__":
+    test_gcd()
+    test_sum_and_types()
+    test_arithmetic_semantics()
+    test_compiled_program_is_reusable()
+    test_errors()
@@ -0,0 +1,103 @@
+import io
+
+from minilang_ast import BinaryOp, If, Number, While, build_ast
+from minilang_executor import CompiledProgram
+from minilang_lexer import MinilangLexer
+from minilang_optimizer import count_operations, optimize
+from test_minilang_pipeline import GCD_PROGRAM, make_parser
+
+
+CIRCLE_PROGRAM = """
+int main() {
+    double radius, area, perimeter;
+    int scale, unused;
+    cin >> radius;
+    area = radius * radius * M_PI;
+    perimeter = 2 * 3.14 * radius;
+    cout << area;
+    cout << perimeter;
+    scale = 4;
+    unused = scale;
+    cout << unused * 8 + scale * (2 * 3);
+    if (scale > 10) {
+        cout << 0
+    };
+    while (1 == 2) {
+        cout << 1
+    };
+    if (scale == 4) {
+        cout << scale / 3
+    };
+    cin >> scale;
+    cout << scale * 16
+}
+"""
+
+
+def run(program, input_text: str) -> str:
+    output = io.StringIO()
+    CompiledProgram(program).run(io.StringIO(input_text), output)
+    return output.getvalue()
+
+
+def test_optimized_program_behaves_the_same():
+    parser = make_parser()
+    for source, input_text in [(CIRCLE_PROGRAM, "2.5 -3"), (GCD_PROGRAM, "48 18")]:
+        program = build_ast(parser, MinilangLexer(parser.token_codes).lex(source.splitlines()))
+        optimized, report = optimize(program)
+        print(report)
+        assert run(optimized, input_text) == run(program, input_text)
+
+
+def test_optimizations_applied():
+    parser = make_parser()
+    program = build_ast(parser, MinilangLexer(parser.token_codes).lex(CIRCLE_PROGRAM.splitlines()))
+    optimized, report = optimize(program)
+
+    # 2 * 3.14 is folded, M_PI becomes a number
+    perimeter = optimized.body[2].value
+    assert perimeter.left == Number(6.28, perimeter.line)
+    assert isinstance(optimized.body[1].value.right, Number)
+
+    # scale and unused are known constants, so the whole expression folds
+    assert optimized.body[7].value == Number(4 * 8 + 4 * 6, optimized.body[7].line)
+
+    # The false if and while disappear, the true if is inlined
+    assert not any(isinstance(s, (If, While)) for s in optimized.body)
+    assert optimized.body[8].value == Number(1, optimized.body[8].line)
+
+    # scale is read, so the multiplication stays but becomes a shift
+    last = optimized.body[-1].value
+    assert isinstance(last, BinaryOp) and last.op == '<<' and last.right.value == 4
+
+    assert report.removed_statements == 5
+    assert report.strength_reduced == 1
+    assert sum(report.after.values()) < sum(report.before.values())
+    assert count_operations(optimized) == report.after
+
+
+def test_loop_variables_not_propagated():
+    parser = make_parser()
+    source = """
+int main() {
+    int i, total;
+    i = 0;
+    total = 0;
+    while (i < 5) {
+        total = total + i * 2;
+        i = i + 1
+    };
+    cout << total;
+    cout << i
+}
+"""
+    program = build_ast(parser, MinilangLexer(parser.token_codes).lex(source.splitlines()))
+    optimized, report = optimize(program)
+    assert run(optimized, "") == run(program, "") == "20\n5\n"
+    assert report.strength_reduced == 1
+
+
+if __name__ == "__main__":
+    test_optimized_program_behaves_the_same()
+    test_optimizations_applied()
+    test_loop_variables_not_propagated()
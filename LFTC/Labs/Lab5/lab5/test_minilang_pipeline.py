@@ -0,0 +1,148 @@
+import os
+import tempfile
+
+from minilang_lexer import MinilangLexer
+from minilang_parser import MinilangParser, ERROR_CONTEXT_SIZE
+from minilang_pipeline import lint_source, parse_source
+from test_minilang_parser import create_test_fip
+
+
+GCD_PROGRAM = """
+int main() {
+    int a, b, temp;
+    cin >> a;
+    cin >> b;
+    while (b != 0) {
+        temp = b;
+        b = a - (a / b) * b;
+        a = temp
+    };
+    cout << a
+}
+"""
+
+
+def make_parser() -> MinilangParser:
+    parser = MinilangParser()
+    parser.read_grammar("minilang_grammar.txt")
+    return parser
+
+
+def test_streamed_parse_matches_list_parse():
+    parser = make_parser()
+    lexer = MinilangLexer(parser.token_codes)
+
+    from_list = parser.parse_fip(create_test_fip(parser, GCD_PROGRAM), verbose=False)
+    from_stream = parser.parse_fip(lexer.lex(GCD_PROGRAM.splitlines()), verbose=False)
+
+    print(f"List parse: {len(from_list)} steps, streamed parse: {len(from_stream)} steps")
+    assert from_stream == from_list
+
+
+def test_validate_only():
+    parser = make_parser()
+    lexer = MinilangLexer(parser.token_codes)
+
+    derivation = parser.parse_fip(lexer.lex(GCD_PROGRAM.splitlines()), collect_derivation=False, verbose=False)
+    assert derivation == []
+
+
+def test_error_reported_before_input_is_exhausted():
+    parser = make_parser()
+    lexer = MinilangLexer(parser.token_codes)
+    consumed = 0
+
+    def entries():
+        nonlocal consumed
+        # Missing ')' after main, followed by an effectively endless valid body
+        lines = ["int main ( { int a;"] + ["a = a + 1;"] * 100000
+        for entry in lexer.lex(lines):
+            consumed += 1
+            yield entry
+
+    try:
+        parser.parse_fip(entries(), verbose=False)
+        assert False, "Expected a syntax error"
+    except Exception as e:
+        print(f"Reported after {consumed} entries:{e}")
+        assert "Syntax error at position 3" in str(e)
+        assert consumed <= 4 + ERROR_CONTEXT_SIZE
+
+
+def test_recovery_reports_every_error():
+    parser = make_parser()
+    lexer = MinilangLexer(parser.token_codes)
+    program = """
+int main() {
+    int a, b;
+    cin >> a;
+    a = a + * 2;
+    b = ( a + 1;
+    cout << b
+    cin >> a;
+    if (a < ) { a = 1 }
+}
+"""
+    _, diagnostics = parser.parse_with_recovery(lexer.lex(program.splitlines()))
+    for diagnostic in diagnostics:
+        print(f"line {diagnostic.line}: {diagnostic.message}")
+    assert [d.line for d in diagnostics] == [5, 6, 8, 9]
+
+    _, capped = parser.parse_with_recovery(MinilangLexer(parser.token_codes).lex(program.splitlines()),
+                                           max_errors=2)
+    assert len(capped) == 2
+
+
+def test_recovery_on_valid_program_matches_parse_fip():
+    parser = make_parser()
+    expected = parser.parse_fip(MinilangLexer(parser.token_codes).lex(GCD_PROGRAM.splitlines()), verbose=False)
+    derivation, diagnostics = parser.parse_with_recovery(
+        MinilangLexer(parser.token_codes).lex(GCD_PROGRAM.splitlines()))
+    assert diagnostics == []
+    assert derivation == expected
+
+
+def test_read_grammar_resets_follow_sets():
+    parser = make_parser()
+    _, expected = parser.parse_with_recovery(MinilangLexer(parser.token_codes).lex(["int main() { int a; a = ; }"]))
+    assert parser.follow_sets
+
+    # Read the grammar again, pruned this time; recovery must not sync on the old FOLLOW sets
+    parser.productions.clear()
+    parser.non_terminals.clear()
+    parser.terminals.clear()
+    parser.start_symbol = None
+    parser.read_grammar("minilang_grammar.txt", prune=True)
+    assert parser.follow_sets == {}
+    _, diagnostics = parser.parse_with_recovery(MinilangLexer(parser.token_codes).lex(["int main() { int a; a = ; }"]))
+    assert diagnostics == expected
+
+
+def test_semantic_diagnostics_reported():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "program.txt")
+        with open(path, 'w') as f:
+            f.write("int main() {\n int a, x;\n cin >> b;\n a = ;\n cout << a\n}\n")
+
+        parser = make_parser()
+        diagnostics, context = lint_source(path, parser)
+        assert [d.line for d in diagnostics] == [4]
+        assert context.errors == ["Undeclared variable 'b' at line 3"]
+        assert context.warnings == ["Variable 'x' declared at line 2 is never used"]
+
+        with open(path, 'w') as f:
+            f.write("int main() { int a; cin >> b; cout << a }\n")
+        parse_source(path, parser, collect_derivation=False, semantic=True)
+        assert parser.context.errors == ["Undeclared variable 'b' at line 1"]
+        parse_source(path, parser, collect_derivation=False)
+        assert parser.context.errors == []
+
+
+if __name__ == "__main__":
+    test_streamed_parse_matches_list_parse()
+    test_validate_only()
+    test_error_reported_before_input_is_exhausted()
+    test_recovery_reports_every_error()
+    test_recovery_on_valid_program_matches_parse_fip()
+    test_read_grammar_resets_follow_sets()
+    test_semantic_diagnostics_reported()
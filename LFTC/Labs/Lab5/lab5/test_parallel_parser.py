@@ -0,0 +1,49 @@
+from minilang_lexer import MinilangLexer
+from minilang_parser import MinilangParser, parse_entries
+from parallel_parser import parse_parallel, split_program
+from test_minilang_pipeline import GCD_PROGRAM, make_parser
+
+
+def lex(parser: MinilangParser, program: str):
+    return list(MinilangLexer(parser.token_codes).lex(program.splitlines()))
+
+
+def test_split_program():
+    parser = make_parser()
+    fip_entries = lex(parser, GCD_PROGRAM)
+    declarations_start, instructions_start, segments = split_program(parser, fip_entries)
+
+    assert [e.token for e in fip_entries[declarations_start:instructions_start]] == \
+        ['int', 'a', ',', 'b', ',', 'temp', ';']
+    # cin >> a ; cin >> b ; while (...) {...} ; cout << a
+    assert [fip_entries[start].token for start, _, _ in segments] == ['cin', 'cin', 'while', 'cout']
+    assert [end_token for _, _, end_token in segments] == [';', ';', ';', '}']
+
+
+def test_parallel_derivation_is_identical():
+    parser = make_parser()
+    body = ";\n".join(["a = a + (b * 3 - c) / 2", "while (a < b) { a = a + 1; cin >> c }", "cout << a"] * 200)
+    for program in (GCD_PROGRAM, "int main() {\n int a, b, c;\n" + body + "\n}", "int main() { int a; }"):
+        fip_entries = lex(parser, program)
+        expected = parse_entries(parser.parsing_table, parser.non_terminals, parser.start_symbol, fip_entries)
+        for workers in (1, 2):
+            assert parse_parallel(parser, fip_entries, workers=workers, min_tokens=0) == expected
+
+
+def test_parallel_reports_errors():
+    parser = make_parser()
+    for program in ("int main() { int a; a = 1; }", "int main() { int a; a = ; cout << a }",
+                    "int main() { int a; a = 1; int b; b = 2 }"):
+        fip_entries = lex(parser, program)
+        try:
+            parse_parallel(parser, fip_entries, workers=2, min_tokens=0)
+            assert False, f"Expected a syntax error for {program}"
+        except Exception as e:
+            print(f"{program}: {e}")
+            assert "Syntax error" in str(e)
+
+
+if __name__ == "__main__":
+    test_split_program()
+    test_parallel_derivation_is_identical()
+    test_parallel_reports_errors()
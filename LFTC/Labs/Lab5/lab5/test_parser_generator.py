@@ -0,0 +1,61 @@
+import os
+import tempfile
+
+from ll1_parser import Grammar
+from minilang_lexer import MinilangLexer
+from minilang_parser import MinilangParser
+from parser_generator import load_generated_parser
+from test_minilang_pipeline import GCD_PROGRAM
+
+
+def test_generated_parser_matches_grammar_parse():
+    grammar = Grammar()
+    grammar.read_from_file('grammar.txt')
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        generated = load_generated_parser(grammar, cache_dir=cache_dir)
+        for input_string in ["id + id * id", "( id + id ) * id", "id * id", "id", "( id )", "id + id"]:
+            assert generated.parse_tokens(input_string.split()) == grammar.parse(input_string)
+
+        for bad_input in ["id + * id", "( id", "id id"]:
+            try:
+                generated.parse_tokens(bad_input.split())
+                assert False, f"Expected a syntax error for {bad_input}"
+            except Exception as e:
+                print(f"{bad_input}: {e}")
+
+
+def test_generated_parser_matches_parse_fip():
+    parser = MinilangParser()
+    parser.read_grammar("minilang_grammar.txt")
+    fip_entries = list(MinilangLexer(parser.token_codes).lex(GCD_PROGRAM.splitlines()))
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        generated = load_generated_parser(parser, cache_dir=cache_dir)
+        assert generated.parse_fip(fip_entries) == parser.parse_fip(fip_entries, verbose=False)
+
+        # A second load comes from the cache, without building the table again
+        assert len(os.listdir(cache_dir)) == 1
+        fresh = MinilangParser()
+        fresh.productions, fresh.non_terminals, fresh.start_symbol = \
+            parser.productions, parser.non_terminals, parser.start_symbol
+        fresh.build_parsing_table = None
+        cached = load_generated_parser(fresh, cache_dir=cache_dir)
+        assert cached.parse_fip(fip_entries) == generated.parse_fip(fip_entries)
+
+
+def test_long_statement_lists_do_not_recurse():
+    parser = MinilangParser()
+    parser.read_grammar("minilang_grammar.txt")
+    program = "int main() { int a;\n" + ";\n".join(["a = a + 1"] * 20000) + "\n}"
+    fip_entries = list(MinilangLexer(parser.token_codes).lex(program.splitlines()))
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        generated = load_generated_parser(parser, cache_dir=cache_dir)
+        assert len(generated.parse_fip(fip_entries)) == len(parser.parse_fip(fip_entries, verbose=False))
+
+
+if __name__ == "__main__":
+    test_generated_parser_matches_grammar_parse()
+    test_generated_parser_matches_parse_fip()
+    test_long_statement_lists_do_not_recurse()
@@ -0,0 +1,41 @@
+from itertools import islice
+
+from minilang_lexer import MinilangLexer
+from minilang_parser import parse_entries
+from program_generator import ProgramGenerator
+from test_minilang_pipeline import make_parser
+
+
+def test_generated_programs_parse():
+    parser = make_parser()
+    for seed in range(10):
+        generator = ProgramGenerator(parser, seed=seed)
+        entries = list(generator.fip_entries(2000))
+        assert 2000 <= len(entries) < 2100
+        parse_entries(parser.parsing_table, parser.non_terminals, parser.start_symbol, entries,
+                      collect_derivation=False)
+
+        # The source text lexes back to the same FIP entries
+        assert list(MinilangLexer(parser.token_codes).lex(generator.source_lines(2000))) == entries
+
+
+def test_seed_determines_program():
+    parser = make_parser()
+    first = list(ProgramGenerator(parser, seed=7).source_lines(500))
+    assert first == list(ProgramGenerator(parser, seed=7).source_lines(500))
+    assert first != list(ProgramGenerator(parser, seed=8).source_lines(500))
+    print("".join(first))
+
+
+def test_streams_large_programs():
+    parser = make_parser()
+    # Only the first tokens of a 10^8 token program are produced
+    head = list(islice(ProgramGenerator(parser).terminals(10 ** 8), 1000))
+    assert head[:5] == ['int', 'main', '(', ')', '{']
+    assert len(head) == 1000
+
+
+if __name__ == "__main__":
+    test_generated_programs_parse()
+    test_seed_determines_program()
+    test_streams_large_programs()
@@ -0,0 +1,77 @@
+from minilang_lexer import MinilangLexer
+from minilang_parser import MinilangParser
+from semantic_analysis import ScopedSymbolTable
+from test_minilang_pipeline import GCD_PROGRAM, make_parser
+
+
+def analyze(parser: MinilangParser, source: str):
+    parser.parse_fip(MinilangLexer(parser.token_codes).lex(source.splitlines()), verbose=False, semantic=True)
+    return parser.context
+
+
+def test_scoped_symbol_table():
+    table = ScopedSymbolTable()
+    table.enter("main")
+    assert table.declare("x", "int", 1) is None
+    assert table.declare("y", "double", 1) is None
+    assert table.declare("x", "double", 2).line == 1  # Already declared in this scope
+
+    table.enter("while@3")
+    assert table.current_scope == "while@3"
+    assert table.declare("x", "double", 4) is None  # Shadows the outer x
+    assert table.lookup("x").type_name == "double" and table.lookup("x").depth == 2
+    assert [b.name for b in table.exit()] == ["x"]
+
+    assert table.lookup("x").type_name == "int"
+    assert [b.name for b in table.exit()] == ["y", "x"]
+    assert "x" not in table and table.lookup("y") is None
+    assert [b.line for b in table.declared] == [1, 1, 4]
+
+
+def test_valid_program_has_no_errors():
+    parser = make_parser()
+    context = analyze(parser, GCD_PROGRAM)
+    assert context.errors == [] and context.warnings == []
+    assert context.current_scope == "global"
+    assert [(b.name, b.type_name, b.uses) for b in context.symbol_table.declared] == \
+        [("a", "int", 5), ("b", "int", 6), ("temp", "int", 2)]
+
+
+def test_declaration_and_type_diagnostics():
+    parser = make_parser()
+    source = """
+int main() {
+    int a, b, a;
+    double x, unused;
+    cin >> a;
+    x = a / 2.0;
+    b = x * 2;
+    while (a > 0) {
+        a = a - c;
+        b = M_PI
+    };
+    cout << b + y
+}
+"""
+    context = analyze(parser, source)
+    print(context.errors, context.warnings)
+    assert context.errors == [
+        "Variable 'a' redeclared at line 3 (previous declaration at line 3)",
+        "Undeclared variable 'c' at line 9",
+        "Undeclared variable 'y' at line 12",
+    ]
+    assert context.warnings == [
+        "Narrowing conversion from double to int in assignment to 'b' at line 7",
+        "Narrowing conversion from double to int in assignment to 'b' at line 10",
+        "Variable 'unused' declared at line 4 is never used",
+    ]
+
+    # The checks are off unless asked for, and each parse starts afresh
+    parser.parse_fip(MinilangLexer(parser.token_codes).lex(source.splitlines()), verbose=False)
+    assert parser.context.errors == [] and parser.context.warnings == []
+
+
+if __name__ == "__main__":
+    test_scoped_symbol_table()
+    test_valid_program_has_no_errors()
+    test_declaration_and_type_diagnostics()
@@ -6,6 +6,7 @@
 #include <string>
 #include <random>
 #include <thread>
+#include <cstdlib>
 #ifdef _WIN32
     #include <direct.h>
     #define GetCurrentDir _getcwd
@@ -104,7 +105,12 @@ int main(int argc, char** argv) {
     int N1 = 0, N2 = 0;
 
     if (rank == 0) {
-        const int numDigits = 1000; //
+        // Digits of the generated numbers: Mpi [digits], 1000 by default
+        const int numDigits = argc > 1 ? std::atoi(argv[1]) : 1000;
+        if (numDigits < 1) {
+            std::cerr << "Usage: Mpi [digits]" << std::endl;
+            MPI_Abort(MPI_COMM_WORLD, 1);
+        }
         // const int numDigits2 = 100000; //
         generateTestFile("Numar1.txt", numDigits);
         generateTestFile("Numar2.txt", numDigits);
@@ -215,6 +221,10 @@ int main(int argc, char** argv) {
         std::cout << "Computation time: " << computationTime << " microseconds" << std::endl;
         double digitPerMicrosecond = static_cast<double>(N1) / computationTime;
         std::cout << "Performance: " << digitPerMicrosecond << " digits/microsecond" << std::endl;
+        std::cout << "Processes: " << size << std::endl;
+        // Rank 0 only distributes and collects, so the work is shared by the size - 1 worker ranks
+        std::cout << "Performance per worker rank: " << digitPerMicrosecond / (size - 1)
+                  << " digits/microsecond" << std::endl;
 
         writeResult("Numar3.txt", result);
     }
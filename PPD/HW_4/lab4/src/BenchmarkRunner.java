@@ -0,0 +1,38 @@
+import java.lang.management.ManagementFactory;
+import java.util.Locale;
+
+// Entry point for the benchmark harness: repeats one contest computation in a single JVM
+//   java BenchmarkRunner sequential <iterations>
+//   java BenchmarkRunner parallel <iterations> <p> <p_r>
+//   java BenchmarkRunner noop
+// It prints how long the JVM took to reach main and then the time of every iteration, so the
+// launch cost, the first (cold) iteration and the JIT-compiled steady state can be told apart.
+public class BenchmarkRunner {
+    public static void main(String[] args) {
+        System.out.printf("JVM uptime at main: %d ms%n", ManagementFactory.getRuntimeMXBean().getUptime());
+        if (args.length == 1 && args[0].equals("noop")) {
+            return;
+        }
+
+        boolean sequential = args.length == 2 && args[0].equals("sequential");
+        boolean parallel = args.length == 4 && args[0].equals("parallel");
+        if (!sequential && !parallel) {
+            System.err.println("Usage: java BenchmarkRunner sequential <iterations> | "
+                    + "parallel <iterations> <p> <p_r> | noop");
+            System.exit(1);
+        }
+
+        int iterations = Integer.parseInt(args[1]);
+        for (int i = 1; i <= iterations; i++) {
+            long start = System.nanoTime();
+            if (sequential) {
+                ContestSequential.run();
+            } else {
+                ContestParallel.runTest(Integer.parseInt(args[2]), Integer.parseInt(args[3]));
+            }
+            long end = System.nanoTime();
+            // Locale.ROOT keeps the decimal point a '.' whatever the system locale
+            System.out.printf(Locale.ROOT, "Iteration %d: %.3f ms%n", i, (end - start) / 1e6);
+        }
+    }
+}
@@ -341,7 +341,7 @@ public class ContestParallel {
         }
     }
 
-    private static void runTest(int totalThreads, int numReaders) {
+    static void runTest(int totalThreads, int numReaders) {
         System.out.printf("%nRunning test with p=%d, p_r=%d%n", totalThreads, numReaders);
         long startTime = System.currentTimeMillis();
 
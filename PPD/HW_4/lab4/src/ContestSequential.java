@@ -136,6 +136,14 @@ public class ContestSequential {
     public static void main(String[] args) {
         long startTime = System.currentTimeMillis();
 
+        run();
+
+        long endTime = System.currentTimeMillis();
+        System.out.printf("Sequential execution time: %d ms%n", endTime - startTime);
+    }
+
+    // Builds the ranking from all contest files and saves it; BenchmarkRunner calls this repeatedly
+    static void run() {
         OrderedList contestResults = new OrderedList();
 
         // Process each country
@@ -149,9 +157,6 @@ public class ContestSequential {
 
         // Save final results
         contestResults.saveToFile("Clasament.txt");
-
-        long endTime = System.currentTimeMillis();
-        System.out.printf("Sequential execution time: %d ms%n", endTime - startTime);
     }
 
     private static void processFile(String filename, OrderedList results) {
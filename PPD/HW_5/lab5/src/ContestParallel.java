@@ -23,7 +23,7 @@ public class ContestParallel {
         }
     }
 
-    private static void runTest(int numReaders, int numWorkers) {
+    static void runTest(int numReaders, int numWorkers) {
         System.out.printf("%nRunning test with p_r=%d, p_w=%d%n", numReaders, numWorkers);
         long startTime = System.currentTimeMillis();
 
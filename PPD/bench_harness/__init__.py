@@ -0,0 +1,39 @@
+"""Shared benchmark harness for the PPD homeworks.
+
+A homework describes its benchmarks in a JSON config (see HW_4/lab4/benchmark.json): setup
+commands, and per benchmark a command template, an output parser and a parameter matrix.
+Run one from the PPD directory with
+
+    python -m bench_harness HW_4/lab4/benchmark.json
+
+The optional "isolation" section of a config (or --cpus, --max-load, --on-noise and
+--interleave) pins the runs to a core set and checks the load average and frequency
+governor before each run; see Isolation. Its "adaptive" section (or --target-ci and
+--budget) runs each configuration until the bootstrap CI of its median is narrow enough
+instead of a fixed number of times; see AdaptiveRuns. Warm-up runs are detected and left
+out of the summaries, and MAD outliers are flagged.
+
+--save-baseline NAME stores the results under baselines/ next to the config, and
+--compare NAME tests every configuration against that baseline (Mann-Whitney U) and exits
+with status 2 when one got slower by more than --threshold.
+
+Besides what a program prints, every run's CPU time, peak RSS, context switches and page
+faults are recorded (RUSAGE_METRICS), reaped with os.wait4 where the platform has it.
+
+The "builds" section compiles with javac or CMake before the setup and skips a build while
+the hash of its sources and flags matches the last one (--rebuild forces it); CMake builds
+can have Release and Debug variants side by side. The results record each build's hash.
+
+python -m bench_harness.scaling turns a thread or process sweep in a results file into
+speedup, efficiency and Karp-Flatt tables with Amdahl and Gustafson fits; see scaling.py.
+"""
+from .baseline import BaselineStore, Comparison, compare, format_comparison
+from .build import BuildSpec, build, content_hash
+from .environment import Isolation, describe_environment, parse_cpu_list
+from .matrix import ParameterMatrix, expand_command
+from .parsers import IterationParser, JsonLinesParser, Record, RegexParser, parser_from_spec
+from .process import RUSAGE_METRICS, ProcessResult, run_process
+from .results import SCHEMA_VERSION, Result, ResultSet
+from .runner import (AdaptiveRuns, BenchmarkSpec, HarnessConfig, load_config, plan, run_benchmark, run_builds,
+                     run_config, run_setup)
+from .stats import bootstrap_ci, mad_outliers, mann_whitney_u, percentile, relative_width, summarize, warmup_count
@@ -0,0 +1,103 @@
+import argparse
+import os
+
+from .baseline import BaselineStore, compare, format_comparison
+from .environment import parse_cpu_list
+from .results import ResultSet
+from .runner import AdaptiveRuns, load_config, plan, run_config
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='python -m bench_harness',
+                                     description='Run the benchmarks described by a homework config')
+    parser.add_argument('config', help='Path to the JSON config, e.g. HW_4/lab4/benchmark.json')
+    parser.add_argument('-n', '--runs', type=int, default=None,
+                        help='Runs per configuration, turning adaptive runs off (default: the config\'s runs)')
+    parser.add_argument('--target-ci', type=float, default=None,
+                        help='Run each configuration until the 95%% CI of its medians is this narrow, e.g. 0.05 '
+                             '(turns adaptive runs on; -n turns them off)')
+    parser.add_argument('--budget', type=float, default=None,
+                        help='With adaptive runs, the most seconds to spend on one configuration')
+    parser.add_argument('-b', '--benchmark', action='append', default=None,
+                        help='Only run this benchmark (may be repeated)')
+    parser.add_argument('-o', '--output', default=None,
+                        help='Results file (default: benchmark_results.json next to the config)')
+    parser.add_argument('--skip-setup', action='store_true', help='Do not run the builds and setup commands')
+    parser.add_argument('--rebuild', action='store_true', help='Run every build even if its sources are unchanged')
+    parser.add_argument('--cpus', default=None, help='Pin every run to these CPUs, e.g. 2-3 (overrides the config)')
+    parser.add_argument('--max-load', type=float, default=None,
+                        help='Treat runs as noisy when the 1-minute load average is above this')
+    parser.add_argument('--on-noise', choices=['flag', 'refuse'], default=None,
+                        help='Run noisy runs and flag their samples, or retry and then skip them')
+    parser.add_argument('--interleave', action='store_true',
+                        help='Run the configurations round-robin instead of one after another')
+    parser.add_argument('--save-baseline', metavar='NAME', default=None,
+                        help='Also store the results as the named baseline (in baselines/ next to the config)')
+    parser.add_argument('--compare', metavar='NAME', default=None,
+                        help='Compare the results with the named baseline; exit with 2 if any configuration regressed')
+    parser.add_argument('--threshold', type=float, default=0.05,
+                        help='Slowdown of the median that counts as a regression (default: 0.05, i.e. 5%%)')
+    parser.add_argument('--alpha', type=float, default=0.05,
+                        help='Significance level of the Mann-Whitney U test (default: 0.05)')
+    parser.add_argument('--results', metavar='PATH', default=None,
+                        help='Use this results file instead of running the benchmarks '
+                             '(with --compare or --save-baseline)')
+    parser.add_argument('--dry-run', action='store_true', help='Print the commands without running them')
+
+    args = parser.parse_args()
+
+    try:
+        config = load_config(args.config)
+        isolation = config.isolation
+        if args.cpus is not None:
+            isolation.cpus = parse_cpu_list(args.cpus)
+        if args.max_load is not None:
+            isolation.max_load = args.max_load
+        if args.on_noise is not None:
+            isolation.on_noise = args.on_noise
+        isolation.interleave = isolation.interleave or args.interleave
+        if args.target_ci is not None or args.budget is not None:
+            config.adaptive = config.adaptive or AdaptiveRuns()
+            if args.target_ci is not None:
+                config.adaptive.target_width = args.target_ci
+            if args.budget is not None:
+                config.adaptive.budget = args.budget
+        if args.dry_run:
+            for spec in config.builds:
+                print(f"[build] {spec.name}: {spec.kind} {' '.join(spec.sources)} ({', '.join(spec.variants())})")
+            for command in config.setup:
+                print(f"[setup] {' '.join(command)}")
+            for name, cwd, command in plan(config, args.benchmark):
+                print(f"[{name}] (in {os.path.relpath(cwd)}) {' '.join(command)}")
+            return 0
+        store = BaselineStore(os.path.join(config.directory, 'baselines'))
+        baseline = store.load(args.compare) if args.compare else None
+        if args.results:
+            results = ResultSet.load(args.results)
+        else:
+            results = run_config(config, args.runs, args.benchmark, setup=not args.skip_setup, rebuild=args.rebuild)
+    except Exception as e:
+        print(f"Error running benchmark: {str(e)}")
+        return 1
+
+    print("\nBenchmark Results:")
+    print(results.format_table())
+    if not args.results:
+        output = args.output or os.path.join(config.directory, 'benchmark_results.json')
+        results.save(output)
+        print(f"\nDetailed results saved to {output}")
+    if args.save_baseline:
+        print(f"Baseline '{args.save_baseline}' saved to {store.save(args.save_baseline, results)}")
+
+    if baseline is not None:
+        higher_is_better = {metric for benchmark in config.benchmarks for metric in benchmark.higher_is_better}
+        comparisons = compare(baseline, results, args.threshold, args.alpha, higher_is_better)
+        print(f"\nComparison with baseline '{args.compare}' ({baseline.created}):")
+        print(format_comparison(comparisons))
+        if any(comparison.verdict == 'regressed' for comparison in comparisons):
+            return 2
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,125 @@
+import os
+import re
+import statistics
+from dataclasses import dataclass
+from typing import Collection, List, Optional
+
+from .results import Result, ResultSet
+from .process import RUSAGE_METRICS
+from .stats import mann_whitney_u
+
+
+class BaselineStore:
+    """Named result sets kept in a directory (baselines/ next to the config), one JSON file each."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def path(self, name: str) -> str:
+        if not re.fullmatch(r'[\w.-]+', name):
+            raise ValueError(f"Invalid baseline name '{name}': use letters, digits, '.', '-' and '_'")
+        return os.path.join(self.directory, name + '.json')
+
+    def names(self) -> List[str]:
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(file[:-5] for file in os.listdir(self.directory) if file.endswith('.json'))
+
+    def save(self, name: str, result_set: ResultSet) -> str:
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path(name)
+        result_set.save(path)
+        return path
+
+    def load(self, name: str) -> ResultSet:
+        path = self.path(name)
+        if not os.path.exists(path):
+            known = ", ".join(self.names()) or "none"
+            raise FileNotFoundError(f"No baseline named '{name}' in {self.directory} (known: {known})")
+        return ResultSet.load(path)
+
+
+@dataclass
+class Comparison:
+    """How one configuration's metric moved between the baseline and the current results."""
+    benchmark: str
+    configuration: str
+    metric: str
+    baseline: Optional[float]  # Medians; None when the configuration is missing on that side
+    current: Optional[float]
+    p_value: float = 1.0
+    verdict: str = 'unchanged'  # 'regressed', 'improved', 'unchanged', 'info', 'new' or 'missing'
+    higher_is_better: bool = False
+
+    @property
+    def speedup(self) -> Optional[float]:
+        """How many times better the current median is than the baseline's; below 1 is a slowdown."""
+        if not self.baseline or not self.current:
+            return None
+        return self.current / self.baseline if self.higher_is_better else self.baseline / self.current
+
+
+def _matching(results: ResultSet, result: Result) -> Optional[Result]:
+    for candidate in results.results:
+        if candidate.benchmark == result.benchmark and candidate.metric == result.metric \
+                and candidate.parameters == result.parameters:
+            return candidate
+    return None
+
+
+def compare(baseline: ResultSet, current: ResultSet, threshold: float = 0.05, alpha: float = 0.05,
+            higher_is_better: Collection[str] = (),
+            informational: Collection[str] = RUSAGE_METRICS) -> List[Comparison]:
+    """Compare every configuration of current with the same one in baseline.
+
+    A configuration regresses when the Mann-Whitney U test finds its samples differ (p < alpha)
+    and its median got worse by more than threshold (0.05 is 5% slower); it improves under
+    the same conditions in the other direction. Metrics are lower-is-better (times) unless
+    named in higher_is_better. Metrics in informational (by default the resource usage the
+    harness measures) are shown with the verdict 'info' and never count as regressions.
+    Warm-up samples are left out on both sides.
+    """
+    comparisons = []
+    for result in current.results:
+        old = _matching(baseline, result)
+        if old is None:
+            comparisons.append(Comparison(result.benchmark, result.label(), result.metric,
+                                          None, result.summary['median'], verdict='new'))
+            continue
+        before, after = old.steady(), result.steady()
+        comparison = Comparison(result.benchmark, result.label(), result.metric,
+                                statistics.median(before) if before else None,
+                                statistics.median(after) if after else None,
+                                higher_is_better=result.metric in higher_is_better)
+        if before and after:
+            _, comparison.p_value = mann_whitney_u(before, after)
+        if result.metric in informational:
+            comparison.verdict = 'info'
+        elif comparison.baseline and comparison.current is not None and comparison.p_value < alpha:
+            change = (comparison.current - comparison.baseline) / abs(comparison.baseline)
+            if comparison.higher_is_better:
+                change = -change
+            if change > threshold:
+                comparison.verdict = 'regressed'
+            elif change < -threshold:
+                comparison.verdict = 'improved'
+        comparisons.append(comparison)
+    for old in baseline.results:
+        if _matching(current, old) is None:
+            comparisons.append(Comparison(old.benchmark, old.label(), old.metric,
+                                          old.summary['median'], None, verdict='missing'))
+    return comparisons
+
+
+def format_comparison(comparisons: List[Comparison]) -> str:
+    rows = [f"{'Benchmark':16} {'Configuration':24} {'Metric':20} {'Baseline':>12} {'Current':>12} "
+            f"{'Speedup':>8} {'p':>7}  Verdict"]
+    for c in comparisons:
+        baseline = f"{c.baseline:12.3f}" if c.baseline is not None else f"{'-':>12}"
+        current = f"{c.current:12.3f}" if c.current is not None else f"{'-':>12}"
+        speedup = f"{c.speedup:7.2f}x" if c.speedup is not None else f"{'-':>8}"
+        rows.append(f"{c.benchmark:16} {c.configuration:24} {c.metric:20} {baseline} {current} "
+                    f"{speedup} {c.p_value:7.3f}  {c.verdict}")
+    regressed = sum(c.verdict == 'regressed' for c in comparisons)
+    rows.append(f"{regressed} of {len(comparisons)} configurations regressed")
+    return "\n".join(rows)
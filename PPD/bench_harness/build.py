@@ -0,0 +1,124 @@
+import glob
+import hashlib
+import json
+import os
+import subprocess
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+# Name of the file recording what a build directory was last built from
+STAMP = '.bench_build.json'
+
+
+@dataclass
+class BuildSpec:
+    """A compile step that is skipped while its sources and flags are unchanged.
+
+    kind 'javac' compiles the sources (globs relative to the config's cwd) with javac; kind
+    'cmake' configures and builds source_dir once per entry of build_types, each in its own
+    source_dir/cmake-build-bench-<type> directory, so Release and Debug binaries sit side by side.
+    The sources and flags are hashed together with the commands; when the hash matches the
+    stamp left by the last successful build and its outputs exist, nothing is run.
+    """
+    name: str
+    kind: str
+    sources: List[str]
+    flags: List[str] = field(default_factory=list)
+    source_dir: str = "."
+    build_types: List[str] = field(default_factory=lambda: ["Release"])
+
+    def __post_init__(self):
+        if self.kind not in ('javac', 'cmake'):
+            raise ValueError(f"Unknown build kind '{self.kind}' (expected 'javac' or 'cmake')")
+
+    def variants(self) -> List[str]:
+        return [build_type.lower() for build_type in self.build_types] if self.kind == 'cmake' else ['default']
+
+    def build_dir(self, variant: str) -> str:
+        return os.path.join(self.source_dir, f"cmake-build-bench-{variant}") if self.kind == 'cmake' else "."
+
+    def commands(self, variant: str, files: List[str]) -> List[List[str]]:
+        if self.kind == 'javac':
+            return [['javac'] + self.flags + files]
+        build_type = next(t for t in self.build_types if t.lower() == variant)
+        build_dir = self.build_dir(variant)
+        return [['cmake', '-S', self.source_dir, '-B', build_dir, f'-DCMAKE_BUILD_TYPE={build_type}'] + self.flags,
+                ['cmake', '--build', build_dir, '--config', build_type]]
+
+    def stamp_path(self, cwd: str, variant: str) -> str:
+        if self.kind == 'cmake':
+            return os.path.join(cwd, self.build_dir(variant), STAMP)
+        return os.path.join(cwd, f".bench_build_{self.name}.json")
+
+    def outputs_exist(self, cwd: str, files: List[str]) -> bool:
+        if self.kind == 'cmake' or '-d' in self.flags:
+            return True  # The stamp lives in the build directory, so it is gone with it
+        return all(os.path.exists(os.path.join(cwd, file[:-len('.java')] + '.class')) for file in files)
+
+
+def source_files(spec: BuildSpec, cwd: str) -> List[str]:
+    files = set()
+    for pattern in spec.sources:
+        matches = glob.glob(os.path.join(cwd, pattern))
+        if not matches:
+            raise FileNotFoundError(f"No files match {pattern} in {cwd} (build '{spec.name}')")
+        files.update(os.path.relpath(match, cwd) for match in matches)
+    return sorted(files)
+
+
+def content_hash(spec: BuildSpec, variant: str, cwd: str, files: List[str]) -> str:
+    """SHA-256 of the build commands (which hold the flags and build type) and every source file."""
+    digest = hashlib.sha256(json.dumps(spec.commands(variant, files)).encode())
+    for file in files:
+        digest.update(file.replace(os.sep, '/').encode() + b'\0')
+        with open(os.path.join(cwd, file), 'rb') as f:
+            digest.update(hashlib.sha256(f.read()).digest())
+    return digest.hexdigest()
+
+
+def _read_stamp(path: str) -> Optional[Dict]:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def build(spec: BuildSpec, cwd: str, force: bool = False,
+          log: Callable[[str], None] = print) -> Dict[str, Dict[str, object]]:
+    """Bring every variant of spec up to date; returns what was measured, per variant."""
+    files = source_files(spec, cwd)
+    built = {}
+    for variant in spec.variants():
+        digest = content_hash(spec, variant, cwd, files)
+        stamp_path = spec.stamp_path(cwd, variant)
+        stamp = _read_stamp(stamp_path)
+        cached = not force and stamp is not None and stamp.get('hash') == digest and spec.outputs_exist(cwd, files)
+        if cached:
+            log(f"Build {spec.name} ({variant}): up to date")
+        else:
+            for command in spec.commands(variant, files):
+                log(f"Build {spec.name} ({variant}): {' '.join(command)}")
+                completed = subprocess.run(command, cwd=cwd, capture_output=True, text=True)
+                if completed.returncode != 0:
+                    raise RuntimeError(f"Build command failed with code {completed.returncode}: {' '.join(command)}\n"
+                                       f"{completed.stdout}{completed.stderr}")
+            stamp = {'hash': digest, 'built': datetime.now().isoformat(timespec='seconds'),
+                     'commands': spec.commands(variant, files)}
+            with open(stamp_path, 'w') as f:
+                json.dump(stamp, f, indent=4)
+        built[variant] = {'kind': spec.kind, 'hash': digest, 'flags': spec.flags, 'built': stamp['built'],
+                          'cached': cached, 'directory': spec.build_dir(variant)}
+    return built
+
+
+def recorded(spec: BuildSpec, cwd: str) -> Dict[str, Dict[str, object]]:
+    """What the stamps say about each variant's last build, without building anything."""
+    recorded_builds = {}
+    for variant in spec.variants():
+        stamp = _read_stamp(spec.stamp_path(cwd, variant))
+        if stamp is not None:
+            recorded_builds[variant] = {'kind': spec.kind, 'hash': stamp['hash'], 'flags': spec.flags,
+                                        'built': stamp['built'], 'cached': True, 'directory': spec.build_dir(variant)}
+    return recorded_builds
@@ -0,0 +1,162 @@
+import glob
+import os
+import platform
+import shutil
+import sys
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+def parse_cpu_list(text: str) -> List[int]:
+    """Parse a CPU list such as "2-3,6" (the format of taskset -c and /sys) into CPU numbers."""
+    cpus = []
+    for part in text.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        if '-' in part:
+            first, last = part.split('-')
+            cpus.extend(range(int(first), int(last) + 1))
+        else:
+            cpus.append(int(part))
+    return sorted(set(cpus))
+
+
+def _read(path: str) -> Optional[str]:
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def read_governors(cpus: Optional[List[int]] = None) -> Dict[int, str]:
+    """Frequency governor of each CPU (all CPUs by default); empty where cpufreq is not exposed."""
+    governors = {}
+    for path in glob.glob('/sys/devices/system/cpu/cpu[0-9]*/cpufreq/scaling_governor'):
+        cpu = int(path.split('/')[5][3:])
+        if cpus is None or cpu in cpus:
+            governor = _read(path)
+            if governor:
+                governors[cpu] = governor
+    return dict(sorted(governors.items()))
+
+
+def load_average() -> Optional[Tuple[float, float, float]]:
+    try:
+        return os.getloadavg()
+    except (AttributeError, OSError):
+        return None  # Not available on Windows
+
+
+def read_cpuinfo() -> Dict[str, object]:
+    """The fields of the first processor in /proc/cpuinfo, plus every CPU's current MHz."""
+    text = _read('/proc/cpuinfo')
+    if text is None:
+        return {'processor': platform.processor()}
+    blocks = [block for block in text.split('\n\n') if block.strip()]
+    info: Dict[str, object] = {}
+    for line in blocks[0].splitlines():
+        if ':' in line:
+            key, value = line.split(':', 1)
+            info[key.strip()] = value.strip()
+    info.pop('processor', None)
+    info['processors'] = len(blocks)
+    info['cpu MHz (all)'] = [float(line.split(':')[1]) for line in text.splitlines() if line.startswith('cpu MHz')]
+    return info
+
+
+def describe_environment(cpus: Optional[List[int]] = None) -> Dict[str, object]:
+    """Machine, kernel and CPU state recorded alongside the results."""
+    uname = platform.uname()
+    environment = {
+        'hostname': uname.node,
+        'system': uname.system,
+        'kernel_release': uname.release,
+        'kernel_version': uname.version,
+        'machine': uname.machine,
+        'python': sys.version.split()[0],
+        'kernel_cmdline': _read('/proc/cmdline'),
+        'isolated_cpus': _read('/sys/devices/system/cpu/isolated'),
+        'smt_active': _read('/sys/devices/system/cpu/smt/active'),
+        'turbo_disabled': _read('/sys/devices/system/cpu/intel_pstate/no_turbo'),
+        'governors': read_governors(),
+        'load_average': load_average(),
+        'pinned_cpus': cpus,
+        'cpuinfo': read_cpuinfo(),
+    }
+    if hasattr(os, 'sched_getaffinity'):
+        environment['available_cpus'] = sorted(os.sched_getaffinity(0))
+    return environment
+
+
+@dataclass
+class Isolation:
+    """How benchmark runs are isolated and which environment checks precede each run.
+
+    cpus pins every run to those CPUs (with sched_setaffinity in the child, or taskset where
+    that is missing). Before a run the 1-minute load average is compared with max_load and the
+    governors of the pinned CPUs with governor; on_noise='flag' runs anyway and marks the
+    sample as noisy, on_noise='refuse' waits retry_delay seconds and checks again, up to
+    retries times, then skips the run. interleave runs the configurations round-robin, one run
+    each per round, so slow drift spreads over all of them instead of biasing the last ones.
+    """
+    cpus: Optional[List[int]] = None
+    max_load: Optional[float] = None
+    governor: Optional[str] = None
+    on_noise: str = 'flag'
+    retries: int = 3
+    retry_delay: float = 5.0
+    interleave: bool = False
+
+    def __post_init__(self):
+        if isinstance(self.cpus, str):
+            self.cpus = parse_cpu_list(self.cpus)
+        if self.on_noise not in ('flag', 'refuse'):
+            raise ValueError(f"on_noise must be 'flag' or 'refuse', not '{self.on_noise}'")
+
+    @classmethod
+    def from_spec(cls, spec: Optional[Dict]) -> 'Isolation':
+        return cls(**(spec or {}))
+
+    def problems(self) -> List[str]:
+        """Reasons the machine is currently too noisy to measure on; empty when it is fine."""
+        problems = []
+        if self.max_load is not None:
+            load = load_average()
+            if load is not None and load[0] > self.max_load:
+                problems.append(f"load average {load[0]:.2f} above {self.max_load}")
+        if self.governor is not None:
+            for cpu, governor in read_governors(self.cpus).items():
+                if governor != self.governor:
+                    problems.append(f"cpu{cpu} governor is '{governor}', not '{self.governor}'")
+        return problems
+
+    def wait_until_quiet(self, sleep: Callable[[float], None], log: Callable[[str], None]) -> List[str]:
+        """Check the environment; with on_noise='refuse' retry until it is quiet or retries run out.
+
+        Returns the remaining problems, so an empty list means the run can go ahead unflagged.
+        """
+        problems = self.problems()
+        attempt = 0
+        while problems and self.on_noise == 'refuse' and attempt < self.retries:
+            attempt += 1
+            log(f"Noisy environment ({'; '.join(problems)}), retrying in {self.retry_delay} s")
+            sleep(self.retry_delay)
+            problems = self.problems()
+        return problems
+
+    def prepare(self, command: List[str]) -> Tuple[List[str], Optional[Callable[[], None]]]:
+        """The command and preexec_fn that run it pinned to cpus."""
+        if self.cpus is None:
+            return command, None
+        cpus = set(self.cpus)
+        if hasattr(os, 'sched_setaffinity'):
+            unavailable = cpus - os.sched_getaffinity(0)
+            if unavailable:
+                raise ValueError(f"Cannot pin to CPUs {sorted(unavailable)}: only {sorted(os.sched_getaffinity(0))} "
+                                 f"are available")
+            return command, lambda: os.sched_setaffinity(0, cpus)
+        if shutil.which('taskset'):
+            return ['taskset', '-c', ','.join(map(str, sorted(cpus)))] + command, None
+        raise RuntimeError("CPU pinning is not supported on this platform (no sched_setaffinity or taskset)")
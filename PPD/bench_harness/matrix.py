@@ -0,0 +1,63 @@
+import itertools
+from typing import Dict, Iterator, List, Sequence
+
+
+class ParameterMatrix:
+    """Cartesian product of parameter values, minus excluded combinations.
+
+    parameters maps each name to its list of values, in the order the points are generated;
+    an exclude entry removes every point that agrees with all of its values. Each zip group
+    names parameters whose lists have the same length and advance together instead of being
+    crossed, e.g. processes [2, 4, 8] with digits [1000, 2000, 4000] for weak scaling.
+    """
+
+    def __init__(self, parameters: Dict[str, Sequence] = None, exclude: List[Dict] = None,
+                 zip_groups: List[List[str]] = None):
+        self.parameters = {name: list(values) for name, values in (parameters or {}).items()}
+        self.exclude = list(exclude or [])
+        self.zip = [list(group) for group in (zip_groups or [])]
+        for group in self.zip:
+            unknown = [name for name in group if name not in self.parameters]
+            if unknown:
+                raise ValueError(f"Zipped parameters {unknown} are not in the matrix")
+            if len({len(self.parameters[name]) for name in group}) > 1:
+                raise ValueError(f"Zipped parameters {group} need value lists of the same length")
+
+    def _excluded(self, point: Dict) -> bool:
+        return any(all(point.get(name) == value for name, value in rule.items()) for rule in self.exclude)
+
+    def __iter__(self) -> Iterator[Dict]:
+        # Axes of the product: every zip group is one axis of tuples, every other parameter its own
+        axes = []
+        zipped = {name for group in self.zip for name in group}
+        for name in self.parameters:
+            group = next((group for group in self.zip if group[0] == name), None)
+            if group is not None:
+                axes.append((group, list(zip(*(self.parameters[member] for member in group)))))
+            elif name not in zipped:
+                axes.append(([name], [(value,) for value in self.parameters[name]]))
+        for combination in itertools.product(*(values for _, values in axes)):
+            values = {name: value for (names, _), chosen in zip(axes, combination)
+                      for name, value in zip(names, chosen)}
+            point = {name: values[name] for name in self.parameters}
+            if not self._excluded(point):
+                yield point
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+
+def expand_command(template: List[str], point: Dict) -> List[str]:
+    """Substitute {name} placeholders in a command.
+
+    An argument that is exactly "{name}" with a list value is replaced by the list's items
+    (none for an empty list), so a parameter can stand for several arguments, e.g. JVM flags.
+    """
+    command = []
+    for argument in template:
+        name = argument[1:-1] if argument.startswith('{') and argument.endswith('}') else None
+        if name in point and isinstance(point[name], list):
+            command.extend(str(item) for item in point[name])
+        else:
+            command.append(argument.format(**point))
+    return command
@@ -0,0 +1,151 @@
+import json
+import re
+import statistics
+from dataclasses import dataclass, field
+from typing import Dict, List, Union
+
+from .stats import warmup_count
+
+Value = Union[int, float, str]
+
+
+@dataclass
+class Record:
+    """One measurement parsed from program output: labels say which configuration it belongs to."""
+    labels: Dict[str, Value] = field(default_factory=dict)
+    metrics: Dict[str, float] = field(default_factory=dict)
+
+
+def to_value(text: str) -> Value:
+    """Convert a captured string to an int or float when it looks like one."""
+    for convert in (int, float):
+        try:
+            return convert(text)
+        except ValueError:
+            pass
+    return text
+
+
+class RegexParser:
+    """Extracts records from program output with regular expressions.
+
+    In metrics mode every pattern in metrics (and labels) is searched once and its first group
+    is the value, giving one record per run. In record mode the record pattern is matched
+    repeatedly, giving one record per match: its named groups listed in labels are labels, the
+    other named groups are metrics. Record patterns are compiled with re.DOTALL, so .*? can skip
+    the lines between a configuration header and its timing line.
+    """
+
+    def __init__(self, metrics: Dict[str, str] = None, labels: Union[Dict[str, str], List[str]] = None,
+                 record: str = None):
+        if (metrics is None) == (record is None):
+            raise ValueError("A regex parser needs either 'metrics' or 'record'")
+        self.record = re.compile(record, re.DOTALL) if record is not None else None
+        if self.record is not None:
+            self.labels = list(labels or [])
+            unknown = set(self.labels) - set(self.record.groupindex)
+            if unknown:
+                raise ValueError(f"Labels {sorted(unknown)} are not named groups of the record pattern")
+            self.metrics = {}
+        else:
+            self.metrics = {name: re.compile(pattern) for name, pattern in metrics.items()}
+            self.labels = {name: re.compile(pattern) for name, pattern in (labels or {}).items()}
+
+    def parse(self, output: str) -> List[Record]:
+        if self.record is not None:
+            records = []
+            for match in self.record.finditer(output):
+                groups = match.groupdict()
+                records.append(Record(
+                    {name: to_value(groups[name]) for name in self.labels},
+                    {name: float(value) for name, value in groups.items() if name not in self.labels},
+                ))
+            return records
+
+        record = Record()
+        for name, pattern in self.metrics.items():
+            match = pattern.search(output)
+            if match is None:
+                raise ValueError(f"Metric '{name}' not found in output (pattern {pattern.pattern!r})")
+            record.metrics[name] = float(match.group(1))
+        for name, pattern in self.labels.items():
+            match = pattern.search(output)
+            if match is not None:
+                record.labels[name] = to_value(match.group(1))
+        return [record]
+
+
+class JsonLinesParser:
+    """One record per output line that holds a JSON object; other lines are ignored.
+
+    Keys listed in labels are labels, every other numeric value is a metric.
+    """
+
+    def __init__(self, labels: List[str] = None):
+        self.labels = list(labels or [])
+
+    def parse(self, output: str) -> List[Record]:
+        records = []
+        for line in output.splitlines():
+            line = line.strip()
+            if not line.startswith('{'):
+                continue
+            try:
+                data = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            records.append(Record(
+                {name: data[name] for name in self.labels if name in data},
+                {name: float(value) for name, value in data.items()
+                 if name not in self.labels and isinstance(value, (int, float)) and not isinstance(value, bool)},
+            ))
+        return records
+
+
+class IterationParser:
+    """One record per run from a program that repeats its computation and times every iteration.
+
+    pattern is searched repeatedly and its first group is one iteration's time. The record
+    holds <metric>_first, the first (cold) iteration, and <metric>_steady, the median of the
+    iterations after warm-up: the first one, and any after it that are outliers against the
+    rest. Captures of the optional startup pattern become startup_ms, and labels work as in
+    metrics mode of RegexParser.
+    """
+
+    def __init__(self, pattern: str, metric: str = 'time_ms', startup: str = None, labels: Dict[str, str] = None):
+        self.pattern = re.compile(pattern)
+        self.metric = metric
+        self.startup = re.compile(startup) if startup is not None else None
+        self.labels = {name: re.compile(label) for name, label in (labels or {}).items()}
+
+    def parse(self, output: str) -> List[Record]:
+        times = [float(match.group(1)) for match in self.pattern.finditer(output)]
+        if not times:
+            return []
+        record = Record()
+        if self.startup is not None:
+            match = self.startup.search(output)
+            if match is None:
+                raise ValueError(f"Startup time not found in output (pattern {self.startup.pattern!r})")
+            record.metrics['startup_ms'] = float(match.group(1))
+        warmup = min(1, len(times) - 1)
+        warmup += warmup_count(times[warmup:])
+        record.metrics[f"{self.metric}_first"] = times[0]
+        record.metrics[f"{self.metric}_steady"] = statistics.median(times[warmup:])
+        for name, pattern in self.labels.items():
+            match = pattern.search(output)
+            if match is not None:
+                record.labels[name] = to_value(match.group(1))
+        return [record]
+
+
+PARSERS = {'regex': RegexParser, 'jsonl': JsonLinesParser, 'iterations': IterationParser}
+
+
+def parser_from_spec(spec: Dict) -> Union[RegexParser, JsonLinesParser, IterationParser]:
+    """Build a parser from its config entry, e.g. {"type": "regex", "metrics": {...}}."""
+    spec = dict(spec)
+    kind = spec.pop('type', 'regex')
+    if kind not in PARSERS:
+        raise ValueError(f"Unknown parser type '{kind}' (expected one of {sorted(PARSERS)})")
+    return PARSERS[kind](**spec)
@@ -0,0 +1,80 @@
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+# Metrics measured by the harness for every run, next to the ones the program prints
+RUSAGE_METRICS = ('wall_s', 'cpu_user_s', 'cpu_system_s', 'cpu_utilization', 'max_rss_kb',
+                  'voluntary_switches', 'involuntary_switches', 'minor_faults', 'major_faults')
+
+
+@dataclass
+class ProcessResult:
+    returncode: int
+    stdout: str
+    stderr: str
+    usage: Dict[str, float] = field(default_factory=dict)  # RUSAGE_METRICS; empty where os.wait4 is missing
+
+
+def _usage(rusage, wall: float) -> Dict[str, float]:
+    # ru_maxrss is in kilobytes on Linux but in bytes on macOS
+    max_rss_kb = rusage.ru_maxrss / 1024 if sys.platform == 'darwin' else rusage.ru_maxrss
+    cpu = rusage.ru_utime + rusage.ru_stime
+    return {
+        'wall_s': wall,
+        'cpu_user_s': rusage.ru_utime,
+        'cpu_system_s': rusage.ru_stime,
+        'cpu_utilization': cpu / wall if wall else 0.0,  # Busy cores on average, e.g. 3.6 of 4
+        'max_rss_kb': max_rss_kb,
+        'voluntary_switches': rusage.ru_nvcsw,
+        'involuntary_switches': rusage.ru_nivcsw,
+        'minor_faults': rusage.ru_minflt,
+        'major_faults': rusage.ru_majflt,
+    }
+
+
+def run_process(command: List[str], cwd: str, env: Optional[Dict[str, str]] = None,
+                timeout: Optional[float] = None,
+                preexec_fn: Optional[Callable[[], None]] = None) -> ProcessResult:
+    """Run command to completion and reap it with os.wait4 to get its resource usage.
+
+    The usage covers the child and every descendant it waited for, so the ranks started by
+    mpiexec and all JVM threads are included; max_rss_kb is the largest single process.
+    Output goes to temporary files rather than pipes, so nothing has to be read while
+    waiting. Raises subprocess.TimeoutExpired like subprocess.run.
+    """
+    if not hasattr(os, 'wait4'):  # Windows
+        completed = subprocess.run(command, cwd=cwd, env=env, capture_output=True, text=True, timeout=timeout)
+        return ProcessResult(completed.returncode, completed.stdout, completed.stderr)
+
+    with tempfile.TemporaryFile() as stdout, tempfile.TemporaryFile() as stderr:
+        start = time.perf_counter()
+        process = subprocess.Popen(command, cwd=cwd, env=env, stdout=stdout, stderr=stderr,
+                                   preexec_fn=preexec_fn)
+        timed_out = threading.Event()
+
+        def kill():
+            timed_out.set()
+            process.kill()
+
+        timer = threading.Timer(timeout, kill) if timeout is not None else None
+        if timer:
+            timer.start()
+        try:
+            _, status, rusage = os.wait4(process.pid, 0)
+        finally:
+            if timer:
+                timer.cancel()
+        wall = time.perf_counter() - start
+        process.returncode = os.waitstatus_to_exitcode(status)  # Already reaped: keep Popen from waiting again
+        if timed_out.is_set():
+            raise subprocess.TimeoutExpired(command, timeout)
+
+        stdout.seek(0)
+        stderr.seek(0)
+        return ProcessResult(process.returncode, stdout.read().decode(errors='replace'),
+                             stderr.read().decode(errors='replace'), _usage(rusage, wall))
@@ -0,0 +1,93 @@
+import json
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from .stats import mad_outliers, summarize, warmup_count
+
+# Bumped whenever the layout of the saved JSON changes
+SCHEMA_VERSION = 4
+
+
+@dataclass
+class Result:
+    """All samples of one metric for one configuration of a benchmark."""
+    benchmark: str
+    parameters: Dict[str, object]  # Matrix point plus labels parsed from the output
+    metric: str
+    samples: List[float] = field(default_factory=list)
+    summary: Dict[str, float] = field(default_factory=dict)
+    noisy: List[int] = field(default_factory=list)  # Indices of samples taken while the machine was noisy
+    warmup: Optional[int] = None  # Leading samples left out of the summary; detected when None
+    outliers: List[int] = field(default_factory=list)  # Indices of MAD outliers among the other samples
+
+    def __post_init__(self):
+        if self.warmup is None:
+            self.warmup = warmup_count(self.samples)
+        if not self.summary:
+            steady = self.samples[self.warmup:]
+            self.outliers = [self.warmup + i for i in mad_outliers(steady)]
+            self.summary = summarize(steady)
+
+    def steady(self) -> List[float]:
+        """The samples the summary is computed from, without the warm-up ones."""
+        return self.samples[self.warmup:]
+
+    def label(self) -> str:
+        return " ".join(f"{name}={value}" for name, value in self.parameters.items()) or "-"
+
+
+@dataclass
+class ResultSet:
+    """Results of one harness run, saved and loaded as JSON."""
+    name: str
+    results: List[Result] = field(default_factory=list)
+    failures: Dict[str, int] = field(default_factory=dict)  # Failed runs per benchmark
+    created: str = field(default_factory=lambda: datetime.now().isoformat(timespec='seconds'))
+    schema_version: int = SCHEMA_VERSION
+    environment: Dict[str, object] = field(default_factory=dict)  # Machine, kernel and CPU state
+    builds: Dict[str, Dict[str, object]] = field(default_factory=dict)  # Hash and flags per build/variant
+
+    def find(self, benchmark: str, metric: str, **parameters) -> Optional[Result]:
+        """The result of benchmark and metric whose parameters include the given ones."""
+        for result in self.results:
+            if result.benchmark == benchmark and result.metric == metric and \
+                    all(result.parameters.get(name) == value for name, value in parameters.items()):
+                return result
+        return None
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+    def save(self, path: str):
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=4)
+
+    @classmethod
+    def load(cls, path: str) -> 'ResultSet':
+        with open(path) as f:
+            data = json.load(f)
+        # Older files only lack fields that have defaults; newer ones may mean something else
+        if data.get('schema_version', 0) > SCHEMA_VERSION:
+            raise ValueError(f"{path} has schema version {data.get('schema_version')}, "
+                             f"this harness reads up to {SCHEMA_VERSION}")
+        # Summaries saved before warm-up detection cover every sample
+        data['results'] = [Result(**{'warmup': 0, **result}) for result in data['results']]
+        return cls(**data)
+
+    def format_table(self) -> str:
+        rows = [f"{'Benchmark':16} {'Configuration':24} {'Metric':20} {'Mean':>12} {'Median':>12} "
+                f"{'95% CI of median':>25} {'P90':>12} {'P99':>12} {'Stdev':>10} {'Min':>12} {'Max':>12} "
+                f"{'Runs':>5} {'Warm':>5} {'Outl':>5} {'Noisy':>5}"]
+        nan = float('nan')  # Percentiles and CIs are missing from results saved before schema version 3
+        for result in self.results:
+            s = result.summary
+            ci = f"[{s.get('median_ci_low', nan):.3f}, {s.get('median_ci_high', nan):.3f}]"
+            rows.append(f"{result.benchmark:16} {result.label():24} {result.metric:20} {s['mean']:12.3f} "
+                        f"{s['median']:12.3f} {ci:>25} {s.get('p90', nan):12.3f} {s.get('p99', nan):12.3f} "
+                        f"{s['stdev']:10.3f} {s['min']:12.3f} {s['max']:12.3f} {s['runs']:5} "
+                        f"{result.warmup:5} {len(result.outliers):5} {len(result.noisy):5}")
+        for benchmark, count in self.failures.items():
+            if count:
+                rows.append(f"{benchmark}: {count} failed runs")
+        return "\n".join(rows)
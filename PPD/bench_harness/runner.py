@@ -0,0 +1,315 @@
+import glob
+import json
+import os
+import statistics
+import subprocess
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .build import BuildSpec, build, recorded
+from .environment import Isolation, describe_environment
+from .matrix import ParameterMatrix, expand_command
+from .parsers import parser_from_spec
+from .process import RUSAGE_METRICS, run_process
+from .results import Result, ResultSet
+from .stats import bootstrap_ci, relative_width, warmup_count
+
+
+@dataclass
+class BenchmarkSpec:
+    """One program to benchmark: its command template, output parser and parameter matrix."""
+    name: str
+    command: List[str]
+    parser: object  # RegexParser, JsonLinesParser or IterationParser
+    matrix: ParameterMatrix = field(default_factory=ParameterMatrix)
+    cwd: str = "."  # May use matrix parameters, e.g. Mpi/cmake-build-bench-{build}
+    env: Dict[str, str] = field(default_factory=dict)
+    runs: Optional[int] = None  # Overrides the config's runs
+    higher_is_better: List[str] = field(default_factory=list)  # Metrics such as throughput; the rest are times
+
+
+@dataclass
+class AdaptiveRuns:
+    """Run count chosen per configuration instead of fixed.
+
+    A configuration is run at least min_runs times, then until the bootstrap CI of the median
+    of every metric it reports (warm-up runs left out) is narrower than target_width relative to
+    the median, or until max_runs or budget seconds spent on it.
+    """
+    target_width: float = 0.05
+    min_runs: int = 5
+    max_runs: int = 100
+    budget: Optional[float] = None
+    confidence: float = 0.95
+
+    def converged(self, samples: List[float]) -> bool:
+        if len(samples) < max(self.min_runs, 2):
+            return False
+        median = statistics.median(samples)
+        return relative_width(bootstrap_ci(samples, confidence=self.confidence), median) <= self.target_width
+
+
+@dataclass
+class HarnessConfig:
+    """A homework's benchmark config, loaded from JSON; paths are relative to the config file."""
+    name: str
+    directory: str
+    benchmarks: List[BenchmarkSpec]
+    setup: List[List[str]] = field(default_factory=list)
+    cwd: str = "."  # Where setup commands run, and the default for benchmarks
+    runs: int = 10
+    timeout: Optional[float] = None
+    isolation: Isolation = field(default_factory=Isolation)
+    adaptive: Optional[AdaptiveRuns] = None  # Replaces runs for benchmarks without their own
+    warmup: Optional[int] = None  # Leading runs to discard; detected per metric when None
+    builds: List[BuildSpec] = field(default_factory=list)  # Run before setup, in the config's cwd
+
+
+def load_config(path: str) -> HarnessConfig:
+    """Read a config file such as PPD/HW_4/lab4/benchmark.json."""
+    with open(path) as f:
+        data = json.load(f)
+    directory = os.path.dirname(os.path.abspath(path))
+    benchmarks = []
+    for spec in data['benchmarks']:
+        matrix = spec.get('matrix', {})
+        benchmarks.append(BenchmarkSpec(
+            name=spec['name'],
+            command=spec['command'],
+            parser=parser_from_spec(spec['parser']),
+            matrix=ParameterMatrix(matrix.get('parameters'), matrix.get('exclude'), matrix.get('zip')),
+            cwd=spec.get('cwd', data.get('cwd', '.')),
+            env=spec.get('env', {}),
+            runs=spec.get('runs'),
+            higher_is_better=spec.get('higher_is_better', []),
+        ))
+    return HarnessConfig(
+        name=data['name'],
+        directory=directory,
+        benchmarks=benchmarks,
+        setup=data.get('setup', []),
+        cwd=data.get('cwd', '.'),
+        runs=data.get('runs', 10),
+        timeout=data.get('timeout'),
+        isolation=Isolation.from_spec(data.get('isolation')),
+        adaptive=AdaptiveRuns(**data['adaptive']) if 'adaptive' in data else None,
+        warmup=data.get('warmup'),
+        builds=[BuildSpec(**spec) for spec in data.get('builds', [])],
+    )
+
+
+def resolve_arguments(command: List[str], cwd: str) -> List[str]:
+    """Expand glob patterns and add .exe to executables built on Windows."""
+    resolved = []
+    for argument in command:
+        if any(c in argument for c in '*?['):
+            matches = sorted(os.path.relpath(p, cwd) for p in glob.glob(os.path.join(cwd, argument)))
+            if not matches:
+                raise FileNotFoundError(f"No files match {argument} in {cwd}")
+            resolved.extend(matches)
+        elif os.name == 'nt' and os.sep in os.path.normpath(argument) \
+                and not os.path.exists(os.path.join(cwd, argument)) \
+                and os.path.exists(os.path.join(cwd, argument + '.exe')):
+            resolved.append(argument + '.exe')
+        else:
+            resolved.append(argument)
+    return resolved
+
+
+def run_builds(config: HarnessConfig, force: bool = False,
+               log: Callable[[str], None] = print) -> Dict[str, Dict[str, object]]:
+    """Build whatever changed since the last build; returns each build variant's hash and flags, keyed name/variant."""
+    cwd = os.path.join(config.directory, config.cwd)
+    return {f"{spec.name}/{variant}": info for spec in config.builds
+            for variant, info in build(spec, cwd, force, log).items()}
+
+
+def run_setup(config: HarnessConfig, log: Callable[[str], None] = print):
+    """Run the setup commands (compilation, test data generation), stopping at the first failure."""
+    cwd = os.path.join(config.directory, config.cwd)
+    for command in config.setup:
+        command = resolve_arguments(command, cwd)
+        log(f"Setup: {' '.join(command)}")
+        completed = subprocess.run(command, cwd=cwd, capture_output=True, text=True)
+        if completed.returncode != 0:
+            raise RuntimeError(f"Setup command failed with code {completed.returncode}: {' '.join(command)}\n"
+                               f"{completed.stdout}{completed.stderr}")
+
+
+class _Cell:
+    """One matrix point of a benchmark: its command, and the samples collected from its runs so far."""
+
+    def __init__(self, config: HarnessConfig, benchmark: BenchmarkSpec, point: Dict, runs: Optional[int]):
+        self.config = config
+        self.benchmark = benchmark
+        self.point = point
+        self.runs = runs or benchmark.runs or config.runs
+        # An explicit run count, from the command line or the benchmark, wins over adaptive runs
+        self.adaptive = None if runs or benchmark.runs else config.adaptive
+        self.attempts = 0
+        self.elapsed = 0.0
+        self.cwd = os.path.join(config.directory, benchmark.cwd.format(**point))
+        self.env = dict(os.environ, **benchmark.env) if benchmark.env else None
+        self.command = resolve_arguments(expand_command(benchmark.command, point), self.cwd)
+        # (matrix point + labels) -> metric -> samples, and the indices of the noisy ones, in first-seen order
+        self.samples: Dict[Tuple, Dict[str, List[float]]] = defaultdict(lambda: defaultdict(list))
+        self.noisy: Dict[Tuple, Dict[str, List[int]]] = defaultdict(lambda: defaultdict(list))
+        self.parameters: Dict[Tuple, Dict] = {}
+        self.failures = 0
+        self.stopped: Optional[str] = self._stop_reason()
+
+    def _stop_reason(self) -> Optional[str]:
+        adaptive = self.adaptive
+        if adaptive is None:
+            return "done" if self.attempts >= self.runs else None
+        if self.attempts >= adaptive.max_runs:
+            return f"reached {adaptive.max_runs} runs"
+        if adaptive.budget is not None and self.elapsed >= adaptive.budget:
+            return f"spent the {adaptive.budget} s budget"
+        if self.attempts < adaptive.min_runs or not self.samples:
+            return None
+        for metrics in self.samples.values():
+            for metric, values in metrics.items():
+                if metric in RUSAGE_METRICS:
+                    continue  # Context switches and faults are too noisy to wait for
+                warmup = self.config.warmup if self.config.warmup is not None else warmup_count(values)
+                if not adaptive.converged(values[warmup:]):
+                    return None
+        return f"median CIs within {adaptive.target_width:.0%}"
+
+    def done(self) -> bool:
+        return self.stopped is not None
+
+    def run(self, log: Callable[[str], None]):
+        """Do the next run, then decide whether the cell needs more."""
+        start = time.perf_counter()
+        self._run(self.attempts, log)
+        self.attempts += 1
+        self.elapsed += time.perf_counter() - start
+        self.stopped = self._stop_reason()
+        if self.stopped and self.adaptive is not None:
+            log(f"{self.benchmark.name}: stopped after {self.attempts} runs, {self.stopped}")
+
+    def _run(self, i: int, log: Callable[[str], None]):
+        """Do run i: check the environment, run the command pinned, and parse its output."""
+        isolation = self.config.isolation
+        total = self.runs if self.adaptive is None else f"<={self.adaptive.max_runs}"
+        prefix = f"{self.benchmark.name} run {i + 1}/{total}"
+        problems = isolation.wait_until_quiet(time.sleep, log)
+        if problems and isolation.on_noise == 'refuse':
+            log(f"{prefix}: refused, {'; '.join(problems)}")
+            self.failures += 1
+            return
+        command, preexec_fn = isolation.prepare(self.command)
+        try:
+            completed = run_process(command, self.cwd, self.env, self.config.timeout, preexec_fn)
+        except subprocess.TimeoutExpired:
+            log(f"{prefix}: timed out after {self.config.timeout} s")
+            self.failures += 1
+            return
+        if completed.returncode != 0:
+            log(f"{prefix}: exit code {completed.returncode}\n{completed.stderr}")
+            self.failures += 1
+            return
+        try:
+            records = self.benchmark.parser.parse(completed.stdout)
+        except ValueError as e:
+            records = []
+            log(f"{prefix}: {e}")
+        if not records:
+            log(f"{prefix}: no measurements in output:\n{completed.stdout}")
+            self.failures += 1
+            return
+        for record in records:
+            self._add({**self.point, **record.labels}, record.metrics, bool(problems))
+        # Resource usage is per process, so it belongs to the matrix point, not to any labels
+        self._add(self.point, completed.usage, bool(problems))
+        log(f"{prefix}: {len(records)} records" + (f" (noisy: {'; '.join(problems)})" if problems else ""))
+
+    def _add(self, configuration: Dict, metrics: Dict[str, float], noisy: bool):
+        key = tuple((name, tuple(value) if isinstance(value, list) else value)
+                    for name, value in configuration.items())
+        self.parameters.setdefault(key, configuration)
+        for metric, value in metrics.items():
+            if noisy:
+                self.noisy[key][metric].append(len(self.samples[key][metric]))
+            self.samples[key][metric].append(value)
+
+    def results(self) -> List[Result]:
+        return [Result(self.benchmark.name, self.parameters[key], metric, values, noisy=self.noisy[key][metric],
+                       warmup=self.config.warmup)
+                for key, metrics in self.samples.items() for metric, values in metrics.items()]
+
+
+def _cells(config: HarnessConfig, benchmark: BenchmarkSpec, runs: Optional[int]) -> List[_Cell]:
+    return [_Cell(config, benchmark, point, runs) for point in benchmark.matrix]
+
+
+def _run_cells(cells: List[_Cell], interleave: bool, log: Callable[[str], None]):
+    """Run every cell until it is done, cell after cell or round-robin one run each."""
+    if not interleave:
+        for cell in cells:
+            log(f"\n{cell.benchmark.name}: {' '.join(cell.command)}")
+            while not cell.done():
+                cell.run(log)
+        return
+    for cell in cells:
+        log(f"{cell.benchmark.name}: {' '.join(cell.command)}")
+    active = cells
+    round_number = 0
+    while active:
+        round_number += 1
+        log(f"\nRound {round_number}")
+        for cell in active:
+            cell.run(log)
+        active = [cell for cell in active if not cell.done()]
+
+
+def run_benchmark(config: HarnessConfig, benchmark: BenchmarkSpec, runs: Optional[int] = None,
+                  log: Callable[[str], None] = print) -> Tuple[List[Result], int]:
+    """Run every point of a benchmark's matrix, runs times or adaptively.
+
+    Returns its results and the number of failed runs.
+    """
+    cells = _cells(config, benchmark, runs)
+    _run_cells(cells, config.isolation.interleave, log)
+    return [result for cell in cells for result in cell.results()], sum(cell.failures for cell in cells)
+
+
+def run_config(config: HarnessConfig, runs: Optional[int] = None, only: Optional[List[str]] = None,
+               setup: bool = True, log: Callable[[str], None] = print, rebuild: bool = False) -> ResultSet:
+    """Run the builds, the setup and then the selected benchmarks (all by default) of a config.
+
+    Without setup nothing is built either, and the results record the builds found on disk.
+    With interleaving on, the points of all selected benchmarks share the rounds.
+    """
+    if setup:
+        builds = run_builds(config, rebuild, log)
+        run_setup(config, log)
+    else:
+        cwd = os.path.join(config.directory, config.cwd)
+        builds = {f"{spec.name}/{variant}": info for spec in config.builds
+                  for variant, info in recorded(spec, cwd).items()}
+    result_set = ResultSet(config.name, environment=describe_environment(config.isolation.cpus), builds=builds)
+    cells = [cell for benchmark in config.benchmarks if not only or benchmark.name in only
+             for cell in _cells(config, benchmark, runs)]
+    _run_cells(cells, config.isolation.interleave, log)
+    for cell in cells:
+        result_set.results.extend(cell.results())
+        name = cell.benchmark.name
+        result_set.failures[name] = result_set.failures.get(name, 0) + cell.failures
+    return result_set
+
+
+def plan(config: HarnessConfig, only: Optional[List[str]] = None) -> List[Tuple[str, str, List[str]]]:
+    """(benchmark, working directory, command) of every matrix point, without running anything."""
+    commands = []
+    for benchmark in config.benchmarks:
+        if only and benchmark.name not in only:
+            continue
+        for point in benchmark.matrix:
+            commands.append((benchmark.name, os.path.join(config.directory, benchmark.cwd.format(**point)),
+                             expand_command(benchmark.command, point)))
+    return commands
@@ -0,0 +1,250 @@
+"""Scaling analysis of a thread or process sweep in harness results.
+
+For every input shape (the parameters other than the worker count) it computes speedup,
+parallel efficiency and the Karp-Flatt serial fraction at each worker count, fits Amdahl's
+and Gustafson's laws by least squares and picks the fastest worker count. From the PPD
+directory:
+
+    python -m bench_harness.scaling HW_4/lab4/benchmark_results.json -b parallel -w p \\
+        --sequential sequential --markdown HW_4/scaling.md --plot HW_4/plots
+"""
+import argparse
+import os
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .process import RUSAGE_METRICS
+from .results import Result, ResultSet
+
+
+@dataclass
+class ScalingPoint:
+    workers: int
+    time: float  # Median of the metric
+    speedup: float
+    efficiency: float
+    karp_flatt: Optional[float]  # Experimentally determined serial fraction; undefined for 1 worker
+
+
+@dataclass
+class ScalingSeries:
+    """One input shape across worker counts, with the fitted models."""
+    shape: Dict[str, object]
+    reference: float  # Time the speedups are relative to
+    reference_label: str  # 'sequential' or 'p=1'; a higher count when the sweep does not start at 1
+    reference_workers: int = 1  # Worker count of the reference; 1 for a sequential one
+    points: List[ScalingPoint] = field(default_factory=list)
+    amdahl_serial: Optional[float] = None  # f in S(p) = 1 / (f + (1 - f) / p)
+    gustafson_serial: Optional[float] = None  # alpha in S(p) = p - alpha (p - 1)
+
+    @property
+    def best(self) -> ScalingPoint:
+        return min(self.points, key=lambda point: point.time)
+
+    def label(self) -> str:
+        return " ".join(f"{name}={value}" for name, value in self.shape.items()) or "-"
+
+    def amdahl_speedup(self, workers: float) -> Optional[float]:
+        if self.amdahl_serial is None:
+            return None
+        return 1 / (self.amdahl_serial + (1 - self.amdahl_serial) / workers)
+
+    def gustafson_speedup(self, workers: float) -> Optional[float]:
+        if self.gustafson_serial is None:
+            return None
+        return workers - self.gustafson_serial * (workers - 1)
+
+
+def karp_flatt(speedup: float, workers: int) -> Optional[float]:
+    """Serial fraction e = (1/S - 1/p) / (1 - 1/p); rising with p points at parallel overhead."""
+    if workers <= 1 or speedup <= 0:
+        return None
+    return (1 / speedup - 1 / workers) / (1 - 1 / workers)
+
+
+def fit_amdahl(workers: Sequence[float], times: Sequence[float],
+               reference: float) -> Optional[float]:
+    """Serial fraction f of Amdahl's law fitted to the times, clamped to [0, 1].
+
+    With T1 = reference, Amdahl's law T(p) = T1 (f + (1 - f) / p) is linear in f, so the least
+    squares fit of the times has a closed form.
+    """
+    if len(workers) < 2:
+        return None
+    xs = [1 / p for p in workers]
+    numerator = sum((t - reference * x) * reference * (1 - x) for t, x in zip(times, xs))
+    denominator = sum((reference * (1 - x)) ** 2 for x in xs)
+    if not denominator:
+        return None
+    return min(1.0, max(0.0, numerator / denominator))
+
+
+def fit_gustafson(workers: Sequence[float], speedups: Sequence[float]) -> Optional[float]:
+    """Serial fraction alpha of Gustafson's law S(p) = p - alpha (p - 1), by least squares."""
+    denominator = sum((p - 1) ** 2 for p in workers)
+    if not denominator:
+        return None
+    return sum((p - s) * (p - 1) for p, s in zip(workers, speedups)) / denominator
+
+
+def _matches(result: Result, shape: Dict[str, object]) -> bool:
+    return all(shape.get(name) == value for name, value in result.parameters.items() if name in shape)
+
+
+def analyze(results: ResultSet, benchmark: str, workers: str, metric: str,
+            sequential: Optional[str] = None) -> List[ScalingSeries]:
+    """Scaling series of benchmark over the workers parameter, one per input shape.
+
+    Speedups are relative to the median of the sequential benchmark's result with the same
+    shape (parameters it lacks are ignored) when given, else to the shape's run with 1 worker,
+    else to its smallest worker count r. Efficiency and Karp-Flatt are per worker, so with r > 1
+    they use the speedup rescaled to one worker, S * r, assuming linear scaling up to r.
+    """
+    shapes: Dict[Tuple, Tuple[Dict, List[Tuple[int, float]]]] = {}
+    for result in results.results:
+        if result.benchmark != benchmark or result.metric != metric or workers not in result.parameters:
+            continue
+        shape = {name: value for name, value in result.parameters.items() if name != workers}
+        key = tuple((name, str(value)) for name, value in shape.items())
+        shapes.setdefault(key, (shape, []))[1].append((int(result.parameters[workers]), result.summary['median']))
+    if not shapes:
+        raise ValueError(f"No '{metric}' results of benchmark '{benchmark}' have a '{workers}' parameter")
+
+    all_series = []
+    for shape, measured in shapes.values():
+        measured.sort()
+        reference, reference_label, reference_workers = None, None, 1
+        if sequential is not None:
+            for result in results.results:
+                if result.benchmark == sequential and result.metric == metric and _matches(result, shape):
+                    reference, reference_label = result.summary['median'], 'sequential'
+                    break
+            if reference is None:
+                raise ValueError(f"No '{metric}' result of '{sequential}' matches {shape}")
+        else:
+            reference_workers, reference = measured[0]
+            reference_label = f"{workers}={reference_workers}"
+
+        series = ScalingSeries(shape, reference, reference_label, reference_workers)
+        for count, time in measured:
+            speedup = reference / time if time else float('inf')
+            series.points.append(ScalingPoint(count, time, speedup, speedup * reference_workers / count,
+                                              karp_flatt(speedup * reference_workers, count)))
+        counts = [point.workers for point in series.points]
+        if reference_workers == 1:
+            # The models describe speedup over one worker, so they need a 1-worker reference
+            series.amdahl_serial = fit_amdahl(counts, [point.time for point in series.points], reference)
+            series.gustafson_serial = fit_gustafson(counts, [point.speedup for point in series.points])
+        all_series.append(series)
+    return all_series
+
+
+def _format(value: Optional[float], digits: int = 2) -> str:
+    return "-" if value is None else f"{value:.{digits}f}"
+
+
+def to_markdown(all_series: List[ScalingSeries], workers: str, metric: str) -> str:
+    """Tables in the style of the homework READMEs: the best worker count per input shape, then one per shape."""
+    summary = [f"| Input | Best {workers} | {metric} (median) | Speedup | Amdahl f |", "|---|---|---|---|---|"]
+    for series in all_series:
+        best = series.best
+        summary.append(f"| {series.label()} | {best.workers} | {best.time:.3f} | {best.speedup:.2f}x | "
+                       f"{_format(series.amdahl_serial, 3)} |")
+    sections = ["\n".join(summary)]
+    for series in all_series:
+        lines = [f"### {series.label()}", "",
+                 f"| {workers} | {metric} (median) | Speedup | Efficiency | Karp-Flatt | Amdahl | Gustafson |",
+                 "|---|---|---|---|---|---|---|"]
+        for point in series.points:
+            lines.append(f"| {point.workers} | {point.time:.3f} | {point.speedup:.2f}x | {point.efficiency:.0%} | "
+                         f"{_format(point.karp_flatt, 3)} | {_format(series.amdahl_speedup(point.workers))} | "
+                         f"{_format(series.gustafson_speedup(point.workers))} |")
+        best = series.best
+        lines.append("")
+        lines.append(f"Speedups relative to {series.reference_label} ({series.reference:.3f}). "
+                     f"Best: {workers}={best.workers} at {best.time:.3f} ({best.speedup:.2f}x).")
+        if series.reference_workers > 1:
+            lines.append(f"Efficiency and Karp-Flatt assume linear scaling up to {workers}={series.reference_workers}.")
+        if series.amdahl_serial is not None:
+            limit = "unbounded" if series.amdahl_serial == 0 else f"{1 / series.amdahl_serial:.1f}x"
+            lines.append(f"Amdahl serial fraction f = {series.amdahl_serial:.3f} (speedup limit {limit}); "
+                         f"Gustafson serial fraction = {series.gustafson_serial:.3f}.")
+        sections.append("\n".join(lines))
+    return "\n\n".join(sections) + "\n"
+
+
+def plot(all_series: List[ScalingSeries], workers: str, directory: str) -> List[str]:
+    """Speedup and efficiency plots with the fitted Amdahl curves; needs matplotlib."""
+    try:
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+    except ImportError:
+        raise Exception("Plotting needs matplotlib (pip install matplotlib)")
+
+    os.makedirs(directory, exist_ok=True)
+    figure, (speedup_axes, efficiency_axes) = plt.subplots(1, 2, figsize=(12, 5))
+    for series in all_series:
+        counts = [point.workers for point in series.points]
+        line, = speedup_axes.plot(counts, [point.speedup for point in series.points], 'o-', label=series.label())
+        if series.amdahl_serial is not None:
+            dense = [1 + i * (max(counts) - 1) / 50 for i in range(51)]
+            speedup_axes.plot(dense, [series.amdahl_speedup(p) for p in dense], '--', color=line.get_color(),
+                              alpha=0.6, label=f"{series.label()} Amdahl f={series.amdahl_serial:.2f}")
+        efficiency_axes.plot(counts, [point.efficiency for point in series.points], 'o-', label=series.label())
+    top = max(point.workers for series in all_series for point in series.points)
+    speedup_axes.plot([1, top], [1, top], ':', color='gray', label='ideal')
+    for axes, title in ((speedup_axes, 'Speedup'), (efficiency_axes, 'Efficiency')):
+        axes.set_xscale('log', base=2)
+        axes.set_xlabel(workers)
+        axes.set_title(title)
+        axes.grid(True, alpha=0.3)
+        axes.legend(fontsize='small')
+    path = os.path.join(directory, 'scaling.png')
+    figure.tight_layout()
+    figure.savefig(path, dpi=120)
+    plt.close(figure)
+    return [path]
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='python -m bench_harness.scaling',
+                                     description='Speedup, efficiency and Amdahl/Gustafson fits of a worker sweep')
+    parser.add_argument('results', help='Results file written by the harness')
+    parser.add_argument('-b', '--benchmark', required=True, help='Benchmark that sweeps the worker count')
+    parser.add_argument('-w', '--workers', required=True, help='Parameter holding the thread or process count')
+    parser.add_argument('-m', '--metric', default=None,
+                        help='Time metric to analyze (default: the only non-usage metric of the benchmark)')
+    parser.add_argument('--sequential', default=None,
+                        help='Benchmark whose times are the speedup reference (default: the 1-worker runs)')
+    parser.add_argument('--markdown', default=None, help='Also write the tables to this file')
+    parser.add_argument('--plot', metavar='DIRECTORY', default=None, help='Save plots there (needs matplotlib)')
+    args = parser.parse_args()
+
+    try:
+        results = ResultSet.load(args.results)
+        metric = args.metric
+        if metric is None:
+            metrics = sorted({result.metric for result in results.results
+                              if result.benchmark == args.benchmark and result.metric not in RUSAGE_METRICS})
+            if len(metrics) != 1:
+                raise ValueError(f"Choose a metric with -m: {', '.join(metrics) or 'none found'}")
+            metric = metrics[0]
+        all_series = analyze(results, args.benchmark, args.workers, metric, args.sequential)
+        markdown = to_markdown(all_series, args.workers, metric)
+        print(markdown)
+        if args.markdown:
+            with open(args.markdown, 'w') as f:
+                f.write(markdown)
+            print(f"Tables saved to {args.markdown}")
+        if args.plot:
+            for path in plot(all_series, args.workers, args.plot):
+                print(f"Plot saved to {path}")
+    except Exception as e:
+        print(f"Error analyzing results: {str(e)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,127 @@
+import math
+import random
+import statistics
+from typing import Callable, Dict, List, Sequence, Tuple
+
+# Modified z-score above which a sample counts as an outlier (Iglewicz and Hoaglin)
+MAD_THRESHOLD = 3.5
+
+
+def percentile(samples: Sequence[float], q: float) -> float:
+    """The q-th percentile (0-100), interpolating linearly between the closest ranks."""
+    ordered = sorted(samples)
+    position = (len(ordered) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def bootstrap_ci(samples: Sequence[float], statistic: Callable[[Sequence[float]], float] = statistics.median,
+                 confidence: float = 0.95, resamples: int = 1000, seed: int = 0) -> Tuple[float, float]:
+    """Percentile bootstrap confidence interval of statistic; seeded, so the same samples give the same interval."""
+    if len(samples) < 2:
+        return (samples[0], samples[0]) if samples else (0, 0)
+    rng = random.Random(seed)
+    n = len(samples)
+    estimates = sorted(statistic(rng.choices(samples, k=n)) for _ in range(resamples))
+    tail = (1 - confidence) / 2 * 100
+    return percentile(estimates, tail), percentile(estimates, 100 - tail)
+
+
+def relative_width(interval: Tuple[float, float], center: float) -> float:
+    """Width of interval relative to center, e.g. 0.05 for a CI spanning 5% of the median."""
+    width = interval[1] - interval[0]
+    if center == 0:
+        return 0.0 if width == 0 else float('inf')
+    return width / abs(center)
+
+
+def _modified_z_scores(values: Sequence[float], reference: Sequence[float]) -> List[float]:
+    """Distance of each value from the median of reference, in robust standard deviations.
+
+    Uses the median absolute deviation, falling back to the mean absolute deviation when more
+    than half the reference samples are equal (common with millisecond timers).
+    """
+    center = statistics.median(reference)
+    mad = statistics.median(abs(x - center) for x in reference)
+    if mad:
+        scale = 1.4826 * mad
+    else:
+        scale = 1.2533 * statistics.mean(abs(x - center) for x in reference)
+    if not scale:
+        return [0.0 if x == center else float('inf') for x in values]
+    return [abs(x - center) / scale for x in values]
+
+
+def mad_outliers(samples: Sequence[float], threshold: float = MAD_THRESHOLD) -> List[int]:
+    """Indices of the samples whose modified z-score exceeds threshold."""
+    if len(samples) < 3:
+        return []
+    return [i for i, z in enumerate(_modified_z_scores(samples, samples)) if z > threshold]
+
+
+def warmup_count(samples: Sequence[float], threshold: float = MAD_THRESHOLD, max_fraction: float = 0.5) -> int:
+    """How many leading samples are warm-up: each is an outlier against the samples after it.
+
+    JIT compilation, cold caches and page faults make the first runs of a program stand out;
+    they are dropped one by one while they do, but never more than max_fraction of the samples.
+    """
+    count = 0
+    limit = int(len(samples) * max_fraction)
+    while count < limit and len(samples) - count - 1 >= 5:  # Too few later samples to judge by otherwise
+        rest = samples[count + 1:]
+        if _modified_z_scores([samples[count]], rest)[0] <= threshold:
+            break
+        count += 1
+    return count
+
+
+def summarize(samples: Sequence[float]) -> Dict[str, float]:
+    """Calculate the summary statistics stored for every metric."""
+    if not samples:
+        return {'runs': 0, 'mean': 0, 'median': 0, 'stdev': 0, 'min': 0, 'max': 0,
+                'p50': 0, 'p90': 0, 'p99': 0, 'median_ci_low': 0, 'median_ci_high': 0}
+    ci_low, ci_high = bootstrap_ci(samples)
+    return {
+        'runs': len(samples),
+        'mean': statistics.mean(samples),
+        'median': statistics.median(samples),
+        'stdev': statistics.stdev(samples) if len(samples) > 1 else 0,
+        'min': min(samples),
+        'max': max(samples),
+        'p50': percentile(samples, 50),
+        'p90': percentile(samples, 90),
+        'p99': percentile(samples, 99),
+        'median_ci_low': ci_low,
+        'median_ci_high': ci_high,
+    }
+
+
+def mann_whitney_u(first: Sequence[float], second: Sequence[float]) -> Tuple[float, float]:
+    """Mann-Whitney U statistic of first against second and its two-sided p-value.
+
+    Uses the normal approximation with tie and continuity corrections, which is close enough
+    from about 5 samples per side. When every sample is equal, p is 1.
+    """
+    n1, n2 = len(first), len(second)
+    if not n1 or not n2:
+        return 0.0, 1.0
+    pooled = sorted([(x, 0) for x in first] + [(x, 1) for x in second])
+    rank_sum = 0.0
+    tie_term = 0.0
+    i = 0
+    while i < len(pooled):
+        j = i
+        while j < len(pooled) and pooled[j][0] == pooled[i][0]:
+            j += 1
+        rank = (i + j + 1) / 2  # Average of ranks i+1 .. j
+        rank_sum += rank * sum(1 for _, side in pooled[i:j] if side == 0)
+        tie_term += (j - i) ** 3 - (j - i)
+        i = j
+    u = rank_sum - n1 * (n1 + 1) / 2
+    n = n1 + n2
+    variance = n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1)))
+    if variance <= 0:
+        return u, 1.0
+    z = (abs(u - n1 * n2 / 2) - 0.5) / math.sqrt(variance)
+    return u, min(1.0, math.erfc(max(z, 0) / math.sqrt(2)))
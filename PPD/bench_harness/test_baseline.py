@@ -0,0 +1,80 @@
+import os
+import tempfile
+
+from bench_harness.baseline import BaselineStore, compare, format_comparison
+from bench_harness.results import Result, ResultSet
+
+SAMPLES = [10.0, 10.2, 9.9, 10.1, 10.0, 9.8, 10.3, 10.0, 10.1, 9.9]
+
+
+def result_set(scale=1.0, metric='time_ms', **parameters):
+    return ResultSet('run', [Result('bench', {'n': 100, **parameters}, metric, [x * scale for x in SAMPLES])])
+
+
+def verdict(baseline, current, **options):
+    comparison, = compare(baseline, current, **options)
+    return comparison
+
+
+def test_store_round_trip():
+    with tempfile.TemporaryDirectory() as directory:
+        store = BaselineStore(os.path.join(directory, 'baselines'))
+        assert store.names() == []
+        saved = result_set()
+        saved.environment = {'cpu': 'test'}
+        path = store.save('main-1.0', saved)
+        assert os.path.exists(path) and store.names() == ['main-1.0']
+
+        loaded = store.load('main-1.0')
+        assert loaded.to_dict() == saved.to_dict()
+        assert loaded.results[0].steady() == saved.results[0].steady()
+
+
+def test_store_missing_and_invalid_names():
+    with tempfile.TemporaryDirectory() as directory:
+        store = BaselineStore(directory)
+        store.save('main', result_set())
+        try:
+            store.load('other')
+            assert False, "A missing baseline must raise"
+        except FileNotFoundError as e:
+            assert "'other'" in str(e) and "known: main" in str(e)
+        for name in ('../escape', 'a b', ''):
+            try:
+                store.path(name)
+                assert False, f"'{name}' must be rejected"
+            except ValueError:
+                pass
+
+
+def test_compare_verdicts():
+    baseline = result_set()
+    slower = verdict(baseline, result_set(1.2))
+    assert slower.verdict == 'regressed' and slower.p_value < 0.05
+    assert abs(slower.speedup - 1 / 1.2) < 1e-9
+    faster = verdict(baseline, result_set(0.8))
+    assert faster.verdict == 'improved' and abs(faster.speedup - 1.25) < 1e-9
+    same = verdict(baseline, result_set())
+    assert same.verdict == 'unchanged' and same.p_value == 1.0
+    # Significant but within the threshold
+    assert verdict(baseline, result_set(1.03)).verdict == 'unchanged'
+    assert verdict(baseline, result_set(1.03), threshold=0.01).verdict == 'regressed'
+
+
+def test_compare_directions_and_kinds():
+    # Throughput dropping is a regression when the metric is higher-is-better
+    baseline, lower = result_set(metric='ops_s'), result_set(0.8, metric='ops_s')
+    assert verdict(baseline, lower).verdict == 'improved'
+    assert verdict(baseline, lower, higher_is_better={'ops_s'}).verdict == 'regressed'
+    assert verdict(result_set(metric='max_rss_kb'), result_set(2.0, metric='max_rss_kb')).verdict == 'info'
+
+    comparisons = compare(result_set(n=100), result_set(n=200))
+    assert sorted(c.verdict for c in comparisons) == ['missing', 'new']
+    assert "0 of 2 configurations regressed" in format_comparison(comparisons)
+
+
+if __name__ == "__main__":
+    test_store_round_trip()
+    test_store_missing_and_invalid_names()
+    test_compare_verdicts()
+    test_compare_directions_and_kinds()
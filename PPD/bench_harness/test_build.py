@@ -0,0 +1,125 @@
+import os
+import sys
+import tempfile
+
+from bench_harness.build import BuildSpec, build, content_hash, recorded, source_files
+
+# Stands in for javac: writes a .class file per source and counts its runs in builds.log
+FAKE_JAVAC = ("import sys\n"
+              "if '--fail' in sys.argv:\n"
+              "    sys.exit('error: asked to fail')\n"
+              "for source in sys.argv[1:]:\n"
+              "    open(source[:-len('.java')] + '.class', 'w').close()\n"
+              "open('builds.log', 'a').write('built\\n')\n")
+
+
+class FakeJavacSpec(BuildSpec):
+    def commands(self, variant, files):
+        return [[sys.executable, '-c', FAKE_JAVAC] + self.flags + files]
+
+
+def write(path, text):
+    with open(path, 'w') as f:
+        f.write(text)
+
+
+def runs(cwd):
+    if not os.path.exists(os.path.join(cwd, 'builds.log')):
+        return 0
+    with open(os.path.join(cwd, 'builds.log')) as f:
+        return len(f.readlines())
+
+
+def make_project(cwd):
+    write(os.path.join(cwd, 'Main.java'), "class Main {}\n")
+    write(os.path.join(cwd, 'Util.java'), "class Util {}\n")
+    return FakeJavacSpec('java', 'javac', ['*.java'])
+
+
+def test_hash_tracks_sources_and_flags():
+    with tempfile.TemporaryDirectory() as cwd:
+        spec = make_project(cwd)
+        files = source_files(spec, cwd)
+        assert files == ['Main.java', 'Util.java']
+        digest = content_hash(spec, 'default', cwd, files)
+        assert content_hash(spec, 'default', cwd, files) == digest
+
+        write(os.path.join(cwd, 'Util.java'), "class Util { int x; }\n")
+        changed = content_hash(spec, 'default', cwd, files)
+        assert changed != digest
+        write(os.path.join(cwd, 'Util.java'), "class Util {}\n")
+        assert content_hash(spec, 'default', cwd, files) == digest
+
+        flagged = FakeJavacSpec('java', 'javac', ['*.java'], flags=['-g'])
+        assert content_hash(flagged, 'default', cwd, files) != digest
+        write(os.path.join(cwd, 'Extra.java'), "class Extra {}\n")
+        assert content_hash(spec, 'default', cwd, source_files(spec, cwd)) != digest
+
+
+def test_cache_hit_skips_rebuild():
+    with tempfile.TemporaryDirectory() as cwd:
+        spec = make_project(cwd)
+        log = []
+        first = build(spec, cwd, log=log.append)['default']
+        assert runs(cwd) == 1 and not first['cached']
+        assert os.path.exists(os.path.join(cwd, 'Main.class'))
+
+        second = build(spec, cwd, log=log.append)['default']
+        assert runs(cwd) == 1 and second['cached'] and second['hash'] == first['hash']
+        assert log[-1] == "Build java (default): up to date"
+        assert recorded(spec, cwd)['default']['hash'] == first['hash']
+
+        build(spec, cwd, force=True, log=log.append)
+        assert runs(cwd) == 2
+
+
+def test_changes_trigger_rebuild():
+    with tempfile.TemporaryDirectory() as cwd:
+        spec = make_project(cwd)
+        first = build(spec, cwd, log=lambda line: None)['default']
+
+        write(os.path.join(cwd, 'Main.java'), "class Main { }\n")
+        changed = build(spec, cwd, log=lambda line: None)['default']
+        assert runs(cwd) == 2 and not changed['cached'] and changed['hash'] != first['hash']
+
+        os.remove(os.path.join(cwd, 'Util.class'))  # Outputs gone: the stamp alone is not enough
+        build(spec, cwd, log=lambda line: None)
+        assert runs(cwd) == 3 and os.path.exists(os.path.join(cwd, 'Util.class'))
+
+
+def test_failed_build_leaves_no_stamp():
+    with tempfile.TemporaryDirectory() as cwd:
+        spec = make_project(cwd)
+        spec.flags = ['--fail']
+        try:
+            build(spec, cwd, log=lambda line: None)
+            assert False, "A failing command must raise"
+        except RuntimeError as e:
+            assert "failed with code 1" in str(e) and "asked to fail" in str(e)
+        assert recorded(spec, cwd) == {}
+        try:
+            source_files(BuildSpec('none', 'javac', ['*.cpp']), cwd)
+            assert False, "Sources that match nothing must raise"
+        except FileNotFoundError:
+            pass
+
+
+def test_cmake_variants():
+    spec = BuildSpec('mpi', 'cmake', ['*.cpp'], source_dir='Mpi', build_types=['Release', 'Debug'])
+    assert spec.variants() == ['release', 'debug']
+    assert spec.build_dir('debug') == os.path.join('Mpi', 'cmake-build-bench-debug')
+    configure, compile_step = spec.commands('debug', [])
+    assert '-DCMAKE_BUILD_TYPE=Debug' in configure and compile_step[-1] == 'Debug'
+    try:
+        BuildSpec('x', 'make', [])
+        assert False, "Unknown kinds must be rejected"
+    except ValueError:
+        pass
+
+
+if __name__ == "__main__":
+    test_hash_tracks_sources_and_flags()
+    test_cache_hit_skips_rebuild()
+    test_changes_trigger_rebuild()
+    test_failed_build_leaves_no_stamp()
+    test_cmake_variants()
@@ -0,0 +1,61 @@
+from bench_harness.results import Result, ResultSet
+from bench_harness.scaling import analyze, karp_flatt, to_markdown
+
+
+def sweep(times, benchmark='parallel', **shape):
+    return [Result(benchmark, {**shape, 'p': p}, 'time_ms', summary={'median': time}) for p, time in times.items()]
+
+
+def test_one_worker_reference():
+    results = ResultSet('t', sweep({1: 100.0, 2: 50.0, 4: 25.0}))
+    series, = analyze(results, 'parallel', 'p', 'time_ms')
+    assert series.reference_label == 'p=1' and series.reference_workers == 1
+    assert [point.speedup for point in series.points] == [1.0, 2.0, 4.0]
+    assert [point.efficiency for point in series.points] == [1.0, 1.0, 1.0]
+    assert series.points[0].karp_flatt is None and series.points[2].karp_flatt == 0
+    assert series.amdahl_serial == 0 and series.gustafson_serial == 0
+
+
+def test_sequential_reference():
+    results = ResultSet('t', sweep({2: 60.0, 4: 40.0}) + [Result('sequential', {}, 'time_ms',
+                                                                summary={'median': 100.0})])
+    series, = analyze(results, 'parallel', 'p', 'time_ms', sequential='sequential')
+    assert series.reference_label == 'sequential' and series.reference_workers == 1
+    assert abs(series.points[1].efficiency - 2.5 / 4) < 1e-12
+    assert abs(series.points[1].karp_flatt - karp_flatt(2.5, 4)) < 1e-12
+    assert series.amdahl_serial is not None
+
+
+def test_reference_with_more_workers():
+    # Sweeps like HW_3's start at 2 processes (one worker rank per process after the first)
+    results = ResultSet('t', sweep({2: 80.0, 4: 40.0, 8: 32.0}))
+    series, = analyze(results, 'parallel', 'p', 'time_ms')
+    assert series.reference_label == 'p=2' and series.reference_workers == 2
+    assert [point.speedup for point in series.points] == [1.0, 2.0, 2.5]
+    # Rescaled to one worker: 2, 4 and 5 times the 1-worker time
+    assert [point.efficiency for point in series.points] == [1.0, 1.0, 5 / 8]
+    assert series.points[1].karp_flatt == 0
+    assert abs(series.points[2].karp_flatt - karp_flatt(5.0, 8)) < 1e-12
+    assert series.amdahl_serial is None and series.gustafson_serial is None
+    assert "assume linear scaling up to p=2" in to_markdown([series], 'p', 'time_ms')
+
+
+def test_shapes_are_separate():
+    results = ResultSet('t', sweep({1: 10.0, 2: 5.0}, n=100) + sweep({1: 40.0, 2: 10.0}, n=1000))
+    small, large = analyze(results, 'parallel', 'p', 'time_ms')
+    assert small.shape == {'n': 100} and large.shape == {'n': 1000}
+    assert small.best.speedup == 2.0 and large.best.speedup == 4.0
+
+
+def test_karp_flatt():
+    assert karp_flatt(1.0, 1) is None and karp_flatt(0.0, 4) is None
+    assert karp_flatt(4.0, 4) == 0
+    assert abs(karp_flatt(2.0, 4) - 1 / 3) < 1e-12
+
+
+if __name__ == "__main__":
+    test_one_worker_reference()
+    test_sequential_reference()
+    test_reference_with_more_workers()
+    test_shapes_are_separate()
+    test_karp_flatt()
@@ -0,0 +1,85 @@
+import statistics
+
+from bench_harness.stats import bootstrap_ci, mad_outliers, mann_whitney_u, percentile, summarize, warmup_count
+
+
+def close(a, b, tolerance=1e-4):
+    return abs(a - b) < tolerance
+
+
+def test_percentile():
+    assert percentile([4, 1, 3, 2], 50) == 2.5
+    assert percentile([1, 2, 3, 4], 0) == 1 and percentile([1, 2, 3, 4], 100) == 4
+    assert close(percentile([1, 2, 3, 4], 90), 3.7)
+    assert close(percentile(range(1, 101), 99), 99.01)
+    assert percentile([7], 90) == 7
+
+
+def test_bootstrap_ci():
+    samples = list(range(1, 102))
+    low, high = bootstrap_ci(samples)
+    assert low <= statistics.median(samples) <= high and 1 <= low and high <= 101
+    assert bootstrap_ci(samples) == (low, high)  # Seeded
+    assert bootstrap_ci(samples, seed=1) != (low, high)
+    narrow = bootstrap_ci(samples, confidence=0.5)
+    assert low <= narrow[0] <= narrow[1] <= high
+    assert bootstrap_ci([5.0] * 10) == (5.0, 5.0)
+    assert bootstrap_ci([3.0]) == (3.0, 3.0) and bootstrap_ci([]) == (0, 0)
+
+
+def test_mad_outliers():
+    assert mad_outliers([10, 10, 11, 10, 9, 10, 100]) == [6]
+    assert mad_outliers([10, 10, 11, 10, 9, 10, 12]) == []
+    # More than half the samples equal: the mean absolute deviation sets the scale
+    assert mad_outliers([10, 10, 10, 10, 12]) == [4]
+    assert mad_outliers([5, 5, 5, 5]) == []
+    assert mad_outliers([1, 1000]) == []  # Too few samples to judge
+
+
+def test_warmup_count():
+    assert warmup_count([100, 50, 10, 10, 11, 10, 10, 9, 10, 10]) == 2
+    steady = [10, 10, 11, 10, 9, 10, 10]
+    assert warmup_count(steady) == 0
+    slow_start = [1000, 900, 800, 700, 10, 10, 11, 10, 9, 10, 10]
+    assert warmup_count(slow_start) == 4
+    assert warmup_count(slow_start, max_fraction=0.2) == 2
+    assert warmup_count([100, 1, 1, 1, 1]) == 0  # Fewer than 5 samples after it
+    assert warmup_count([]) == 0
+
+
+def test_mann_whitney_u():
+    u, p = mann_whitney_u([1, 2, 3, 4, 5], [6, 7, 8, 9, 10])
+    assert u == 0 and close(p, 0.012186)
+    u, p = mann_whitney_u([6, 7, 8, 9, 10], [1, 2, 3, 4, 5])
+    assert u == 25 and close(p, 0.012186)
+    # Ties get average ranks and shrink the variance
+    u, p = mann_whitney_u([1, 2, 2, 3, 4], [2, 3, 5, 6, 7])
+    assert u == 4.5 and close(p, 0.111612)
+    u, p = mann_whitney_u([1, 2, 3, 4, 5], [1, 2, 3, 4, 5])
+    assert u == 12.5 and p == 1.0
+
+
+def test_mann_whitney_u_edge_cases():
+    assert mann_whitney_u([3, 3, 3], [3, 3]) == (3.0, 1.0)  # All ties: no evidence either way
+    assert mann_whitney_u([1], [2]) == (0.0, 1.0)
+    assert mann_whitney_u([], [1, 2]) == (0.0, 1.0)
+    u, p = mann_whitney_u([1], [2, 3, 4, 5, 6, 7, 8, 9])
+    assert u == 0 and 0 < p < 1
+
+
+def test_summarize():
+    summary = summarize([3, 1, 2, 4])
+    assert summary['runs'] == 4 and summary['median'] == 2.5 and summary['mean'] == 2.5
+    assert summary['min'] == 1 and summary['max'] == 4 and close(summary['p90'], 3.7)
+    assert summary['median_ci_low'] <= 2.5 <= summary['median_ci_high']
+    assert summarize([])['runs'] == 0 and summarize([7])['stdev'] == 0
+
+
+if __name__ == "__main__":
+    test_percentile()
+    test_bootstrap_ci()
+    test_mad_outliers()
+    test_warmup_count()
+    test_mann_whitney_u()
+    test_mann_whitney_u_edge_cases()
+    test_summarize()
@@ -0,0 +1,14 @@
+"""Seeded, NumPy-vectorized generators for the homework inputs (needs numpy).
+
+The contest results of HW_4 and HW_5 (contest_data/RezultateC{c}_P{p}.txt, as written by
+TestDataGenerator.java) and the big numbers of HW_3 ("N digits" files like Numar1.txt) are
+generated block by block, so millions of contestants or 10^8 digits take seconds. The same
+seed always gives the same files. From the PPD directory:
+
+    python -m datagen contest -o HW_4/lab4/src/contest_data -c 1000000 --skew 1 --disqualified 0.05
+    python -m datagen number 100000000 -o HW_3/Mpi/Numar1.txt --seed 1
+
+The Java programs read 5 countries and 10 problems, the defaults here.
+"""
+from .bignum import write_number
+from .contest import ContestSpec, generate_contest, write_results_file
@@ -0,0 +1,59 @@
+import argparse
+import os
+import time
+
+from .bignum import write_number
+from .contest import ContestSpec, generate_contest
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='python -m datagen',
+                                     description='Generate inputs for the contest and big number homeworks')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    contest = commands.add_parser('contest', help='RezultateC{c}_P{p}.txt files for HW_4 and HW_5')
+    contest.add_argument('-o', '--output', default='contest_data', help='Directory (default: contest_data)')
+    contest.add_argument('-c', '--contestants', type=int, default=100,
+                         help='Most contestants per country (default: 100)')
+    contest.add_argument('--countries', type=int, default=5, help='Countries (default: 5)')
+    contest.add_argument('--problems', type=int, default=10, help='Problems (default: 10)')
+    contest.add_argument('--unsolved', type=float, default=0.10,
+                         help='Probability that a contestant did not solve a problem (default: 0.10)')
+    contest.add_argument('--disqualified', type=float, default=0.02,
+                         help='Fraction of the solutions scored -1 (default: 0.02)')
+    contest.add_argument('--skew', type=float, default=0.0,
+                         help='Country c gets c ** -SKEW of the contestants of country 1 (default: 0, even)')
+    contest.add_argument('--score-skew', type=float, default=1.0,
+                         help='Above 1 favours low scores, below 1 high ones (default: 1, uniform)')
+    contest.add_argument('--seed', type=int, default=0, help='Random seed (default: 0)')
+
+    number = commands.add_parser('number', help='An "N digits" file for HW_3')
+    number.add_argument('digits', type=int, help='Number of digits')
+    number.add_argument('-o', '--output', required=True, help='File, e.g. HW_3/Mpi/Numar1.txt')
+    number.add_argument('--seed', type=int, default=0, help='Random seed (default: 0)')
+
+    args = parser.parse_args()
+
+    try:
+        start = time.perf_counter()
+        if args.command == 'contest':
+            spec = ContestSpec(countries=args.countries, problems=args.problems, contestants=args.contestants,
+                               unsolved=args.unsolved, disqualified=args.disqualified, skew=args.skew,
+                               score_skew=args.score_skew, seed=args.seed)
+            counts = generate_contest(args.output, spec)
+            for country, count in enumerate(counts, start=1):
+                print(f"Country {country}: {count} contestants")
+            written = sum(os.path.getsize(os.path.join(args.output, f"RezultateC{c}_P{p}.txt"))
+                          for c in range(1, spec.countries + 1) for p in range(1, spec.problems + 1))
+        else:
+            write_number(args.output, args.digits, args.seed)
+            written = os.path.getsize(args.output)
+        print(f"Wrote {written / 2 ** 20:.1f} MB to {args.output} in {time.perf_counter() - start:.2f} s")
+    except Exception as e:
+        print(f"Error generating data: {str(e)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
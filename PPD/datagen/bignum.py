@@ -0,0 +1,22 @@
+import numpy as np
+
+# Digits generated and written per block
+BLOCK_DIGITS = 1 << 24
+
+
+def write_number(path: str, digits: int, seed: int = 0) -> None:
+    """Write a random digits-long number in the HW_3 format: "N d1d2...dN" on one line.
+
+    The leading digit is never 0, like generateTestFile in HW_3/Mpi/main.cpp. The number
+    is generated and written in blocks, so 10^8 digits take about 16 MB of memory.
+    """
+    if digits < 1:
+        raise ValueError(f"A number needs at least one digit, got {digits}")
+    rng = np.random.default_rng(seed)
+    with open(path, 'wb', buffering=1 << 20) as f:
+        f.write(f"{digits} ".encode())
+        f.write(bytes([ord('0') + int(rng.integers(1, 10))]))
+        for start in range(1, digits, BLOCK_DIGITS):
+            size = min(BLOCK_DIGITS, digits - start)
+            f.write((rng.integers(0, 10, size=size, dtype=np.uint8) + ord('0')).tobytes())
+        f.write(b"\n")
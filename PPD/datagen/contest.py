@@ -0,0 +1,116 @@
+import os
+from dataclasses import dataclass
+from typing import List
+
+import numpy as np
+
+# Rows formatted per block; the text and mask matrices take about 30 bytes per row
+BLOCK_ROWS = 1 << 20
+
+
+@dataclass
+class ContestSpec:
+    """Contest results in the format of TestDataGenerator.java: contest_data/RezultateC{c}_P{p}.txt.
+
+    Every line is "id score". Country c's contestants have the ids (c - 1) * id_stride + 1
+    onwards, each solving a problem with probability 1 - unsolved and, when they do, being
+    disqualified (score -1) with probability disqualified. The defaults reproduce the Java
+    generator; contestants is the largest number of contestants per country, and each
+    country gets between min_fraction and all of that. skew > 0 makes countries uneven:
+    country c's share falls off as c ** -skew, so readers of the first files do most of the
+    work. score_skew > 1 pushes scores towards min_score and below 1 towards max_score.
+    """
+    countries: int = 5
+    problems: int = 10
+    contestants: int = 100
+    min_fraction: float = 0.8
+    unsolved: float = 0.10
+    disqualified: float = 0.02
+    min_score: int = 10
+    max_score: int = 100
+    skew: float = 0.0
+    score_skew: float = 1.0
+    seed: int = 0
+
+    def __post_init__(self):
+        for name in ('unsolved', 'disqualified', 'min_fraction'):
+            if not 0 <= getattr(self, name) <= 1:
+                raise ValueError(f"{name} must be between 0 and 1, got {getattr(self, name)}")
+        if self.countries < 1 or self.problems < 1 or self.contestants < 1:
+            raise ValueError("countries, problems and contestants must be positive")
+        if not 0 <= self.min_score <= self.max_score:
+            raise ValueError(f"Invalid score range {self.min_score}..{self.max_score}")
+
+    @property
+    def id_stride(self) -> int:
+        """1000 like the Java generator, or the next power of ten when countries have more contestants."""
+        return max(1000, 10 ** len(str(self.contestants)))
+
+    def contestant_counts(self) -> List[int]:
+        rng = np.random.default_rng([self.seed, 0])
+        low = int(np.ceil(self.contestants * self.min_fraction))
+        counts = rng.integers(low, self.contestants + 1, size=self.countries)
+        if self.skew:
+            weights = np.arange(1, self.countries + 1, dtype=np.float64) ** -self.skew
+            counts = np.maximum(1, np.round(counts * weights / weights.max())).astype(np.int64)
+        return [int(count) for count in counts]
+
+
+def _ascii_columns(columns: List[np.ndarray], separators: List[bytes]) -> bytes:
+    """Rows of integers as text, with separators[i] after column i, without a Python loop per row.
+
+    The rows are laid out in one byte matrix: per column a sign slot, right-aligned ASCII
+    digits and the separator, filled one character position at a time. A mask keeps the
+    significant digits, the sign where negative and the separators, and indexing the
+    matrix with it yields the bytes in row order.
+    """
+    rows = len(columns[0])
+    magnitudes = [np.abs(values.astype(np.int64)) for values in columns]
+    widths = [len(str(int(magnitude.max()))) if rows else 1 for magnitude in magnitudes]
+    total = sum(1 + width + len(separator) for width, separator in zip(widths, separators))
+    text = np.empty((rows, total), dtype=np.uint8)
+    keep = np.ones((rows, total), dtype=bool)
+    position = 0
+    for values, magnitude, width, separator in zip(columns, magnitudes, widths, separators):
+        text[:, position] = ord('-')
+        keep[:, position] = values < 0
+        remaining = magnitude.copy()
+        for digit in range(position + width, position + 1, -1):
+            text[:, digit] = remaining % 10 + ord('0')
+            remaining //= 10
+            keep[:, digit - 1] = remaining > 0  # A digit is significant while higher ones are left
+        text[:, position + 1] = remaining % 10 + ord('0')
+        text[:, position + width + 1:position + width + 1 + len(separator)] = np.frombuffer(separator, np.uint8)
+        position += 1 + width + len(separator)
+    return text[keep].tobytes()
+
+
+def write_results_file(path: str, spec: ContestSpec, country: int, problem: int, count: int) -> int:
+    """Write one country's results for one problem; returns the number of lines."""
+    # Seeded per file, so a file does not change when others are added or resized
+    rng = np.random.default_rng([spec.seed, country, problem])
+    first_id = (country - 1) * spec.id_stride + 1
+    lines = 0
+    with open(path, 'wb', buffering=1 << 20) as f:
+        for start in range(0, count, BLOCK_ROWS):
+            size = min(BLOCK_ROWS, count - start)
+            ids = np.arange(first_id + start, first_id + start + size, dtype=np.int64)
+            ids = ids[rng.random(size) >= spec.unsolved]
+            span = spec.max_score - spec.min_score + 1
+            scores = spec.min_score + np.minimum(span - 1, (rng.random(len(ids)) ** spec.score_skew * span)
+                                                 .astype(np.int64))
+            scores[rng.random(len(ids)) < spec.disqualified] = -1
+            f.write(_ascii_columns([ids, scores], [b' ', b'\n']))
+            lines += len(ids)
+    return lines
+
+
+def generate_contest(directory: str, spec: ContestSpec) -> List[int]:
+    """Write all countries' result files to directory; returns the contestants per country."""
+    os.makedirs(directory, exist_ok=True)
+    counts = spec.contestant_counts()
+    for country, count in enumerate(counts, start=1):
+        for problem in range(1, spec.problems + 1):
+            write_results_file(os.path.join(directory, f"RezultateC{country}_P{problem}.txt"),
+                               spec, country, problem, count)
+    return counts
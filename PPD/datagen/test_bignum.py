@@ -0,0 +1,58 @@
+import os
+import tempfile
+
+from datagen import bignum
+from datagen.bignum import write_number
+
+
+def read_number(path):
+    with open(path) as f:
+        text = f.read()
+    assert text.endswith("\n") and text.count("\n") == 1
+    length, digits = text.split()
+    return int(length), digits
+
+
+def test_digit_layout():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'Numar1.txt')
+        for digits in (1, 2, 1000):
+            for seed in range(20):
+                write_number(path, digits, seed)
+                length, number = read_number(path)
+                assert length == digits == len(number) and number.isdigit() and number[0] != '0'
+        write_number(path, 100000, seed=3)
+        _, number = read_number(path)
+        counts = [number.count(str(d)) for d in range(10)]
+        assert min(counts) > 9000 and max(counts) < 11000
+
+
+def test_blocks_and_seeds():
+    block_digits = bignum.BLOCK_DIGITS
+    with tempfile.TemporaryDirectory() as directory:
+        paths = [os.path.join(directory, f"{i}.txt") for i in range(4)]
+        try:
+            bignum.BLOCK_DIGITS = 7  # Several blocks, the last one partial
+            write_number(paths[0], 50, seed=1)
+        finally:
+            bignum.BLOCK_DIGITS = block_digits
+        write_number(paths[1], 50, seed=1)
+        write_number(paths[2], 50, seed=1)
+        write_number(paths[3], 50, seed=2)
+        numbers = [read_number(path) for path in paths]
+    assert numbers[0][0] == 50 and len(numbers[0][1]) == 50 and numbers[0][1][0] != '0'
+    assert numbers[1] == numbers[2] and numbers[1] != numbers[3]
+
+
+def test_rejects_empty_number():
+    try:
+        write_number(os.devnull, 0)
+        assert False, "Zero digits must be rejected"
+    except ValueError:
+        pass
+
+
+if __name__ == "__main__":
+    test_digit_layout()
+    test_blocks_and_seeds()
+    test_rejects_empty_number()
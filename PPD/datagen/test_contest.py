@@ -0,0 +1,86 @@
+import os
+import re
+import tempfile
+
+import numpy as np
+
+from datagen.contest import ContestSpec, _ascii_columns, generate_contest, write_results_file
+
+
+def read_rows(path):
+    with open(path) as f:
+        text = f.read()
+    assert text.endswith("\n") and re.fullmatch(r"(\d+ -?\d+\n)*", text)
+    return [tuple(int(value) for value in line.split()) for line in text.splitlines()]
+
+
+def test_ascii_columns():
+    ids = np.array([1, 10, 999, 1000000])
+    scores = np.array([-1, 0, 100, 7])
+    assert _ascii_columns([ids, scores], [b' ', b'\n']) == b"1 -1\n10 0\n999 100\n1000000 7\n"
+    assert _ascii_columns([np.array([5, -12])], [b',']) == b"5,-12,"
+
+
+def test_results_file_format():
+    spec = ContestSpec(contestants=20000, seed=7)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'RezultateC2_P3.txt')
+        lines = write_results_file(path, spec, country=2, problem=3, count=20000)
+        rows = read_rows(path)
+    assert len(rows) == lines
+    ids = [contestant for contestant, _ in rows]
+    assert ids == sorted(set(ids))
+    assert spec.id_stride == 100000 and 100001 <= ids[0] and ids[-1] <= 120000
+    # About 10% did not solve the problem
+    assert abs(lines / 20000 - 0.9) < 0.01
+
+    scores = np.array([score for _, score in rows])
+    assert abs((scores == -1).mean() - 0.02) < 0.005
+    valid = scores[scores != -1]
+    assert valid.min() == 10 and valid.max() == 100
+    assert abs(valid.mean() - 55) < 1
+
+
+def test_score_skew():
+    with tempfile.TemporaryDirectory() as directory:
+        low = os.path.join(directory, 'low.txt')
+        write_results_file(low, ContestSpec(score_skew=3, disqualified=0), 1, 1, 5000)
+        scores = [score for _, score in read_rows(low)]
+    assert min(scores) >= 10 and max(scores) <= 100 and np.mean(scores) < 40
+
+
+def test_generate_contest_is_seeded():
+    spec = ContestSpec(countries=3, problems=2, contestants=200, skew=1, seed=1)
+    with tempfile.TemporaryDirectory() as first, tempfile.TemporaryDirectory() as second:
+        counts = generate_contest(first, spec)
+        assert generate_contest(second, spec) == counts
+        assert sorted(os.listdir(first)) == [f"RezultateC{c}_P{p}.txt" for c in (1, 2, 3) for p in (1, 2)]
+        for name in os.listdir(first):
+            with open(os.path.join(first, name), 'rb') as a, open(os.path.join(second, name), 'rb') as b:
+                assert a.read() == b.read()
+        generate_contest(second, ContestSpec(countries=3, problems=2, contestants=200, skew=1, seed=2))
+        with open(os.path.join(first, 'RezultateC1_P1.txt')) as a, \
+                open(os.path.join(second, 'RezultateC1_P1.txt')) as b:
+            assert a.read() != b.read()
+        for country, count in enumerate(counts, start=1):
+            ids = [contestant for contestant, _ in read_rows(os.path.join(first, f"RezultateC{country}_P1.txt"))]
+            first_id = (country - 1) * spec.id_stride + 1
+            assert first_id <= min(ids) and max(ids) < first_id + count
+    assert counts[0] >= 160 and counts[0] > counts[1] > counts[2]
+
+
+def test_spec_validation():
+    for options in ({'disqualified': 1.5}, {'countries': 0}, {'min_score': 50, 'max_score': 10}):
+        try:
+            ContestSpec(**options)
+            assert False, f"{options} must be rejected"
+        except ValueError:
+            pass
+
+
+if __name__ == "__main__":
+    test_ascii_columns()
+    test_results_file_format()
+    test_score_skew()
+    test_generate_contest_is_seeded()
+    test_spec_validation()